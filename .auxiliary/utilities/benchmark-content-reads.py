@@ -0,0 +1,104 @@
+# vim: set filetype=python fileencoding=utf-8:
+# -*- coding: utf-8 -*-
+
+#============================================================================#
+#                                                                            #
+#  Licensed under the Apache License, Version 2.0 (the "License");           #
+#  you may not use this file except in compliance with the License.          #
+#  You may obtain a copy of the License at                                   #
+#                                                                            #
+#      http://www.apache.org/licenses/LICENSE-2.0                            #
+#                                                                            #
+#  Unless required by applicable law or agreed to in writing, software       #
+#  distributed under the License is distributed on an "AS IS" BASIS,         #
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  #
+#  See the License for the specific language governing permissions and       #
+#  limitations under the License.                                            #
+#                                                                            #
+#============================================================================#
+
+
+''' Benchmark buffered versus memory-mapped content reads of local files.
+
+    Usage: python benchmark-content-reads.py [--include-gigabyte]
+'''
+
+
+from sys import argv
+
+
+_sizes = (
+    ( '1 KiB', 1024 ),
+    ( '64 KiB', 64 * 1024 ),
+    ( '1 MiB', 1024 ** 2 ),
+    ( '16 MiB', 16 * 1024 ** 2 ),
+    ( '256 MiB', 256 * 1024 ** 2 ),
+)
+_size_gigabyte = ( '1 GiB', 1024 ** 3 )
+_repetitions = 5
+
+
+def produce_content( size ):
+    ''' Produces textual content of requested size. '''
+    line = b'The quick brown fox jumps over the lazy dog. 0123456789\n'
+    count, remainder = divmod( size, len( line ) )
+    return line * count + line[ : remainder ]
+
+
+async def measure( function, repetitions = _repetitions ):
+    ''' Returns best wall-clock time, in seconds, over repetitions. '''
+    from time import perf_counter
+    times = [ ]
+    for _ in range( repetitions ):
+        start = perf_counter( )
+        await function( )
+        times.append( perf_counter( ) - start )
+    return min( times )
+
+
+async def benchmark_file( location ):
+    ''' Benchmarks reads, with attribute detection and decoding. '''
+    from aiwb import locations
+    adapter = locations.file_adapter_from_url( location )
+    attributes = (
+            locations.InodeAttributes.ContentId
+        |   locations.InodeAttributes.Mimetype
+        |   locations.InodeAttributes.Charset )
+
+    async def read_buffered( ):
+        result = await adapter.acquire_content_result(
+            attributes = attributes )
+        str( result.content, result.inode.charset or 'utf-8' )
+
+    async def read_mapped( ):
+        async with adapter.acquire_content_mapping(
+            attributes = attributes
+        ) as result:
+            str( result.content, result.inode.charset or 'utf-8' )
+
+    return await measure( read_buffered ), await measure( read_mapped )
+
+
+async def main( ):
+    from pathlib import Path
+    from tempfile import TemporaryDirectory
+    from aiwb import locations
+    await locations.register_defaults( )
+    sizes = list( _sizes )
+    if '--include-gigabyte' in argv[ 1 : ]: sizes.append( _size_gigabyte )
+    print( f"{'Size':>8}  {'Buffered':>10}  {'Mapped':>10}  {'Speedup':>7}" )
+    with TemporaryDirectory( ) as directory:
+        for label, size in sizes:
+            location = Path( directory ) / 'content.txt'
+            location.write_bytes( produce_content( size ) )
+            buffered, mapped = await benchmark_file( location )
+            speedup = buffered / mapped if mapped else float( 'inf' )
+            print(
+                f"{label:>8}  {buffered * 1000:>8.2f}ms  "
+                f"{mapped * 1000:>8.2f}ms  {speedup:>6.2f}x" )
+            location.unlink( )
+
+
+if '__main__' == __name__:
+    from asyncio import run
+    run( main( ) )
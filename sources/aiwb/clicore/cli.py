@@ -153,6 +153,8 @@ class CliInscriptionControl( __.immut.DataclassObject ):
 class Inspectees( __.enum.Enum ): # TODO: Python 3.11: StrEnum
     ''' Facet of the application to inspect. '''
 
+    Caches =            'caches'
+    ''' Displays statistics of location caches and connection pools. '''
     Configuration =     'configuration'
     ''' Displays application configuration. '''
     # TODO: Directories.
@@ -174,6 +176,8 @@ class InspectCommand( metaclass = __.accret.Dataclass ):
         display: ConsoleDisplay,
     ):
         match self.inspectee:
+            case Inspectees.Caches:
+                await display.render( _report_caches_statistics( ) )
             case Inspectees.Configuration:
                 await display.render( dict( auxdata.configuration ) )
             case Inspectees.Environment:
@@ -197,6 +201,14 @@ class LocationSurveyDirectoryCommand( metaclass = __.accret.Dataclass ):
         bool,
         __.tyro.conf.arg( prefix_name = False ),
     ] = False
+    depth_maximum: __.typx.Annotated[
+        __.typx.Optional[ int ],
+        __.tyro.conf.arg( prefix_name = False ),
+    ] = None
+    entries_maximum: __.typx.Annotated[
+        __.typx.Optional[ int ],
+        __.tyro.conf.arg( prefix_name = False ),
+    ] = None
     url: __.typx.Annotated[
         __.tyro.conf.Positional[ str ],
         __.tyro.conf.arg( prefix_name = False ),
@@ -208,10 +220,19 @@ class LocationSurveyDirectoryCommand( metaclass = __.accret.Dataclass ):
         display: ConsoleDisplay,
     ):
         accessor = __.locations.directory_adapter_from_url( self.url )
-        dirents = await accessor.survey_entries(
-            filters = self.filters, recurse = self.recurse )
-        # TODO: Implement.
-        await display.render( dirents )
+        # Render entries as they are discovered rather than after survey.
+        printer = await display.provide_printer( )
+        async with __.ctxl.aclosing( accessor.iterate_entries(
+            filters = self.filters,
+            recurse = self.recurse,
+            depth_maximum = (
+                __.absent if None is self.depth_maximum
+                else self.depth_maximum ),
+            entries_maximum = (
+                __.absent if None is self.entries_maximum
+                else self.entries_maximum ),
+        ) ) as dirents:
+            async for dirent in dirents: printer( dirent )
 
 
 class LocationAcquireContentCommand( metaclass = __.accret.Dataclass ):
@@ -305,3 +326,48 @@ def execute_cli( ):
         inscription = inscription,
         command = InspectCommand( ) )
     __.asyncio.run( __.tyro.cli( Cli, config = config, default = default )( ) )
+
+
+def _dictionary_from_statistics(
+    statistics: __.typx.Any
+) -> dict[ str, __.typx.Any ]:
+    return {
+        field.name: getattr( statistics, field.name )
+        for field in __.dcls.fields( statistics )
+        if not field.name.startswith( '_' ) }
+
+
+def _report_caches_statistics( ) -> dict[ str, __.typx.Any ]:
+    from ..invocables.ensembles.io.outlines import outlines_cache
+    from ..invocables.ensembles.io.searches import trigram_indices
+    from ..locations.adapters.aiofiles import content_writer
+    from ..locations.adapters.httpx import clients_pool
+    from ..locations.caches.accounting import cache_accountants
+    from ..locations.caches.simple import revalidator
+    return {
+        'inode-metadata-cache': _dictionary_from_statistics(
+            __.locations.inode_metadata_cache.report_statistics( ) ),
+        'content-writer': _dictionary_from_statistics(
+            content_writer.report_statistics( ) ),
+        'http-clients-pool': _dictionary_from_statistics(
+            clients_pool.report_statistics( ) ),
+        'cache-revalidator': _dictionary_from_statistics(
+            revalidator.report_statistics( ) ),
+        'cache-accountants': {
+            location: _dictionary_from_statistics( statistics )
+            for location, statistics
+            in cache_accountants.report_statistics( ).items( ) },
+        'line-indices': _dictionary_from_statistics(
+            __.locations.line_indices.report_statistics( ) ),
+        'single-flights': _dictionary_from_statistics(
+            __.locations.single_flights.report_statistics( ) ),
+        'outlines-cache': _dictionary_from_statistics(
+            outlines_cache.report_statistics( ) ),
+        'trigram-indices': _dictionary_from_statistics(
+            trigram_indices.report_statistics( ) ),
+        'directory-watchers': {
+            location: _dictionary_from_statistics( statistics )
+            for location, statistics
+            in __.locations.directory_watchers.report_statistics( )
+            .indices.items( ) },
+    }
@@ -64,6 +64,7 @@ async def prepare(
         distribution = auxdata_base.distribution,
         exits = auxdata_base.exits,
         notifications = notifications )
+    await __.locations.prepare( auxdata )
     _prepare_scribe_icecream( inscription )
     _inscribe_preparation_report( auxdata )
     return auxdata
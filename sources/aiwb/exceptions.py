@@ -24,7 +24,11 @@
 from . import __
 
 
-class Omniexception( __.immut.Object, BaseException ):
+class Omniexception(
+    __.immut.Object, BaseException,
+    instances_mutables = (
+        '__cause__', '__context__', '__suppress_context__', '__traceback__' ),
+):
     ''' Base for all exceptions raised by package API. '''
 
 
@@ -26,12 +26,20 @@ from .deduplicators import IoContentDeduplicator, SurveyDirectoryDeduplicator
 
 from .argschemata import (
     acquire_content_argschema,
+    apply_patch_argschema,
+    outline_argschema,
+    search_content_argschema,
     survey_directory_argschema,
+    update_content_anchored_argschema,
     update_content_argschema,
     update_content_partial_argschema,
 )
+from .anchors import write_delta
 from .differences import write_pieces
 from .operations import list_folder, read, write_file
+from .outlines import outline, outlines_cache
+from .patches import apply_patch
+from .searches import search_content, trigram_indices
 
 
 _name = __name__.rsplit( '.', maxsplit = 1 )[ -1 ]
@@ -43,6 +51,15 @@ async def prepare(
 ) -> 'Ensemble':
     ''' Installs dependencies and returns ensemble. '''
     # TODO: Install dependencies: github, etc....
+    trigram_indices.configure(
+        descriptor.get( 'search-indices', { } ),
+        location = auxdata.provide_cache_location(
+            'invocables', _name, 'search-indices' ) )
+    auxdata.exits.push_async_callback( trigram_indices.save )
+    outlines_cache.configure( descriptor.get( 'outlines', { } ) )
+    auxdata.exits.callback( outlines_cache.close )
+    if descriptor.get( 'watch-working-directory', True ):
+        await _watch_working_directory( auxdata )
     return Ensemble( name = _name )
 
 
@@ -78,9 +95,25 @@ class Ensemble( __.Ensemble ):
             )
         } )
 
+async def _watch_working_directory( auxdata: __.Globals ):
+    # Surveys and reads only use survey index beneath watched locations.
+    # Paths in tool arguments are usually relative to working directory.
+    try:
+        await auxdata.exits.enter_async_context(
+            __.location_directory_watchers.watch( __.os.getcwd( ) ) )
+    except Exception as exc:
+        summary = "Could not watch working directory."
+        auxdata.notifications.enqueue_error(
+            exc, summary, scribe = __.acquire_scribe( __package__ ) )
+
+
 _invocables = (
     ( read, acquire_content_argschema ),
     ( list_folder, survey_directory_argschema ),
     ( write_file, update_content_argschema ),
     ( write_pieces, update_content_partial_argschema ),
+    ( write_delta, update_content_anchored_argschema ),
+    ( apply_patch, apply_patch_argschema ),
+    ( search_content, search_content_argschema ),
+    ( outline, outline_argschema ),
 )
@@ -0,0 +1,281 @@
+# vim: set filetype=python fileencoding=utf-8:
+# -*- coding: utf-8 -*-
+
+#============================================================================#
+#                                                                            #
+#  Licensed under the Apache License, Version 2.0 (the "License");           #
+#  you may not use this file except in compliance with the License.          #
+#  You may obtain a copy of the License at                                   #
+#                                                                            #
+#      http://www.apache.org/licenses/LICENSE-2.0                            #
+#                                                                            #
+#  Unless required by applicable law or agreed to in writing, software       #
+#  distributed under the License is distributed on an "AS IS" BASIS,         #
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  #
+#  See the License for the specific language governing permissions and       #
+#  limitations under the License.                                            #
+#                                                                            #
+#============================================================================#
+
+
+
+''' Context-anchored partial content update operations. '''
+
+
+from bisect import bisect_left as _bisect_left
+from collections import deque as _deque
+
+from . import __
+from . import differences as _differences
+from . import exceptions as _exceptions
+
+
+class AnchoredOperation( __.immut.DataclassObject ):
+    ''' Partial content update operation, located by its context.
+
+        Edited region lies between lines of context before it, or beginning
+        of file, and lines of context after it, or end of file. Insertions
+        happen immediately after context before them or, without it,
+        immediately before context after them.
+    '''
+
+    opcode: _differences.DeltaType
+    before: __.typx.Optional[ str ] = None
+    after: __.typx.Optional[ str ] = None
+    content: __.typx.Optional[ str ] = None
+    occurrence: __.Absential[ int ] = __.absent
+
+
+class LinesMatcher:
+    ''' Locates sequences of lines within content in linear time.
+
+        Aho-Corasick automaton over alphabet of distinct lines from patterns.
+        Each line of content is hashed once; lines, which are in no pattern,
+        reset automaton. Hence, all occurrences of all patterns are located
+        in one pass, regardless of number of patterns.
+    '''
+    # TODO: Immutable instance attributes.
+
+    failures: list[ int ]
+    lengths: list[ int ]
+    outputs: list[ list[ int ] ]
+    suffixes: list[ int ]
+    symbols: dict[ bytes, int ]
+    transitions: list[ dict[ int, int ] ]
+
+    def __init__(
+        self, patterns: __.cabc.Sequence[ __.cabc.Sequence[ bytes ] ]
+    ):
+        self.failures = [ 0 ]
+        self.lengths = [ len( pattern ) for pattern in patterns ]
+        self.outputs = [ [ ] ]
+        self.suffixes = [ 0 ]
+        self.symbols = { }
+        self.transitions = [ { } ]
+        for i, pattern in enumerate( patterns ):
+            state = 0
+            for line in pattern:
+                symbol = self.symbols.setdefault( line, len( self.symbols ) )
+                state_ = self.transitions[ state ].get( symbol )
+                if None is state_:
+                    state_ = len( self.transitions )
+                    self.transitions[ state ][ symbol ] = state_
+                    self.failures.append( 0 )
+                    self.outputs.append( [ ] )
+                    self.suffixes.append( 0 )
+                    self.transitions.append( { } )
+                state = state_
+            self.outputs[ state ].append( i )
+        self._link_failures( )
+
+    def locate(
+        self, lines: __.cabc.Iterable[ bytes ]
+    ) -> list[ list[ int ] ]:
+        ''' Returns ascending start lines of occurrences of each pattern. '''
+        matches: list[ list[ int ] ] = [ [ ] for _ in self.lengths ]
+        state = 0
+        for number, line in enumerate( lines, start = 1 ):
+            symbol = self.symbols.get( line )
+            if None is symbol:
+                state = 0
+                continue
+            while state and symbol not in self.transitions[ state ]:
+                state = self.failures[ state ]
+            state = self.transitions[ state ].get( symbol, 0 )
+            state_ = state
+            while state_:
+                for i in self.outputs[ state_ ]:
+                    matches[ i ].append( number - self.lengths[ i ] + 1 )
+                state_ = self.suffixes[ state_ ]
+        return matches
+
+    def _link_failures( self ):
+        queue = _deque( self.transitions[ 0 ].values( ) )
+        while queue:
+            state = queue.popleft( )
+            for symbol, state_ in self.transitions[ state ].items( ):
+                queue.append( state_ )
+                failure = self.failures[ state ]
+                while failure and symbol not in self.transitions[ failure ]:
+                    failure = self.failures[ failure ]
+                failure = self.transitions[ failure ].get( symbol, 0 )
+                self.failures[ state_ ] = failure
+                self.suffixes[ state_ ] = (
+                    failure if self.outputs[ failure ]
+                    else self.suffixes[ failure ] )
+
+
+def resolve_operations(
+    operations: __.cabc.Sequence[ AnchoredOperation ],
+    content: bytes,
+    index: __.LineIndex,
+    charset: str,
+) -> list[ _differences.Operation ]:
+    ''' Resolves anchored operations to operations on line numbers.
+
+        Contexts of all operations are located in one pass over lines of
+        content, as located by its line index.
+    '''
+    lines = list( _differences.iterate_lines( content, index ) )
+    patterns: list[ tuple[ bytes, ... ] ] = [ ]
+    for op in operations:
+        for context in ( op.before, op.after ):
+            if None is context: continue
+            patterns.append( tuple(
+                _strip_carriage_return( line.encode( charset ) )
+                for line in context.split( '\n' ) ) )
+    matches = iter( LinesMatcher( patterns ).locate( lines ) )
+    patterns_ = iter( patterns )
+    resolutions: list[ _differences.Operation ] = [ ]
+    for i, op in enumerate( operations, start = 1 ):
+        befores = afters = None
+        before_length = 0
+        if None is not op.before:
+            befores = next( matches )
+            before_length = len( next( patterns_ ) )
+        if None is not op.after:
+            afters = next( matches )
+            next( patterns_ )
+        candidates = _produce_candidates(
+            op, len( lines ), befores, before_length, afters )
+        resolutions.append( _resolve_operation( i, op, candidates ) )
+    return resolutions
+
+
+async def write_delta( # noqa: PLR0911
+    context: __.Context, arguments: __.Arguments
+) -> __.cabc.Mapping:
+    ''' Modifies file at URL or filesystem path with partial content updates.
+
+        Operations can insert, delete, or replace content, which is located
+        by lines of context before and after it, rather than by line
+        numbers. Hence, line numbers are not needed and edits remain valid
+        even if other parts of the file have changed since it was read.
+
+        The content to delete or replace lies strictly between the 'before'
+        context and the 'after' context. Omitting 'before' means beginning
+        of file; omitting 'after' means end of file. Content is inserted
+        immediately after the 'before' context or, if it is omitted,
+        immediately before the 'after' context.
+
+        Contexts must match whole lines exactly. Use enough context to be
+        unique or specify which occurrence to match.
+
+        Do *not* use this tool for more than three consecutive conversation
+        turns. Ask user approval to continue after three consecutive turns of
+        using this tool.
+
+        Think through changes before using this tool.
+    '''
+    if 'location' not in arguments:
+        return { 'error': "Argument 'location' is required." }
+    if 'operations' not in arguments:
+        return { 'error': "Argument 'operations' is required." }
+    arguments_ = dict( arguments )
+    try:
+        accessor = await __.accessor_from_arguments(
+            arguments_, species = __.LocationSpecies.File )
+    except Exception as exc: return { 'error': str( exc ) }
+    if not __.is_file_accessor( accessor ):
+        return { 'error': 'Cannot update content of non-file.' }
+    try:
+        content, index, charset = (
+            await _differences.acquire_content( accessor ) )
+    except Exception as exc: return { 'error': str( exc ) }
+    try:
+        operations = [
+            AnchoredOperation(
+                opcode = _differences.DeltaType( op[ 'opcode' ] ),
+                before = op.get( 'before' ),
+                after = op.get( 'after' ),
+                content = op.get( 'content' ),
+                occurrence = op.get( 'match-occurrence', __.absent ) )
+            for op in arguments_[ 'operations' ] ]
+        resolutions = resolve_operations(
+            operations, content, index, charset )
+        validated_ops = _differences.verify_operations(
+            resolutions, _differences.count_lines( index ) )
+    except Exception as exc: return { 'error': str( exc ) }
+    return await _differences.write_operations(
+        accessor, content, index, charset, validated_ops,
+        arguments = arguments_ )
+
+
+def _produce_candidates(
+    op: AnchoredOperation,
+    lines_count: int,
+    befores: __.typx.Optional[ list[ int ] ],
+    before_length: int,
+    afters: __.typx.Optional[ list[ int ] ],
+) -> list[ tuple[ int, int, int ] ]:
+    ''' Returns anchor line, first line, and last line of each region.
+
+        Regions of insertions are empty and lie before their first lines.
+    '''
+    insertion = _differences.DeltaType.INSERT is op.opcode
+    if None is befores:
+        if None is afters:
+            if insertion: return [ ( 1, 1, 0 ) ]
+            return [ ( 1, 1, lines_count ) ]
+        if insertion: return [ ( line, line, line - 1 ) for line in afters ]
+        return [ ( line, 1, line - 1 ) for line in afters ]
+    candidates: list[ tuple[ int, int, int ] ] = [ ]
+    for line in befores:
+        first = line + before_length
+        if None is afters:
+            last = first - 1 if insertion else lines_count
+            candidates.append( ( line, first, last ) )
+            continue
+        j = _bisect_left( afters, first )
+        if j == len( afters ): continue
+        if insertion and afters[ j ] != first: continue
+        candidates.append( ( line, first, afters[ j ] - 1 ) )
+    return candidates
+
+
+def _resolve_operation(
+    index: int,
+    op: AnchoredOperation,
+    candidates: __.cabc.Sequence[ tuple[ int, int, int ] ],
+) -> _differences.Operation:
+    if __.is_absent( op.occurrence ):
+        if 1 < len( candidates ):
+            raise _exceptions.EditAnchorAmbiguity(
+                index, [ candidate[ 0 ] for candidate in candidates ] )
+        occurrence = 1
+    else: occurrence = op.occurrence
+    if not 0 < occurrence <= len( candidates ):
+        raise _exceptions.EditAnchorAbsence( index, op.occurrence )
+    _, first, last = candidates[ occurrence - 1 ]
+    if last < first:
+        if _differences.DeltaType.DELETE is op.opcode:
+            raise _exceptions.EditRegionVacancy( index )
+        return _differences.Operation(
+            opcode = _differences.DeltaType.INSERT,
+            start = first - 1, content = op.content )
+    return _differences.Operation(
+        opcode = op.opcode, start = first, end = last, content = op.content )
+
+
+def _strip_carriage_return( line: bytes ) -> bytes:
+    return line[ : -1 ] if line.endswith( b'\r' ) else line
@@ -32,6 +32,52 @@ When false, content is returned as a string, preserving all
 newlines.
 '''
 
+_acquire_content_bytes_maximum_description = '''
+Maximum size, in bytes, of returned lines.
+
+Only whole lines are returned, but at least one, even if it alone exceeds
+this size. If more lines are available, then the result includes a
+continuation with the arguments to read them.
+'''
+
+_acquire_content_end_line_description = '''
+Last line (1-based, inclusive) to return.
+
+Defaults to the last line of the file.
+'''
+
+_acquire_content_start_line_description = '''
+First line (1-based) to return.
+
+Only as much of the file as is needed for the range of lines is read. If
+more lines are available after the range, then the result includes a
+continuation with the arguments to read them.
+'''
+
+_apply_patch_fuzz_description = '''
+Maximum number of context lines, at the start and end of each hunk, which
+may be ignored when locating the hunk in its file.
+'''
+
+_apply_patch_location_description = '''
+URL or local path of the directory, relative to which paths in the patch
+are resolved.
+
+Defaults to the working directory of the application process. Supply it,
+unless the patch paths are relative to that directory.
+'''
+
+_apply_patch_patch_description = '''
+Unified diff with changes to one or more files.
+
+* Each file must have '--- ' and '+++ ' header lines
+* Paths may have 'a/' and 'b/' prefixes, as in Git diffs
+* Use '--- /dev/null' to create a new file
+* Hunk headers must have the form '@@ -start,count +start,count @@'
+* Line numbers in hunk headers may be approximate; hunks are located by
+  their context and deleted lines
+'''
+
 _directory_filter_description = '''
 Filter to apply on directory listing.
 
@@ -43,6 +89,36 @@ Choices:
         '+vcs', is equivalent to '+vcs:git,hg,svn'.
 '''
 
+_directory_depth_maximum_description = '''
+Maximum depth of entries to list, if recursing.
+
+Immediate entries of the directory are at depth 1. Entries are listed
+breadth-first, so shallower entries always appear before deeper ones.
+Subdirectories at the maximum depth are collapsed to counts of their entries.
+'''
+
+_directory_bytes_maximum_description = '''
+Approximate maximum size, in bytes, of listed entries per page.
+
+Entries past this budget are deferred to the next page, in listing order.
+'''
+
+_directory_cursor_description = '''
+Opaque cursor from the continuation of a previous partial listing.
+
+Only valid with the same location, filters, recursion, and maximum depth.
+Omit to list the first page.
+'''
+
+_directory_entries_maximum_description = '''
+Maximum number of entries to list per page.
+
+If more entries are available, then the result is marked as truncated and
+has a continuation with the arguments for the next page. Consider narrowing
+the listing with a deeper location, a maximum depth, or additional filters
+rather than paging through everything.
+'''
+
 _directory_recursion_description = '''
 Recursively list subdirectories?
 
@@ -50,6 +126,60 @@ If this flag is set, then it is recommended to also enable filters like
 '@gitignore' and '+vcs' to prevent unnecessary results from being returned.
 '''
 
+_outline_files_maximum_description = '''
+Maximum number of files to outline, if location is a directory.
+
+If more files are available, then the result is marked as truncated.
+Consider outlining a deeper location rather than raising this limit.
+'''
+
+_search_content_bytes_maximum_description = '''
+Maximum total size, in bytes, of matching lines and their locations.
+
+If more matches are available, then the result is marked as truncated.
+Consider a more specific query or location rather than raising this limit.
+'''
+
+_search_content_query_description = '''
+Text or regular expression (Python syntax) to search for.
+
+Matches are reported by line. Regular expressions should contain some
+literal text, outside of groups and character classes, for fast searches.
+'''
+
+_search_content_results_maximum_description = '''
+Maximum number of matching lines to return.
+
+If more matches are available, then the result is marked as truncated.
+'''
+
+_update_content_anchored_after_description = '''
+Lines of context immediately after the region to delete or replace.
+
+* Must match whole lines of the file exactly, including indentation
+* Use \\n to separate multiple lines
+* Omit to extend region to end of file
+* For INSERT operations, must immediately follow 'before' context, if both
+  are given; content is inserted before it, if 'before' is omitted
+'''
+
+_update_content_anchored_before_description = '''
+Lines of context immediately before the region to delete or replace.
+
+* Must match whole lines of the file exactly, including indentation
+* Use \\n to separate multiple lines
+* Omit to extend region to beginning of file
+* For INSERT operations, content is inserted immediately after it
+* Use enough lines to be unique within the file
+'''
+
+_update_content_anchored_occurrence_description = '''
+Which match of the contexts to use (1-based), if they match more than once.
+
+If omitted and the contexts match more than once, then the operation fails
+and reports the lines at which they match.
+'''
+
 _update_content_partial_content_description = '''
 Content to insert or with which to replace.
 
@@ -91,12 +221,21 @@ For DELETE and REPLACE operations:
 * Example: start=1, end=1 affects single line
 '''
 
+_update_content_partial_context_description = '''
+Number of unchanged lines to return around each changed region.
+
+Only relevant when content is returned. Regions, which are within twice this
+many lines of each other, are merged.
+'''
+
 _update_content_partial_return_description = '''
-Return entire content after successful update?
+Return changed regions of content after successful update?
 
-When true, includes complete content of file with line numbers after the
-update as part of the success response. This makes it easy to verify the
-changes or use the result in subsequent operations.
+When true, includes changed lines, with their line numbers after the update
+and with surrounding context lines, as part of the success response. Also
+includes total count of lines after the update. Deletions are represented by
+their context lines. This makes it easy to verify the changes or use the
+result in subsequent operations without echoing the entire file.
 
 When false, only returns basic operation information in success response.
 '''
@@ -140,6 +279,28 @@ Choices:
 * error-if-exists: Do not update file if it already exists.
 '''
 
+apply_patch_argschema = {
+    'type': 'object',
+    'properties': {
+        'patch': {
+            'type': 'string',
+            'description': _apply_patch_patch_description,
+        },
+        'location': {
+            'type': 'string',
+            'description': _apply_patch_location_description,
+        },
+        'fuzz': {
+            'type': 'integer',
+            'minimum': 0,
+            'maximum': 3,
+            'description': _apply_patch_fuzz_description,
+            'default': 2,
+        },
+    },
+    'required': [ 'patch' ],
+}
+
 acquire_content_argschema = {
     'type': 'object',
     'properties': {
@@ -152,10 +313,88 @@ acquire_content_argschema = {
             'description': _acquire_content_number_lines_description,
             'default': False,
         },
+        'start-line': {
+            'type': 'integer',
+            'description': _acquire_content_start_line_description,
+            'minimum': 1,
+        },
+        'end-line': {
+            'type': 'integer',
+            'description': _acquire_content_end_line_description,
+            'minimum': 1,
+        },
+        'bytes-maximum': {
+            'type': 'integer',
+            'description': _acquire_content_bytes_maximum_description,
+            'minimum': 1,
+        },
+    },
+    'required': [ 'location' ],
+}
+
+outline_argschema = {
+    'type': 'object',
+    'properties': {
+        'location': {
+            'type': 'string',
+            'description':
+                'URL or local path of Python or Markdown file or of '
+                'directory with such files.',
+        },
+        'depth-maximum': {
+            'type': 'integer',
+            'minimum': 1,
+            'description': _directory_depth_maximum_description,
+        },
+        'files-maximum': {
+            'type': 'integer',
+            'minimum': 1,
+            'description': _outline_files_maximum_description,
+            'default': 100,
+        },
     },
     'required': [ 'location' ],
 }
 
+search_content_argschema = {
+    'type': 'object',
+    'properties': {
+        'location': {
+            'type': 'string',
+            'description':
+                'URL or local path of directory to search. '
+                'Defaults to current working directory.',
+        },
+        'query': {
+            'type': 'string',
+            'description': _search_content_query_description,
+        },
+        'regex': {
+            'type': 'boolean',
+            'description': 'Is query a regular expression?',
+            'default': False,
+        },
+        'case-sensitive': {
+            'type': 'boolean',
+            'description': 'Are letter cases distinguished?',
+            'default': True,
+        },
+        'results-maximum': {
+            'type': 'integer',
+            'minimum': 1,
+            'description': _search_content_results_maximum_description,
+            'default': 50,
+        },
+        'bytes-maximum': {
+            'type': 'integer',
+            'minimum': 1,
+            'description': _search_content_bytes_maximum_description,
+            'default': 16384,
+        },
+    },
+    'required': [ 'query' ],
+}
+
 survey_directory_argschema = {
     'type': 'object',
     'properties': {
@@ -175,8 +414,28 @@ survey_directory_argschema = {
             'type': 'boolean',
             'description': _directory_recursion_description,
             'default': True
-        }
-#        },
+        },
+        'depth-maximum': {
+            'type': 'integer',
+            'description': _directory_depth_maximum_description,
+            'minimum': 1,
+        },
+        'entries-maximum': {
+            'type': 'integer',
+            'description': _directory_entries_maximum_description,
+            'minimum': 1,
+            'default': 1000,
+        },
+        'bytes-maximum': {
+            'type': 'integer',
+            'description': _directory_bytes_maximum_description,
+            'minimum': 1,
+            'default': 32768,
+        },
+        'cursor': {
+            'type': 'string',
+            'description': _directory_cursor_description,
+        },
 #        'file_size_maximum': {
 #            'type': 'integer',
 #            'description':
@@ -245,12 +504,6 @@ update_content_partial_argschema = {
                         'description':
                             _update_content_partial_content_description,
                     },
-                    'return-content': {
-                        'type': 'boolean',
-                        'description':
-                            _update_content_partial_return_description,
-                        'default': True
-                    },
                 },
                 'required': ['opcode', 'start'],
                 'allOf': [
@@ -278,7 +531,86 @@ update_content_partial_argschema = {
             },
             'minItems': 1,
             'description': 'Sequence of modification operations to apply'
-        }
+        },
+        'return-content': {
+            'type': 'boolean',
+            'description': _update_content_partial_return_description,
+            'default': True
+        },
+        'context-lines': {
+            'type': 'integer',
+            'minimum': 0,
+            'description': _update_content_partial_context_description,
+            'default': 3
+        },
     },
     'required': ['location', 'operations']
 }
+
+update_content_anchored_argschema = {
+    'type': 'object',
+    'properties': {
+        'location': {
+            'type': 'string',
+            'description': 'URL or local path of the file to be modified.'
+        },
+        'operations': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'properties': {
+                    'opcode': {
+                        'type': 'string',
+                        'enum': [ 'insert', 'delete', 'replace' ],
+                    },
+                    'before': {
+                        'type': 'string',
+                        'description':
+                            _update_content_anchored_before_description,
+                    },
+                    'after': {
+                        'type': 'string',
+                        'description':
+                            _update_content_anchored_after_description,
+                    },
+                    'match-occurrence': {
+                        'type': 'integer',
+                        'minimum': 1,
+                        'description':
+                            _update_content_anchored_occurrence_description,
+                    },
+                    'content': {
+                        'type': 'string',
+                        'description':
+                            _update_content_partial_content_description,
+                    },
+                },
+                'required': [ 'opcode' ],
+                'allOf': [
+                    {
+                        'if': {
+                            'properties': {
+                                'opcode': { 'enum': [ 'insert', 'replace' ] }
+                            }
+                        },
+                        'then': { 'required': [ 'content' ] }
+                    },
+                ]
+            },
+            'minItems': 1,
+            'description': 'Sequence of modification operations to apply'
+        },
+        'return-content': {
+            'type': 'boolean',
+            'description': _update_content_partial_return_description,
+            'default': True
+        },
+        'context-lines': {
+            'type': 'integer',
+            'minimum': 0,
+            'description': _update_content_partial_context_description,
+            'default': 3
+        },
+    },
+    'required': [ 'location', 'operations' ],
+}
@@ -22,20 +22,27 @@
 
     Supersession matrix for I/O content tools:
 
-    +--------------------------------+-------+---------------+-------------+---------------+-----------------+
-    | Supersedes →                   | read  | read          | write_file  | write_pieces  | write_pieces    |
-    | Superseded by ↓                |       | number-lines  |             |               | return-content  |
-    +================================+=======+===============+=============+===============+=================+
-    | read                           | ✅    | ✅            | ✅          | ✅            | ✅              |
-    +--------------------------------+-------+---------------+-------------+---------------+-----------------+
-    | read number-lines              | ✅    | ✅            | ✅          | ✅            | ✅              |
-    +--------------------------------+-------+---------------+-------------+---------------+-----------------+
-    | write_file                     | ✅    | ✅            | ✅          | ✅            | ✅              |
-    +--------------------------------+-------+---------------+-------------+---------------+-----------------+
-    | write_pieces                   | ❌    | ❌            | ❌          | ❌            | ❌              |
-    +--------------------------------+-------+---------------+-------------+---------------+-----------------+
-    | write_pieces return-content    | ✅    | ✅            | ✅          | ✅            | ✅              |
-    +--------------------------------+-------+---------------+-------------+---------------+-----------------+
+    +--------------------------------+-------+---------------+-------------+---------------+-----------------+---------------+
+    | Supersedes →                   | read  | read          | write_file  | write_pieces  | write_pieces    | write_delta   |
+    | Superseded by ↓                |       | number-lines  |             |               | return-content  |               |
+    +================================+=======+===============+=============+===============+=================+===============+
+    | read                           | ✅    | ✅            | ✅          | ✅            | ✅              | ✅            |
+    +--------------------------------+-------+---------------+-------------+---------------+-----------------+---------------+
+    | read number-lines              | ✅    | ✅            | ✅          | ✅            | ✅              | ✅            |
+    +--------------------------------+-------+---------------+-------------+---------------+-----------------+---------------+
+    | write_file                     | ✅    | ✅            | ✅          | ✅            | ✅              | ✅            |
+    +--------------------------------+-------+---------------+-------------+---------------+-----------------+---------------+
+    | write_pieces                   | ❌    | ❌            | ❌          | ❌            | ❌              | ❌            |
+    +--------------------------------+-------+---------------+-------------+---------------+-----------------+---------------+
+    | write_pieces return-content    | ❌    | ❌            | ❌          | ❌            | ❌              | ❌            |
+    +--------------------------------+-------+---------------+-------------+---------------+-----------------+---------------+
+    | write_delta                    | ❌    | ❌            | ❌          | ❌            | ❌              | ❌            |
+    +--------------------------------+-------+---------------+-------------+---------------+-----------------+---------------+
+
+    A ``read`` of a range of lines, possibly limited in size, only
+    supersedes earlier reads of ranges of lines, which it covers. A
+    ``write_pieces`` or ``write_delta`` only returns changed regions of
+    content and so never supersedes earlier results.
 
     Note: Directory survey operations (``list_folder``) are handled by
     ``SurveyDirectoryDeduplicator``.
@@ -44,12 +51,19 @@
 from . import __
 
 
+_survey_limits_defaults = (
+    ( 'bytes-maximum', 32768 ),
+    ( 'depth-maximum', None ),
+    ( 'entries-maximum', 1000 ),
+)
+
+
 class IoContentDeduplicator( __.Deduplicator ):
     ''' Deduplicates I/O content operations. '''
 
     @classmethod
     def provide_invocable_names( selfclass ) -> __.cabc.Collection[ str ]:
-        return { 'read', 'write_file', 'write_pieces' }
+        return { 'read', 'write_delta', 'write_file', 'write_pieces' }
 
     def is_duplicate(
         self,
@@ -60,10 +74,11 @@ class IoContentDeduplicator( __.Deduplicator ):
         their_location = arguments.get( 'location' )
         if our_location != their_location: return False
         match self.invocable_name:
-            case 'read': return True
+            case 'read':
+                if not _is_ranged_read( self.arguments ): return True
+                return 'read' == invocable_name and _is_read_range_covered(
+                    self.arguments, arguments )
             case 'write_file': return True
-            case 'write_pieces':
-                return self.arguments.get( 'return-content', True )
         return False
 
 
@@ -87,7 +102,56 @@ class SurveyDirectoryDeduplicator( __.Deduplicator ):
         our_filters = set( self.arguments.get( 'filters', [ ] ) )
         their_filters = set( arguments.get( 'filters', [ ] ) )
         if not our_filters.issubset( their_filters ): return False
-        if (    self.arguments.get( 'recurse', True ) # noqa: SIM103
+        if (    self.arguments.get( 'recurse', True )
             <   arguments.get( 'recurse', True )
         ): return False
-        return True
+        # Later pages only supersede identical requests for the same page.
+        if 'cursor' in self.arguments:
+            return dict( self.arguments ) == dict( arguments )
+        if 'cursor' in arguments: return False
+        # First pages supersede if depth and page limits are more inclusive.
+        return all(
+            _is_limit_inclusive( self.arguments, arguments, name, default )
+            for name, default in _survey_limits_defaults )
+
+
+def _is_limit_inclusive(
+    our_arguments: __.cabc.Mapping[ str, __.typx.Any ],
+    their_arguments: __.cabc.Mapping[ str, __.typx.Any ],
+    name: str,
+    default: __.typx.Optional[ int ],
+) -> bool:
+    # Absent limit, without default, is unbounded.
+    our_limit = our_arguments.get( name, default )
+    their_limit = their_arguments.get( name, default )
+    if None is our_limit: return True
+    if None is their_limit: return False
+    return our_limit >= their_limit
+
+
+def _is_ranged_read( arguments: __.cabc.Mapping[ str, __.typx.Any ] ) -> bool:
+    return any(
+        name in arguments
+        for name in ( 'start-line', 'end-line', 'bytes-maximum' ) )
+
+
+def _is_read_range_covered(
+    our_arguments: __.cabc.Mapping[ str, __.typx.Any ],
+    their_arguments: __.cabc.Mapping[ str, __.typx.Any ],
+) -> bool:
+    # Size-limited ranges have ends which are unknown from arguments alone.
+    if 'bytes-maximum' in our_arguments:
+        return (
+                our_arguments.get( 'bytes-maximum' )
+            ==  their_arguments.get( 'bytes-maximum' )
+            and our_arguments.get( 'start-line', 1 )
+            ==  their_arguments.get( 'start-line', 1 )
+            and our_arguments.get( 'end-line' )
+            ==  their_arguments.get( 'end-line' ) )
+    if our_arguments.get( 'start-line', 1 ) > their_arguments.get(
+        'start-line', 1
+    ): return False
+    our_end = our_arguments.get( 'end-line' )
+    if None is our_end: return True
+    their_end = their_arguments.get( 'end-line' )
+    return None is not their_end and their_end <= our_end
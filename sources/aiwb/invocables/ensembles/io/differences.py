@@ -21,10 +21,15 @@
 ''' Partial content update operations. '''
 
 
+from bisect import bisect_right as _bisect_right
+
 from . import __
 from . import exceptions as _exceptions
 
 
+_context_lines_default = 3
+
+
 class DeltaType( str, __.enum.Enum ):
     ''' Types of partial content update operations. '''
     INSERT = 'insert'
@@ -40,6 +45,149 @@ class Operation( __.immut.DataclassObject ):
     content: str | None = None
 
 
+class PieceTable:
+    ''' Edited document as sequence of pieces of original and new lines.
+
+        Pieces refer to runs of lines in original content, which are located
+        with its line index, or hold new lines. Hence, edits never copy or
+        shift unaffected content. Lines are numbered as by splitting on
+        newlines, so that content, which ends with a newline, has an empty
+        final line. New lines are joined by the first newline of original
+        content.
+    '''
+    # TODO: Immutable instance attributes.
+
+    charset: str
+    content: bytes
+    index: __.LineIndex
+    newline: bytes
+    pieces: list[ '_Piece' ]
+    regions: list[ tuple[ int, int ] ]
+
+    def __init__( self, content: bytes, index: __.LineIndex, charset: str ):
+        self.charset = charset
+        self.content = content
+        self.index = index
+        self.newline = _detect_newline( content, index, charset )
+        lines_count = count_lines( index )
+        self.pieces = [
+            _Piece( line = 1, lines_count = lines_count, original = 1 )
+        ] if lines_count else [ ]
+        self.regions = [ ]
+
+    def apply( self, operations: __.cabc.Sequence[ Operation ] ):
+        ''' Applies verified operations to original lines, in one pass.
+
+            Records altered regions of lines, as numbered after edits. Regions
+            of deletions are empty and lie between lines.
+        '''
+        lines_count = count_lines( self.index )
+        pieces: list[ _Piece ] = [ ]
+        regions: list[ tuple[ int, int ] ] = [ ]
+        cursor = 1 # next original line
+        line = 1 # next edited line
+
+        def retain( end: int ):
+            nonlocal line
+            if end < cursor: return
+            pieces.append( _Piece(
+                line = line, lines_count = end - cursor + 1,
+                original = cursor ) )
+            line += end - cursor + 1
+
+        for op in sorted( operations, key = _sort_operation ):
+            match op.opcode:
+                case DeltaType.INSERT:
+                    # Insert after start line (or at beginning for start=0)
+                    retain( op.start )
+                    cursor = max( cursor, op.start + 1 )
+                case DeltaType.DELETE | DeltaType.REPLACE:
+                    retain( op.start - 1 )
+                    cursor = ( op.end or op.start ) + 1
+            if None is op.content:
+                regions.append( ( line, line - 1 ) )
+                continue
+            lines = tuple(
+                line_.encode( self.charset )
+                for line_ in op.content.split( '\n' ) )
+            pieces.append( _Piece(
+                line = line, lines_count = len( lines ), lines = lines ) )
+            regions.append( ( line, line + len( lines ) - 1 ) )
+            line += len( lines )
+        retain( lines_count )
+        self.pieces = pieces
+        self.regions = regions
+
+    def acquire_line( self, number: int ) -> str:
+        ''' Returns edited line, without its newline. '''
+        piece = self.pieces[ _bisect_right(
+            self.pieces, number, key = lambda piece: piece.line ) - 1 ]
+        offset = number - piece.line
+        if None is piece.original: line = piece.lines[ offset ]
+        else:
+            start, end = _locate_lines(
+                self.content, self.index,
+                piece.original + offset, piece.original + offset )
+            line = self.content[ start : end ]
+        return str( line, self.charset )
+
+    def count_lines( self ) -> int:
+        ''' Returns count of edited lines. '''
+        if not self.pieces: return 0
+        piece = self.pieces[ -1 ]
+        lines_count = piece.line + piece.lines_count - 1
+        # Sole empty line is empty content.
+        if 1 == lines_count and not self.acquire_line( 1 ): return 0
+        return lines_count
+
+    def iterate_chunks(
+        self, chunk_size: int = __.location_content_chunk_size_default
+    ) -> __.cabc.Iterator[ bytes | memoryview ]:
+        ''' Yields edited content, with small pieces coalesced. '''
+        buffer = bytearray( )
+        for piece in self.iterate_pieces( ):
+            if len( piece ) >= chunk_size:
+                if buffer:
+                    yield bytes( buffer )
+                    buffer.clear( )
+                yield piece
+                continue
+            buffer.extend( piece )
+            if len( buffer ) >= chunk_size:
+                yield bytes( buffer )
+                buffer.clear( )
+        if buffer: yield bytes( buffer )
+
+    def iterate_pieces( self ) -> __.cabc.Iterator[ bytes | memoryview ]:
+        ''' Yields edited content, piece by piece, with newlines. '''
+        view = memoryview( self.content )
+        for i, piece in enumerate( self.pieces ):
+            if i: yield self.newline
+            if None is piece.original:
+                yield self.newline.join( piece.lines )
+                continue
+            start, end = _locate_lines(
+                self.content, self.index,
+                piece.original, piece.original + piece.lines_count - 1 )
+            yield view[ start : end ]
+
+    def render_regions( self, context_lines: int ) -> dict[ int, str ]:
+        ''' Returns altered regions of edited lines, with context lines. '''
+        lines_count = self.count_lines( )
+        windows: list[ tuple[ int, int ] ] = [ ]
+        for start, end in self.regions:
+            start_ = max( start - context_lines, 1 )
+            end_ = min( end + context_lines, lines_count )
+            if windows and start_ <= windows[ -1 ][ 1 ] + 1:
+                windows[ -1 ] = (
+                    windows[ -1 ][ 0 ], max( end_, windows[ -1 ][ 1 ] ) )
+            else: windows.append( ( start_, end_ ) )
+        return {
+            number: self.acquire_line( number )
+            for start, end in windows
+            for number in range( start, end + 1 ) }
+
+
 def produce_operation_error( op: Operation, file_length: int ) -> str:  # noqa: C901, PLR0911, PLR0912
     ''' Produces error message for invalid operation. '''
     if op.start < 0: return f"Start line {op.start} is negative"
@@ -125,58 +273,70 @@ def verify_operations(
     return sorted_ops
 
 
-def apply_operations(
-    lines: list[ str ], operations: __.cabc.Sequence[ Operation ]
-) -> list[ str ]:
-    ''' Applies sequence of operations to content lines. '''
-    if not operations: return lines
-    sorted_ops = sorted(
-        operations, key = lambda op: op.start, reverse = True )
-    result = lines.copy( )
-    # Apply each operation
-    for op in sorted_ops:
-        match op.opcode:
-            case DeltaType.INSERT:
-                new_lines = (
-                    [ ] if op.content is None else op.content.split( '\n' ) )
-                # Insert after start line (or at beginning for start=0)
-                # TODO: Hoist start case out of loop.
-                if op.start == 0:
-                    # TODO: result = new_lines + result
-                    result[ 0 : 0 ] = new_lines
-                else:
-                    result[ op.start : op.start ] = new_lines
-            case DeltaType.DELETE:
-                del result[ op.start - 1 : op.end ]
-            case DeltaType.REPLACE:
-                new_lines = (
-                    [ ] if op.content is None else op.content.split( '\n' ) )
-                # Replace lines from start through end
-                result[ op.start - 1 : op.end ] = new_lines
-    return result
-
+async def acquire_content(
+    accessor: __.FileAccessor
+) -> tuple[ bytes, __.LineIndex, str ]:
+    ''' Acquires raw content, line index, and charset from file.
 
-async def acquire_content( accessor: __.FileAccessor ) -> tuple[ str, int ]:
-    ''' Acquires content and line count from file. '''
-    if not await accessor.check_existence( ): return '', 0
-    presenter = __.text_file_presenter_from_accessor( accessor = accessor )
-    result = await presenter.acquire_content_result( )
+        Content in charsets, which are not line-indexable, is transcoded
+        to UTF-8.
+    '''
+    if not await accessor.check_existence( ):
+        return b'', __.LineIndex.from_content( b'' ), _produce_charset( None )
+    result = await accessor.acquire_content_result(
+        attributes = __.InodeAttributes.Mimetype | __.InodeAttributes.Charset )
+    inode = result.inode
+    if not inode.mimetype or not __.is_textual_mimetype( inode.mimetype ):
+        raise __.LocationAcquireContentFailure(
+            url = accessor.as_url( ),
+            reason = f"File content is not text. "
+                     f"MIME Type: {inode.mimetype!r}" )
+    charset = _produce_charset( inode.charset )
     content = result.content
-    lines = content.split( '\n' ) if content else [ ]
-    return content, len( lines )
+    if __.is_line_indexable_charset( charset ):
+        index = __.line_indices.index_content(
+            str( accessor.as_url( ) ), content, inode )
+        return content, index, charset
+    content = str( content, charset ).encode( 'utf-8' )
+    return content, __.LineIndex.from_content( content ), 'utf-8'
+
+
+def count_lines( index: __.LineIndex ) -> int:
+    ''' Returns count of lines, as by splitting content on newlines.
+
+        Content, which ends with a newline, has an empty final line.
+    '''
+    if not index.bytes_count: return 0
+    return index.count_newlines( ) + 1
+
+
+def iterate_lines(
+    content: bytes, index: __.LineIndex
+) -> __.cabc.Iterator[ bytes ]:
+    ''' Iterates over lines of content, without their newlines.
+
+        Lines are located with the line index, so that they are numbered
+        as by the piece table, which honors lone carriage returns too.
+    '''
+    for number in range( 1, count_lines( index ) + 1 ):
+        start, end = index.locate_line( number )
+        yield content[ start : end ].rstrip( b'\r\n' )
 
 
 async def update_content(
-    accessor: __.FileAccessor, content: str
+    accessor: __.FileAccessor, table: PieceTable
 ) -> __.cabc.Mapping:
-    ''' Updates file with modified content. '''
-    presenter = __.text_file_presenter_from_accessor( accessor = accessor )
-    result = await presenter.update_content(
-        content, options = __.FileUpdateOptions.Defaults )
+    ''' Updates file with edited content, streaming it piece by piece. '''
+
+    async def produce_chunks( ) -> __.cabc.AsyncIterator[ bytes ]:
+        for chunk in table.iterate_chunks( ): yield bytes( chunk )
+
+    inode = await accessor.update_content_stream(
+        produce_chunks( ), options = __.FileUpdateOptions.Defaults )
     return {
         'success': {
             'location': str( accessor ),
-            'bytes_written': result.bytes_count
+            'bytes_written': inode.bytes_count
         }
     }
 
@@ -192,6 +352,7 @@ async def write_pieces(  # noqa: PLR0911
 
         Do *not* use this tool on files for which you do not have line numbers.
         Attempting to guess line numbers is very error-prone and dangerous.
+        Use the 'write_delta' tool instead, if line numbers are not known.
 
         Do *not* use this tool for more than three consecutive conversation
         turns. Ask user approval to continue after three consecutive turns of
@@ -211,8 +372,9 @@ async def write_pieces(  # noqa: PLR0911
     except Exception as exc: return { 'error': str( exc ) }
     if not __.is_file_accessor( accessor ):
         return { 'error': 'Cannot update content of non-file.' }
-    try: content, file_length = await acquire_content( accessor )
+    try: content, index, charset = await acquire_content( accessor )
     except Exception as exc: return { 'error': str( exc ) }
+    file_length = count_lines( index )
     try:
         # Convert and validate operations
         operations = [
@@ -226,15 +388,76 @@ async def write_pieces(  # noqa: PLR0911
         ]
         validated_ops = verify_operations( operations, file_length )
     except Exception as exc: return { 'error': str( exc ) }
-    lines = content.split( '\n' ) if content else [ ]
-    try: modified_lines = apply_operations( lines, validated_ops )
+    return await write_operations(
+        accessor, content, index, charset, validated_ops,
+        arguments = arguments_ )
+
+
+async def write_operations( # noqa: PLR0913
+    accessor: __.FileAccessor,
+    content: bytes,
+    index: __.LineIndex,
+    charset: str,
+    operations: __.cabc.Sequence[ Operation ], *,
+    arguments: __.cabc.Mapping[ str, __.typx.Any ],
+) -> __.cabc.Mapping:
+    ''' Applies verified operations to content and updates file.
+
+        Returns changed regions of content, if requested by arguments.
+    '''
+    table = PieceTable( content, index, charset )
+    try: table.apply( operations )
     except Exception as exc: return { 'error': str( exc ) }
-    modified_content = '\n'.join( modified_lines )
-    try: result = await update_content( accessor, modified_content )
+    try: result = await update_content( accessor, table )
     except Exception as exc: return { 'error': str( exc ) }
-    if arguments_.get( 'return-content', True ):
-        content_lines = (
-            modified_content.split( '\n' ) if modified_content else [ ] )
-        result[ 'success' ][ 'content' ] = {
-            i + 1: line for i, line in enumerate( content_lines ) }
+    if arguments.get( 'return-content', True ):
+        context_lines = arguments.get(
+            'context-lines', _context_lines_default )
+        try: content_ = table.render_regions( context_lines )
+        except Exception as exc: return { 'error': str( exc ) }
+        result[ 'success' ][ 'content' ] = content_
+        result[ 'success' ][ 'lines_count' ] = table.count_lines( )
     return result
+
+
+def _detect_newline(
+    content: bytes, index: __.LineIndex, charset: str
+) -> bytes:
+    if not index.count_newlines( ): return __.os.linesep.encode( charset )
+    end = index.ends[ 0 ]
+    if b'\r\n' == content[ max( end - 2, 0 ) : end ]: return b'\r\n'
+    return content[ end - 1 : end ]
+
+
+def _locate_lines(
+    content: bytes, index: __.LineIndex, start_line: int, end_line: int
+) -> tuple[ int, int ]:
+    ''' Returns offsets of lines, excluding newline of last line. '''
+    start, end = index.locate_lines( start_line, end_line )
+    if end_line > index.count_newlines( ): return start, end
+    if b'\r\n' == content[ max( end - 2, start ) : end ]: return start, end - 2
+    return start, end - 1
+
+
+def _produce_charset( charset: __.typx.Optional[ str ] ) -> str:
+    from codecs import lookup
+    if not charset:
+        from locale import getpreferredencoding
+        charset = getpreferredencoding( )
+    # New content may exceed ASCII, of which UTF-8 is a superset.
+    if 'ascii' == lookup( charset ).name: return 'utf-8'
+    return charset
+
+
+def _sort_operation( op: Operation ) -> tuple[ int, bool ]:
+    # Lines are deleted or replaced before insertions after them.
+    return op.start, DeltaType.INSERT is op.opcode
+
+
+class _Piece( __.immut.DataclassObject ):
+    ''' Run of edited lines from original content or new content. '''
+
+    line: int
+    lines_count: int
+    original: __.typx.Optional[ int ] = None
+    lines: tuple[ bytes, ... ] = ( )
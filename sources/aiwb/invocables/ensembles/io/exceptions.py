@@ -24,6 +24,27 @@
 from . import __
 
 
+class EditAnchorAbsence( __.Omnierror, LookupError ):
+    ''' Edit anchor not found in file. '''
+
+    def __init__( self, index: int, occurrence: __.Absential[ int ] ):
+        if __.is_absent( occurrence ): occurrence_ = ''
+        else: occurrence_ = f" with occurrence {occurrence}"
+        super( ).__init__(
+            f"Could not find context{occurrence_} "
+            f"for operation {index} in file." )
+
+
+class EditAnchorAmbiguity( __.Omnierror, ValueError ):
+    ''' Edit anchor found more than once in file. '''
+
+    def __init__( self, index: int, lines: __.cabc.Sequence[ int ] ):
+        lines_ = ', '.join( map( str, lines ) )
+        super( ).__init__(
+            f"Context for operation {index} matches at lines {lines_}. "
+            "Extend context or specify 'match-occurrence'." )
+
+
 class EditContention( __.Omnierror, ValueError ):
     ''' Edit operations overlap in file. '''
 
@@ -31,3 +52,25 @@ class EditContention( __.Omnierror, ValueError ):
         super( ).__init__(
             f"Operation at line {operation1_line} overlaps with "
             f"operation at line {operation2_line}." )
+
+
+class EditRegionVacancy( __.Omnierror, ValueError ):
+    ''' Edit region between anchors has no lines to delete. '''
+
+    def __init__( self, index: int ):
+        super( ).__init__(
+            f"No lines to delete between contexts for operation {index}." )
+
+
+class PatchInvalidity( __.Omnierror, ValueError ):
+    ''' Patch is not valid unified diff. '''
+
+    def __init__( self, line: int, reason: str ):
+        super( ).__init__( f"Invalid patch at line {line}. {reason}" )
+
+
+class OutlineLanguageInvalidity( __.Omnierror, ValueError ):
+    ''' Language cannot be outlined. '''
+
+    def __init__( self, language: str ):
+        super( ).__init__( f"Cannot outline language {language!r}." )
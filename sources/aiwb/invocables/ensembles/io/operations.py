@@ -21,9 +21,19 @@
 ''' Available I/O operations. '''
 
 
+from pathlib import PurePosixPath as _PurePosixPath
+
 from . import __
 
 
+_read_lines_range_argument_names = (
+    'start-line', 'end-line', 'bytes-maximum' )
+_survey_bytes_maximum_default = 32768
+_survey_counts_concurrency = 16
+_survey_entries_maximum_default = 1000
+_survey_filters_default = ( '@gitignore', '+vcs', )
+
+
 async def list_folder(
     context: __.Context, arguments: __.Arguments,
 ) -> __.cabc.Mapping:
@@ -31,31 +41,58 @@ async def list_folder(
 
         May be recursive or single level.
         Optional filters, such as ignorefiles, may be applied.
+
+        Entries are grouped by directory, relative to the listed location.
+        Files map to their MIME types. Subdirectories have trailing slashes
+        and map to counts of their immediate entries, if they are collapsed
+        by depth or recursion limits, or else to null. Listings are paged by
+        entries count and bytes budget; a partial listing has a continuation
+        with the arguments for the next page.
     '''
     # TODO? file_size_maximum = arguments.get( 'file_size_maximum', 40000 )
     arguments_ = dict( arguments )
     # TODO: Validate arguments.
+    location = arguments_.get( 'location' )
     try: accessor = await __.accessor_from_arguments( arguments_ )
     except Exception as exc:
         # TODO? Generate apprisal notification.
         return { 'error': str( exc ) }
     if not __.is_directory_accessor( accessor ):
         return { 'error': 'Cannot list entries of non-directory.' }
-    arguments_[ 'attributes' ] = __.InodeAttributes.Mimetype
-    if 'filters' not in arguments_:
-        arguments_[ 'filters' ] = ( '@gitignore', '+vcs', )
-    try: result = await accessor.survey_entries( **arguments_ )
+    filters = tuple( arguments_.get( 'filters', _survey_filters_default ) )
+    recurse = arguments_.get( 'recurse', True )
+    depth_maximum = arguments_.get( 'depth-maximum', __.absent )
+    fingerprint = _fingerprint_survey(
+        location, filters, recurse, depth_maximum )
+    after = _decode_survey_cursor( arguments_.get( 'cursor' ), fingerprint )
+    if None is after:
+        return { 'error': 'Cursor does not match listing. Omit to restart.' }
+    try:
+        dirents, exhausted = await _survey_page(
+            accessor, after,
+            filters = filters, recurse = recurse,
+            depth_maximum = depth_maximum,
+            entries_maximum = arguments_.get(
+                'entries-maximum', _survey_entries_maximum_default ),
+            bytes_maximum = arguments_.get(
+                'bytes-maximum', _survey_bytes_maximum_default ) )
+        groups = await _group_survey_entries(
+            dirents, filters = filters, recurse = recurse,
+            depth_maximum = depth_maximum )
     except Exception as exc:
         # TODO? Generate apprisal notification.
         return { 'error': str( exc ) }
-    dirents = [
-        {
-            'location': str( dirent.url ),
-            'mimetype': dirent.inode.mimetype,
-        }
-        for dirent in result
-    ]
-    return { 'success': dirents }
+    response: dict[ str, __.typx.Any ] = {
+        'location': str( accessor ),
+        'success': groups,
+        'truncated': not exhausted,
+    }
+    if not exhausted:
+        parent, name, _ = dirents[ -1 ]
+        cursor = _encode_survey_cursor(
+            _PurePosixPath( parent, name ), fingerprint )
+        response[ 'continuation' ] = { **arguments, 'cursor': cursor }
+    return response
 
 
 async def read(
@@ -68,6 +105,10 @@ async def read(
         defualt, or else a dictionary, mapping line numbers to content lines,
         if the line numbering option is enabled. Otherwise, the file size will
         be returned without the content.
+
+        A range of lines may be requested, optionally limited in size. Then,
+        only as much of the file as necessary is read and the result includes
+        arguments for continuing with the following lines, if there are any.
     '''
     arguments_ = dict( arguments )
     # TODO: Validate arguments.
@@ -81,6 +122,9 @@ async def read(
         __.InodeAttributes.Mimetype | __.InodeAttributes.Charset )
     #as_bytes = arguments_.pop( 'as_bytes', False )
     #if as_bytes: return await _read_as_bytes( accessor, context, arguments_ )
+    if any(
+        name in arguments_ for name in _read_lines_range_argument_names
+    ): return await _read_lines_as_string( accessor, context, arguments_ )
     return await _read_as_string( accessor, context, arguments_ )
 
 
@@ -116,6 +160,70 @@ async def write_file(
     return await _write_as_string( accessor, context, arguments_ )
 
 
+def _decode_survey_cursor(
+    cursor: __.typx.Optional[ str ], fingerprint: str
+) -> __.typx.Optional[ __.Absential[ _PurePosixPath ] ]:
+    if not cursor: return __.absent
+    fingerprint_, _, path = cursor.partition( ':' )
+    if fingerprint_ != fingerprint or not path: return None
+    return _PurePosixPath( path )
+
+
+def _encode_survey_cursor( path: _PurePosixPath, fingerprint: str ) -> str:
+    return f"{fingerprint}:{path}"
+
+
+def _fingerprint_survey(
+    location: __.typx.Any,
+    filters: __.cabc.Sequence[ str ],
+    recurse: bool,
+    depth_maximum: __.Absential[ int ],
+) -> str:
+    # Cursors are positions in a deterministic survey order and so are only
+    # meaningful for the same location, filters, and limits on recursion.
+    from hashlib import sha256
+    from json import dumps
+    depth_maximum_ = None if __.is_absent( depth_maximum ) else depth_maximum
+    summary = dumps( [ location, filters, recurse, depth_maximum_ ] )
+    return sha256( summary.encode( ) ).hexdigest( )[ : 12 ]
+
+
+async def _group_survey_entries(
+    dirents: __.cabc.Sequence[ tuple[ str, str, __.DirectoryEntry ] ], *,
+    filters: __.cabc.Sequence[ str ],
+    recurse: bool,
+    depth_maximum: __.Absential[ int ],
+) -> dict[ str, dict[ str, __.typx.Any ] ]:
+    groups: dict[ str, dict[ str, __.typx.Any ] ] = { }
+    collapsed: list[ tuple[ dict[ str, __.typx.Any ], str, __.Url ] ] = [ ]
+    for parent, name, dirent in dirents:
+        group = groups.setdefault( parent, { } )
+        if not dirent.is_directory( ):
+            group[ name ] = dirent.inode.mimetype
+            continue
+        name_ = f"{name}/"
+        group[ name_ ] = None
+        depth = len( _PurePosixPath( parent, name ).parts )
+        if recurse and (
+            __.is_absent( depth_maximum ) or depth < depth_maximum
+        ): continue
+        collapsed.append( ( group, name_, dirent.url ) )
+    semaphore = __.asyncio.Semaphore( _survey_counts_concurrency )
+
+    async def count( url: __.Url ) -> int:
+        async with semaphore:
+            adapter = __.directory_adapter_from_url( url )
+            async with __.ctxl.aclosing( adapter.iterate_entries(
+                filters = filters, recurse = False ) ) as entries:
+                return sum( [ 1 async for _ in entries ] )
+
+    counts = await __.asyncio.gather(
+        *( count( url ) for _, _, url in collapsed ) )
+    for ( group, name_, _ ), count_ in zip( collapsed, counts, strict = True ):
+        group[ name_ ] = count_
+    return groups
+
+
 async def _read_as_bytes(
     accessor: __.FileAccessor, context: __.Context, arguments: __.Arguments
 ) -> __.cabc.Mapping:
@@ -155,6 +263,103 @@ async def _read_as_string(
     }
 
 
+async def _read_lines_as_string(
+    accessor: __.FileAccessor, context: __.Context, arguments: __.Arguments
+) -> __.cabc.Mapping:
+    presenter = __.text_file_presenter_from_accessor(
+        accessor = accessor, charset = '#DETECT#' )
+    nomargs = {
+        name.replace( '-', '_' ): arguments[ name ]
+        for name in _read_lines_range_argument_names if name in arguments }
+    try: result = await presenter.acquire_content_lines( **nomargs )
+    except Exception as exc:
+        # TODO? Generate apprisal notification.
+        return { 'error': str( exc ) }
+    if arguments.get( 'number-lines', False ):
+        lines = result.content.split( '\n' )
+        if result.content.endswith( '\n' ): lines.pop( )
+        content_ = {
+            result.start_line + i: line for i, line in enumerate( lines ) }
+    else: content_ = result.content
+    response = {
+        'location': str( accessor ),
+        'mimetype': result.inode.mimetype,
+        'charset': result.inode.charset,
+        'content': content_,
+        'start_line': result.start_line,
+        'end_line': result.end_line,
+    }
+    if None is not result.lines_count:
+        response[ 'lines_count' ] = result.lines_count
+    if result.is_partial( ):
+        continuation = {
+            'location': str( accessor ),
+            'start-line': result.end_line + 1 }
+        if 'bytes-maximum' in arguments:
+            continuation[ 'bytes-maximum' ] = arguments[ 'bytes-maximum' ]
+        response[ 'continuation' ] = continuation
+    return response
+
+
+async def _survey_page( # noqa: PLR0913
+    accessor: __.DirectoryAccessor, after: __.Absential[ _PurePosixPath ], *,
+    filters: __.cabc.Sequence[ str ],
+    recurse: bool,
+    depth_maximum: __.Absential[ int ],
+    entries_maximum: int,
+    bytes_maximum: int,
+) -> tuple[ list[ tuple[ str, str, __.DirectoryEntry ] ], bool ]:
+    ''' Surveys page of entries, within entries count and bytes budget.
+
+        The survey is streamed and stops as soon as the page is full. The
+        bytes budget is an estimate of rendered size; it is checked in
+        survey order, so trimming is deterministic. At least one entry is
+        always returned, if any remain, to guarantee progress.
+
+        Surveys are breadth-first, with entries of each directory sorted by
+        name, so the survey resumes after the path of the last entry of the
+        previous page. Files before that path are filtered before they are
+        examined.
+    '''
+    root = _PurePosixPath( accessor.as_url( ).path )
+    dirents: list[ tuple[ str, str, __.DirectoryEntry ] ] = [ ]
+    parents: set[ str ] = set( )
+    bytes_count = 0
+    if not __.is_absent( after ):
+        filters = ( _SurveyCursorFilter( root, after ), *filters )
+    arguments: dict[ str, __.typx.Any ] = dict(
+        attributes = __.InodeAttributes.Mimetype,
+        filters = filters, recurse = recurse )
+    if not __.is_absent( depth_maximum ):
+        arguments[ 'depth_maximum' ] = depth_maximum
+    async with __.ctxl.aclosing(
+        accessor.iterate_entries( **arguments )
+    ) as entries:
+        async for dirent in entries:
+            path = _PurePosixPath( dirent.url.path ).relative_to( root )
+            if not __.is_absent( after ) and (
+                _order_survey_path( path ) <= _order_survey_path( after )
+            ): continue
+            if len( dirents ) >= entries_maximum: return dirents, False
+            parent, name = str( path.parent ), path.name
+            # Estimate for quotes, separators, and trailing slashes.
+            bytes_count_ = len( name ) + len( dirent.inode.mimetype or '' ) + 8
+            if parent not in parents: bytes_count_ += len( parent ) + 8
+            if dirents and bytes_count + bytes_count_ > bytes_maximum:
+                return dirents, False
+            bytes_count += bytes_count_
+            parents.add( parent )
+            dirents.append( ( parent, name, dirent ) )
+    return dirents, True
+
+
+def _order_survey_path(
+    path: _PurePosixPath
+) -> tuple[ int, tuple[ str, ... ] ]:
+    # Breadth-first order of survey, with directory entries sorted by name.
+    return len( path.parts ), path.parts
+
+
 async def _write_as_string(
     accessor: __.FileAccessor, context: __.Context, arguments: __.Arguments
 ) -> __.cabc.Mapping:
@@ -177,3 +382,21 @@ async def _write_as_string(
         'charset': result.charset,
         'bytes_count': result.bytes_count,
     }
+
+
+class _SurveyCursorFilter( __.LocationFilter ):
+    ''' Filters files, which precede cursor, before they are examined.
+
+        Directories are kept, since entries beneath them may follow cursor.
+    '''
+
+    def __init__( self, root: _PurePosixPath, after: _PurePosixPath ):
+        self.key = _order_survey_path( after )
+        self.root = root
+
+    async def __call__( self, dirent: __.DirectoryEntry ) -> bool:
+        if dirent.is_directory( ): return False
+        path = _PurePosixPath( dirent.url.path ).relative_to( self.root )
+        return _order_survey_path( path ) <= self.key
+
+    def requires_inode( self ) -> bool: return False
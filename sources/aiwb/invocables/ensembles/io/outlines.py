@@ -0,0 +1,383 @@
+# vim: set filetype=python fileencoding=utf-8:
+# -*- coding: utf-8 -*-
+
+#============================================================================#
+#                                                                            #
+#  Licensed under the Apache License, Version 2.0 (the "License");           #
+#  you may not use this file except in compliance with the License.          #
+#  You may obtain a copy of the License at                                   #
+#                                                                            #
+#      http://www.apache.org/licenses/LICENSE-2.0                            #
+#                                                                            #
+#  Unless required by applicable law or agreed to in writing, software       #
+#  distributed under the License is distributed on an "AS IS" BASIS,         #
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  #
+#  See the License for the specific language governing permissions and       #
+#  limitations under the License.                                            #
+#                                                                            #
+#============================================================================#
+
+
+
+''' Outlines of symbols and headings in source and document files. '''
+
+
+from collections import OrderedDict as _OrderedDict
+from pathlib import PurePosixPath as _PurePosixPath
+
+from . import __
+from . import exceptions as _exceptions
+
+
+_entries_maximum_default = 4096
+_files_maximum_default = 100
+_markdown_fence_regex = __.re.compile( r'^ {0,3}(`{3,}|~{3,})' )
+_markdown_heading_regex = __.re.compile(
+    r'^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$' )
+_markdown_setext_regex = __.re.compile( r'^ {0,3}(=+|-+)[ \t]*$' )
+_pool_bytes_minimum = 4 * 1024 ** 2
+_pool_files_minimum = 32
+_suffixes_languages = __.types.MappingProxyType( {
+    '.markdown': 'markdown',
+    '.md': 'markdown',
+    '.py': 'python',
+    '.pyi': 'python',
+} )
+_survey_filters = ( '@gitignore', '+vcs' )
+
+
+class OutlineEntry( __.immut.DataclassObject ):
+    ''' Symbol or heading with span of lines, inclusive. '''
+
+    name: str
+    kind: str
+    start_line: int
+    end_line: int
+
+    def render_as_json( self ) -> dict[ str, __.typx.Any ]:
+        ''' Renders entry as JSON-compatible dictionary. '''
+        return {
+            'name': self.name,
+            'kind': self.kind,
+            'start_line': self.start_line,
+            'end_line': self.end_line,
+        }
+
+
+# TODO: Python 3.12: type statement for aliases
+Outline: __.typx.TypeAlias = tuple[ OutlineEntry, ... ]
+
+
+class OutlinesCacheStatistics( __.immut.DataclassObject ):
+    ''' Snapshot of usage statistics for outlines cache. '''
+
+    entries_count: int
+    hits: int
+    misses: int
+    pooled_parses: int
+
+
+class OutlinesCache:
+    ''' Memoizes outlines of files, keyed by location.
+
+        Entries are validated by modification time and size of file.
+        Hence, any change to a file invalidates its entry. Least recently
+        used entries are evicted beyond a maximum count. Large batches of
+        files are parsed in a pool of processes, since parsing is bound by
+        computation.
+    '''
+    # TODO: Immutable instance attributes.
+
+    entries: _OrderedDict[ str, tuple[ float, int, Outline ] ]
+    entries_maximum: int
+    hits: int
+    misses: int
+    pooled_parses: int
+    workers_maximum: __.typx.Optional[ int ]
+
+    def __init__( self, entries_maximum: int = _entries_maximum_default ):
+        self.entries = _OrderedDict( )
+        self.entries_maximum = entries_maximum
+        self.hits = 0
+        self.misses = 0
+        self.pooled_parses = 0
+        self.workers_maximum = None
+        self._pool: __.typx.Any = None
+
+    async def acquire_many(
+        self, inodes: __.cabc.Mapping[ str, __.Inode ]
+    ) -> dict[ str, Outline | BaseException ]:
+        ''' Returns outlines or errors for files, keyed by location. '''
+        results: dict[ str, Outline | BaseException ] = { }
+        stale: list[ tuple[ str, float, int ] ] = [ ]
+        for url, inode in inodes.items( ):
+            mtime, bytes_count = _version_from_inode( inode )
+            outline = self.recall( url, mtime, bytes_count )
+            if None is outline: stale.append( ( url, mtime, bytes_count ) )
+            else: results[ url ] = outline
+        contents = await __.asyncio.gather(
+            *(  __.file_adapter_from_url( url ).acquire_content( )
+                for url, _, _ in stale ),
+            return_exceptions = True )
+        readables: list[ tuple[ tuple[ str, float, int ], bytes ] ] = [ ]
+        for entry, content in zip( stale, contents ):
+            if isinstance( content, BaseException ):
+                results[ entry[ 0 ] ] = content
+            else: readables.append( ( entry, content ) )
+        outlines = await self._parse_many( [
+            ( _language_from_location( url ) or '', content )
+            for ( url, _, _ ), content in readables ] )
+        for ( ( url, mtime, bytes_count ), _ ), outline_ in zip(
+            readables, outlines
+        ):
+            results[ url ] = outline_
+            if not isinstance( outline_, BaseException ):
+                self.memoize( url, mtime, bytes_count, outline_ )
+        return results
+
+    def close( self ):
+        ''' Shuts down pool of processes, if any. '''
+        if None is self._pool: return
+        self._pool.shutdown( cancel_futures = True )
+        self._pool = None
+
+    def configure( self, configuration: __.cabc.Mapping[ str, __.typx.Any ] ):
+        ''' Applies configuration to cache. '''
+        self.entries_maximum = int( configuration.get(
+            'entries-maximum', _entries_maximum_default ) )
+        workers_maximum = configuration.get( 'workers-maximum' )
+        self.workers_maximum = (
+            None if None is workers_maximum else int( workers_maximum ) )
+        self._evict( )
+
+    def memoize(
+        self, url: str, mtime: float, bytes_count: int, outline: Outline
+    ):
+        ''' Memoizes outline of file at modification time and size. '''
+        self.entries[ url ] = ( mtime, bytes_count, outline )
+        self.entries.move_to_end( url )
+        self._evict( )
+
+    def recall(
+        self, url: str, mtime: float, bytes_count: int
+    ) -> __.typx.Optional[ Outline ]:
+        ''' Returns memoized outline, if file is unchanged. '''
+        entry = self.entries.get( url )
+        if None is entry or entry[ : 2 ] != ( mtime, bytes_count ):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end( url )
+        return entry[ 2 ]
+
+    def report_statistics( self ) -> OutlinesCacheStatistics:
+        ''' Reports count of entries, lookups, and pooled parses. '''
+        return OutlinesCacheStatistics(
+            entries_count = len( self.entries ),
+            hits = self.hits,
+            misses = self.misses,
+            pooled_parses = self.pooled_parses )
+
+    def _evict( self ):
+        while len( self.entries ) > self.entries_maximum:
+            self.entries.popitem( last = False )
+
+    async def _parse_many(
+        self, jobs: __.cabc.Sequence[ tuple[ str, bytes ] ]
+    ) -> list[ Outline | BaseException ]:
+        if (    len( jobs ) < _pool_files_minimum
+            and sum( len( content ) for _, content in jobs )
+                < _pool_bytes_minimum
+        ):
+            return [
+                _parse_outline_capturing( language, content )
+                for language, content in jobs ]
+        if None is self._pool:
+            from concurrent.futures import ProcessPoolExecutor
+            from multiprocessing import get_context
+            # Forking a multi-threaded process can deadlock its children.
+            self._pool = ProcessPoolExecutor(
+                max_workers = self.workers_maximum,
+                mp_context = get_context( 'forkserver' ) )
+        loop = __.asyncio.get_running_loop( )
+        self.pooled_parses += len( jobs )
+        return await __.asyncio.gather(
+            *(  loop.run_in_executor(
+                    self._pool, parse_outline, language, content )
+                for language, content in jobs ),
+            return_exceptions = True )
+
+
+outlines_cache = OutlinesCache( )
+
+
+def is_outlinable_location( location: str ) -> bool:
+    ''' Is file at location in a language, which can be outlined? '''
+    return None is not _language_from_location( location )
+
+
+def parse_outline( language: str, content: bytes ) -> Outline:
+    ''' Parses outline from content of file in language. '''
+    match language:
+        case 'markdown':
+            return _parse_markdown_outline(
+                str( content, 'utf-8', errors = 'replace' ) )
+        case 'python': return _parse_python_outline( content )
+    raise _exceptions.OutlineLanguageInvalidity( language )
+
+
+async def outline(
+    context: __.Context, arguments: __.Arguments
+) -> __.cabc.Mapping:
+    ''' Outlines classes, functions, and headings in files.
+
+        Works on Python and Markdown files, or on directories of them. Each
+        entry has a line span, which can be passed to the 'read' tool as a
+        range of lines. Use this tool to find where a symbol or section is,
+        rather than reading whole files.
+    '''
+    arguments_ = dict( arguments )
+    files_maximum = arguments_.pop( 'files-maximum', _files_maximum_default )
+    depth_maximum = arguments_.pop( 'depth-maximum', __.absent )
+    try: accessor = await __.accessor_from_arguments( arguments_ )
+    except Exception as exc: return { 'error': str( exc ) }
+    attributes = __.InodeAttributes.BytesCount | __.InodeAttributes.Mtime
+    truncated = False
+    try:
+        if __.is_directory_accessor( accessor ):
+            inodes, truncated = await _survey_files(
+                accessor, depth_maximum, files_maximum )
+        else:
+            url = str( accessor.as_url( ) )
+            if not is_outlinable_location( url ):
+                return { 'error': 'Can only outline Python or Markdown.' }
+            inodes = {
+                url: await accessor.examine( attributes = attributes ) }
+        outlines = await outlines_cache.acquire_many( inodes )
+    except Exception as exc: return { 'error': str( exc ) }
+    results = {
+        url: [ entry.render_as_json( ) for entry in outline_ ]
+        for url, outline_ in outlines.items( )
+        if not isinstance( outline_, BaseException ) }
+    result: dict[ str, __.typx.Any ] = { 'success': results }
+    errors = {
+        url: str( outline_ ) for url, outline_ in outlines.items( )
+        if isinstance( outline_, BaseException ) }
+    if errors: result[ 'errors' ] = errors
+    if truncated: result[ 'truncated' ] = True
+    return result
+
+
+def _iterate_python_definitions(
+    statements: __.cabc.Iterable[ __.typx.Any ], prefix: str, scope: str
+) -> __.cabc.Iterator[ OutlineEntry ]:
+    import ast
+    for statement in statements:
+        match statement:
+            case (
+                ast.ClassDef( ) | ast.FunctionDef( ) | ast.AsyncFunctionDef( )
+            ):
+                name = f"{prefix}{statement.name}"
+                if isinstance( statement, ast.ClassDef ): kind = 'class'
+                else: kind = 'method' if 'class' == scope else 'function'
+                start_line = min(
+                    node.lineno for node in (
+                        statement, *statement.decorator_list ) )
+                yield OutlineEntry(
+                    name = name, kind = kind,
+                    start_line = start_line,
+                    end_line = statement.end_lineno or statement.lineno )
+                if 'class' == kind:
+                    yield from _iterate_python_definitions(
+                        statement.body, f"{name}.", 'class' )
+            case _:
+                # Definitions may be nested in conditionals, etc....
+                for field in ( 'body', 'orelse', 'finalbody' ):
+                    yield from _iterate_python_definitions(
+                        getattr( statement, field, ( ) ), prefix, scope )
+                for clause in (
+                    *getattr( statement, 'handlers', ( ) ),
+                    *getattr( statement, 'cases', ( ) ),
+                ):
+                    yield from _iterate_python_definitions(
+                        clause.body, prefix, scope )
+
+
+def _language_from_location( location: str ) -> __.typx.Optional[ str ]:
+    suffix = _PurePosixPath( __.urlparse( location ).path ).suffix
+    return _suffixes_languages.get( suffix.lower( ) )
+
+
+def _parse_markdown_outline( content: str ) -> Outline:
+    lines = content.splitlines( )
+    headings: list[ tuple[ str, int, int ] ] = [ ]
+    fence = None
+    for i, line in enumerate( lines ):
+        match = _markdown_fence_regex.match( line )
+        if match:
+            marker = match[ 1 ]
+            if None is fence: fence = marker
+            elif marker[ 0 ] == fence[ 0 ] and len( marker ) >= len( fence ):
+                fence = None
+            continue
+        if None is not fence: continue
+        match = _markdown_heading_regex.match( line )
+        if match:
+            headings.append(
+                ( ( match[ 2 ] or '' ).strip( ), len( match[ 1 ] ), i + 1 ) )
+            continue
+        match = _markdown_setext_regex.match( line )
+        if match and i and lines[ i - 1 ].strip( ) and (
+            not headings or headings[ -1 ][ 2 ] != i
+        ):
+            level = 1 if '=' == match[ 1 ][ 0 ] else 2
+            headings.append( ( lines[ i - 1 ].strip( ), level, i ) )
+    entries: list[ OutlineEntry ] = [ ]
+    for j, ( name, level, start_line ) in enumerate( headings ):
+        end_line = next(
+            (   start_line_ - 1 for _, level_, start_line_
+                in headings[ j + 1 : ] if level_ <= level ),
+            len( lines ) )
+        entries.append( OutlineEntry(
+            name = name, kind = f"h{level}",
+            start_line = start_line, end_line = end_line ) )
+    return tuple( entries )
+
+
+def _parse_outline_capturing(
+    language: str, content: bytes
+) -> Outline | BaseException:
+    try: return parse_outline( language, content )
+    except Exception as exc: return exc
+
+
+def _parse_python_outline( content: bytes ) -> Outline:
+    import ast
+    module = ast.parse( content )
+    return tuple( _iterate_python_definitions( module.body, '', 'module' ) )
+
+
+async def _survey_files(
+    accessor: __.DirectoryAccessor,
+    depth_maximum: __.Absential[ int ],
+    files_maximum: int,
+) -> tuple[ dict[ str, __.Inode ], bool ]:
+    attributes = __.InodeAttributes.BytesCount | __.InodeAttributes.Mtime
+    inodes: dict[ str, __.Inode ] = { }
+    async with __.ctxl.aclosing( accessor.iterate_entries(
+        attributes = attributes,
+        filters = _survey_filters,
+        depth_maximum = depth_maximum,
+    ) ) as dirents:
+        async for dirent in dirents:
+            url = str( dirent.url )
+            if not dirent.is_file( ) or not is_outlinable_location( url ):
+                continue
+            if len( inodes ) >= files_maximum: return inodes, True
+            inodes[ url ] = dirent.inode
+    return inodes, False
+
+
+def _version_from_inode( inode: __.Inode ) -> tuple[ float, int ]:
+    mtime = inode.mtime.timestamp( ) if inode.mtime else 0.0
+    return mtime, inode.bytes_count or 0
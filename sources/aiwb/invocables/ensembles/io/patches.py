@@ -0,0 +1,441 @@
+# vim: set filetype=python fileencoding=utf-8:
+# -*- coding: utf-8 -*-
+
+#============================================================================#
+#                                                                            #
+#  Licensed under the Apache License, Version 2.0 (the "License");           #
+#  you may not use this file except in compliance with the License.          #
+#  You may obtain a copy of the License at                                   #
+#                                                                            #
+#      http://www.apache.org/licenses/LICENSE-2.0                            #
+#                                                                            #
+#  Unless required by applicable law or agreed to in writing, software       #
+#  distributed under the License is distributed on an "AS IS" BASIS,         #
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  #
+#  See the License for the specific language governing permissions and       #
+#  limitations under the License.                                            #
+#                                                                            #
+#============================================================================#
+
+
+
+''' Application of unified diffs to files. '''
+
+
+from pathlib import PurePosixPath as _PurePosixPath
+
+from . import __
+from . import differences as _differences
+from . import exceptions as _exceptions
+
+
+_fuzz_default = 2
+_hunk_header_regex = __.re.compile(
+    r'^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@' )
+_null_location = '/dev/null'
+
+
+class Hunk( __.immut.DataclassObject ):
+    ''' Contiguous change within file, with surrounding context lines.
+
+        Each line is tagged by its kind: ' ' for context, '-' for deletion,
+        and '+' for addition.
+    '''
+
+    source_start: int
+    source_count: int
+    lines: tuple[ tuple[ str, str ], ... ]
+
+    def count_leading_context( self ) -> int:
+        ''' Returns count of context lines before first change. '''
+        return _count_context( self.lines )
+
+    def count_trailing_context( self ) -> int:
+        ''' Returns count of context lines after last change. '''
+        return _count_context( reversed( self.lines ) )
+
+    def produce_source_lines( self ) -> tuple[ str, ... ]:
+        ''' Returns lines, which hunk expects to find in file. '''
+        return tuple( text for kind, text in self.lines if '+' != kind )
+
+    def trim( self, leading: int, trailing: int ) -> __.typx.Self:
+        ''' Returns hunk without some leading and trailing context lines. '''
+        lines = self.lines[ leading : len( self.lines ) - trailing ]
+        return type( self )(
+            source_start = self.source_start + leading,
+            source_count = self.source_count - leading - trailing,
+            lines = lines )
+
+
+class FilePatch( __.immut.DataclassObject ):
+    ''' Hunks of unified diff for one file. '''
+
+    source: str
+    target: str
+    hunks: tuple[ Hunk, ... ]
+
+    def produce_location( self ) -> str:
+        ''' Returns path of file to patch, relative to patch base. '''
+        return self.source if _null_location == self.target else self.target
+
+
+class HunkMatch( __.immut.DataclassObject ):
+    ''' Location at which hunk applies to file. '''
+
+    start: int
+    offset: int
+    fuzz: int
+
+
+class LinesLocator:
+    ''' Locates runs of lines in content via index of hashed lines.
+
+        Lines are compared without trailing whitespace. Candidate positions
+        of a run come from its rarest line, so that verification is only
+        attempted where a run can possibly match.
+    '''
+    # TODO: Immutable instance attributes.
+
+    lines: list[ bytes ]
+    positions: dict[ bytes, list[ int ] ]
+
+    def __init__( self, content: bytes, index: __.LineIndex ):
+        self.lines = [
+            _normalize_line( line )
+            for line in _differences.iterate_lines( content, index ) ]
+        self.positions = { }
+        for number, line in enumerate( self.lines, start = 1 ):
+            self.positions.setdefault( line, [ ] ).append( number )
+
+    def locate(
+        self, lines: __.cabc.Sequence[ bytes ], expectation: int, floor: int
+    ) -> __.typx.Optional[ int ]:
+        ''' Returns start line of run nearest to expected start line.
+
+            Run must start at or after floor line.
+        '''
+        lines_ = [ _normalize_line( line ) for line in lines ]
+        if not lines_:
+            return min( max( expectation, floor ), len( self.lines ) + 1 )
+        if self.verify( lines_, expectation ) and expectation >= floor:
+            return expectation
+        i, line = min(
+            enumerate( lines_ ),
+            key = lambda pair: len( self.positions.get( pair[ 1 ], ( ) ) ) )
+        starts = (
+            position - i for position in self.positions.get( line, ( ) ) )
+        return min(
+            (   start for start in starts
+                if start >= floor and self.verify( lines_, start ) ),
+            key = lambda start: ( abs( start - expectation ), start ),
+            default = None )
+
+    def verify( self, lines: __.cabc.Sequence[ bytes ], start: int ) -> bool:
+        ''' Does run of normalized lines occur at start line? '''
+        if start < 1 or start + len( lines ) - 1 > len( self.lines ):
+            return False
+        return all(
+            line == self.lines[ start - 1 + i ]
+            for i, line in enumerate( lines ) )
+
+
+def parse_patch( patch: str ) -> list[ FilePatch ]:
+    ''' Parses multi-file unified diff. '''
+    lines = patch.replace( '\r\n', '\n' ).split( '\n' )
+    patches: list[ FilePatch ] = [ ]
+    i = 0
+    while i < len( lines ):
+        if not _is_file_header( lines, i ):
+            i += 1
+            continue
+        source = _parse_file_header( lines[ i ] )
+        target = _parse_file_header( lines[ i + 1 ] )
+        i += 2
+        hunks: list[ Hunk ] = [ ]
+        while i < len( lines ) and lines[ i ].startswith( '@@' ):
+            hunk, i = _parse_hunk( lines, i )
+            hunks.append( hunk )
+        if not hunks: raise _exceptions.PatchInvalidity( i, 'No hunks.' )
+        source, target = _strip_prefixes( source, target )
+        patches.append(
+            FilePatch( source = source, target = target,
+                       hunks = tuple( hunks ) ) )
+    if not patches:
+        raise _exceptions.PatchInvalidity( 1, 'No file headers.' )
+    return patches
+
+
+def locate_hunks(
+    locator: LinesLocator,
+    hunks: __.cabc.Sequence[ Hunk ],
+    charset: str,
+    fuzz: int,
+) -> list[ __.typx.Optional[ tuple[ Hunk, HunkMatch ] ] ]:
+    ''' Locates hunks in file, allowing offsets and trimmed context.
+
+        Hunks are located in order and may not overlap. Offsets of earlier
+        hunks carry over to the expected locations of later hunks.
+    '''
+    results: list[ __.typx.Optional[ tuple[ Hunk, HunkMatch ] ] ] = [ ]
+    offset = 0
+    floor = 1
+    for hunk in hunks:
+        result = _locate_hunk(
+            locator, hunk, charset, fuzz, offset = offset, floor = floor )
+        results.append( result )
+        if None is result: continue
+        hunk_, match = result
+        offset = match.offset
+        floor = match.start + hunk_.source_count
+    return results
+
+
+def produce_operations(
+    hunk: Hunk, start: int
+) -> list[ _differences.Operation ]:
+    ''' Converts located hunk into operations on line numbers. '''
+    operations: list[ _differences.Operation ] = [ ]
+    cursor = start
+    run_start = start
+    deletions = 0
+    additions: list[ str ] = [ ]
+
+    def conclude_run( ):
+        nonlocal deletions
+        content = '\n'.join( additions ) if additions else None
+        if deletions:
+            opcode = (
+                _differences.DeltaType.REPLACE if additions
+                else _differences.DeltaType.DELETE )
+            operations.append( _differences.Operation(
+                opcode = opcode, start = run_start,
+                end = run_start + deletions - 1, content = content ) )
+        elif additions:
+            operations.append( _differences.Operation(
+                opcode = _differences.DeltaType.INSERT,
+                start = run_start - 1, content = content ) )
+        deletions = 0
+        additions.clear( )
+
+    for kind, text in hunk.lines:
+        if ' ' == kind:
+            conclude_run( )
+            cursor += 1
+            run_start = cursor
+            continue
+        if '-' == kind:
+            deletions += 1
+            cursor += 1
+        else: additions.append( text )
+    conclude_run( )
+    return operations
+
+
+async def apply_patch(
+    context: __.Context, arguments: __.Arguments
+) -> __.cabc.Mapping:
+    ''' Applies unified diff to one or more files.
+
+        Use this tool for targeted changes, rather than rewriting whole
+        files. Hunks may apply at offsets from their stated line numbers and
+        with some context lines mismatched. All files are updated together
+        or, if any hunk cannot be applied, none are.
+
+        Relative paths in the patch are resolved against the location
+        argument or, if it is absent, against the working directory of the
+        application process, which may differ from the directory of the
+        files under discussion. Supply the location when in doubt.
+
+        Think through changes before using this tool.
+    '''
+    if 'patch' not in arguments:
+        return { 'error': "Argument 'patch' is required." }
+    base = arguments.get( 'location', __.absent )
+    fuzz = arguments.get( 'fuzz', _fuzz_default )
+    try: patches = parse_patch( arguments[ 'patch' ] )
+    except Exception as exc: return { 'error': str( exc ) }
+    results = await __.asyncio.gather(
+        *(  _prepare_file_patch( base, patch, fuzz )
+            for patch in patches ),
+        return_exceptions = True )
+    files: list[ dict[ str, __.typx.Any ] ] = [ ]
+    updates: list[ tuple[ __.FileAccessor, bytes ] ] = [ ]
+    for patch, result in zip( patches, results ):
+        if isinstance( result, BaseException ):
+            files.append( {
+                'location': patch.produce_location( ),
+                'error': str( result ) } )
+            continue
+        file, update = result
+        files.append( file )
+        if None is not update: updates.append( update )
+    if len( updates ) < len( patches ):
+        return { 'error': 'Patch not applied.', 'files': files }
+    try: inodes = await __.update_location_contents_many( updates )
+    except Exception as exc:
+        return { 'error': str( exc ), 'files': files }
+    for file, inode in zip( files, inodes ):
+        file[ 'bytes_written' ] = inode.bytes_count
+    return { 'success': { 'files': files } }
+
+
+def _count_context( lines: __.cabc.Iterable[ tuple[ str, str ] ] ) -> int:
+    count = 0
+    for kind, _ in lines:
+        if ' ' != kind: break
+        count += 1
+    return count
+
+
+def _is_file_header( lines: __.cabc.Sequence[ str ], i: int ) -> bool:
+    return (
+        lines[ i ].startswith( '--- ' )
+        and i + 1 < len( lines )
+        and lines[ i + 1 ].startswith( '+++ ' ) )
+
+
+def _locate_hunk( # noqa: PLR0913
+    locator: LinesLocator,
+    hunk: Hunk,
+    charset: str,
+    fuzz: int, *,
+    offset: int,
+    floor: int,
+) -> __.typx.Optional[ tuple[ Hunk, HunkMatch ] ]:
+    leading = hunk.count_leading_context( )
+    trailing = hunk.count_trailing_context( )
+    # Hunk without source lines inserts after its stated line.
+    start = hunk.source_start + ( 0 if hunk.source_count else 1 )
+    for fuzz_ in range( fuzz + 1 ):
+        leading_ = min( fuzz_, leading )
+        trailing_ = min( fuzz_, trailing )
+        if fuzz_ and ( leading_, trailing_ ) == (
+            min( fuzz_ - 1, leading ), min( fuzz_ - 1, trailing )
+        ): break
+        # Like GNU patch, never trim away all context of hunk.
+        if leading + trailing and leading_ + trailing_ == leading + trailing:
+            break
+        hunk_ = hunk.trim( leading_, trailing_ )
+        lines = [
+            line.encode( charset ) for line in hunk_.produce_source_lines( ) ]
+        expectation = start + leading_ + offset
+        start_ = locator.locate( lines, expectation, floor )
+        if None is start_: continue
+        return hunk_, HunkMatch(
+            start = start_, offset = start_ - start - leading_,
+            fuzz = fuzz_ )
+    return None
+
+
+def _normalize_line( line: bytes ) -> bytes:
+    return line.rstrip( b' \t\r\f\v' )
+
+
+def _parse_file_header( line: str ) -> str:
+    return line[ 4 : ].split( '\t', maxsplit = 1 )[ 0 ].strip( )
+
+
+def _parse_hunk(
+    lines: __.cabc.Sequence[ str ], i: int
+) -> tuple[ Hunk, int ]:
+    match = _hunk_header_regex.match( lines[ i ] )
+    if None is match:
+        raise _exceptions.PatchInvalidity( i + 1, 'Invalid hunk header.' )
+    source_start = int( match[ 1 ] )
+    source_count = 1 if None is match[ 2 ] else int( match[ 2 ] )
+    target_count = 1 if None is match[ 4 ] else int( match[ 4 ] )
+    lines_: list[ tuple[ str, str ] ] = [ ]
+    # Empty source has no final line, which could follow a newline.
+    source_terminated = bool( source_start or source_count )
+    target_terminated = True
+    i += 1
+    while i < len( lines ):
+        line = lines[ i ]
+        if line.startswith( '\\' ):
+            kind = lines_[ -1 ][ 0 ] if lines_ else ' '
+            if '+' != kind: source_terminated = False
+            if '-' != kind: target_terminated = False
+        elif not line: lines_.append( ( ' ', '' ) )
+        elif line[ 0 ] in ' -+' and not _is_file_header( lines, i ):
+            lines_.append( ( line[ 0 ], line[ 1 : ] ) )
+        else: break
+        i += 1
+    lines_ = _trim_excess_context( lines_, source_count, target_count )
+    # Split lines of files, which end with newlines, have empty final lines.
+    if source_terminated != target_terminated:
+        lines_.append( ( '+' if target_terminated else '-', '' ) )
+    source_count_ = sum( 1 for kind, _ in lines_ if '+' != kind )
+    return Hunk(
+        source_start = source_start, source_count = source_count_,
+        lines = tuple( lines_ ) ), i
+
+
+async def _prepare_file_patch(
+    base: __.Absential[ str ], patch: FilePatch, fuzz: int
+) -> tuple[
+    dict[ str, __.typx.Any ],
+    __.typx.Optional[ tuple[ __.FileAccessor, bytes ] ]
+]:
+    if _null_location == patch.target:
+        raise _exceptions.PatchInvalidity( 0, 'Cannot delete files.' )
+    location = _produce_location( base, patch.produce_location( ) )
+    accessor = await __.accessor_from_arguments(
+        { 'location': location }, species = __.LocationSpecies.File )
+    exists = await accessor.check_existence( )
+    if _null_location == patch.source and exists:
+        raise _exceptions.PatchInvalidity( 0, 'File to create exists.' )
+    if _null_location != patch.source and not exists:
+        raise _exceptions.PatchInvalidity( 0, 'File to patch is absent.' )
+    content, index, charset = await _differences.acquire_content( accessor )
+    locator = LinesLocator( content, index )
+    located = locate_hunks( locator, patch.hunks, charset, fuzz )
+    hunks: list[ dict[ str, __.typx.Any ] ] = [ ]
+    operations: list[ _differences.Operation ] = [ ]
+    for result in located:
+        if None is result:
+            hunks.append( { 'error': 'Could not locate hunk.' } )
+            continue
+        hunk, match = result
+        hunks.append( {
+            key: value for key, value in (
+                ( 'line', match.start ),
+                ( 'offset', match.offset ),
+                ( 'fuzz', match.fuzz ) )
+            if value or 'line' == key } )
+        operations.extend( produce_operations( hunk, match.start ) )
+    file = { 'location': str( accessor ), 'hunks': hunks }
+    if None in located: return file, None
+    operations = _differences.verify_operations(
+        operations, _differences.count_lines( index ) )
+    table = _differences.PieceTable( content, index, charset )
+    table.apply( operations )
+    return file, ( accessor, b''.join( table.iterate_pieces( ) ) )
+
+
+def _produce_location( base: __.Absential[ str ], path: str ) -> str:
+    if __.is_absent( base ): return path
+    url = __.Url.from_url( base )
+    return str( url.with_path( _PurePosixPath( url.path or '.' ) / path ) )
+
+
+def _strip_prefixes( source: str, target: str ) -> tuple[ str, str ]:
+    # Git-style diffs prefix paths with 'a/' and 'b/'.
+    source_ = source if _null_location == source else source[ 2 : ]
+    target_ = target if _null_location == target else target[ 2 : ]
+    if (    ( _null_location == source or source.startswith( 'a/' ) )
+        and ( _null_location == target or target.startswith( 'b/' ) )
+    ): return source_, target_
+    return source, target
+
+
+def _trim_excess_context(
+    lines: list[ tuple[ str, str ] ], source_count: int, target_count: int
+) -> list[ tuple[ str, str ] ]:
+    # Blank lines after hunk may be separators rather than context.
+    while lines and ( ' ', '' ) == lines[ -1 ]:
+        source_count_ = sum( 1 for kind, _ in lines if '+' != kind )
+        target_count_ = sum( 1 for kind, _ in lines if '-' != kind )
+        if source_count_ <= source_count or target_count_ <= target_count:
+            break
+        lines.pop( )
+    return lines
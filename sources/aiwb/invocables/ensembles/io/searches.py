@@ -0,0 +1,481 @@
+# vim: set filetype=python fileencoding=utf-8:
+# -*- coding: utf-8 -*-
+
+#============================================================================#
+#                                                                            #
+#  Licensed under the Apache License, Version 2.0 (the "License");           #
+#  you may not use this file except in compliance with the License.          #
+#  You may obtain a copy of the License at                                   #
+#                                                                            #
+#      http://www.apache.org/licenses/LICENSE-2.0                            #
+#                                                                            #
+#  Unless required by applicable law or agreed to in writing, software       #
+#  distributed under the License is distributed on an "AS IS" BASIS,         #
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  #
+#  See the License for the specific language governing permissions and       #
+#  limitations under the License.                                            #
+#                                                                            #
+#============================================================================#
+
+
+
+''' Content search, backed by persistent trigram indices. '''
+
+
+from array import array as _array
+
+from . import __
+
+
+_binary_probe_size = 8192
+_bytes_maximum_default = 16384
+_file_bytes_maximum_default = 1024 ** 2
+_format_version = 1
+_literal_size_minimum = 3
+_line_size_maximum = 240
+_reads_concurrency = 16
+_results_maximum_default = 50
+_survey_filters = ( '@gitignore', '+vcs' )
+
+
+class IndexedFile( __.immut.DataclassObject ):
+    ''' Indexed state of file. Trigrams are absent for unsearchable files.
+
+        Files are unsearchable, if they are binary or too large.
+    '''
+
+    mtime: float
+    bytes_count: int
+    trigrams: __.typx.Optional[ _array ] = None
+
+    def is_current( self, mtime: float, bytes_count: int ) -> bool:
+        ''' Does indexed state match modification time and size of file? '''
+        return self.mtime == mtime and self.bytes_count == bytes_count
+
+
+class TrigramIndex:
+    ''' Index of trigrams of text files under directory.
+
+        Trigrams are of bytes with ASCII letters lowercased, so that one
+        index serves both case-sensitive and case-insensitive queries.
+        Posting lists map each trigram to files, which contain it. Hence,
+        queries only need to verify files, which contain every trigram of
+        their required literals.
+    '''
+    # TODO: Immutable instance attributes.
+
+    files: dict[ str, IndexedFile ]
+    postings: dict[ int, set[ str ] ]
+    root: str
+
+    def __init__( self, root: str ):
+        self.files = { }
+        self.postings = { }
+        self.root = root
+        self._altered = False
+
+    @classmethod
+    def from_document(
+        selfclass, document: __.cabc.Mapping[ str, __.typx.Any ]
+    ) -> __.typx.Self:
+        ''' Produces index from serialized document. '''
+        from base64 import b64decode
+        index = selfclass( document[ 'root' ] )
+        for url, mtime, bytes_count, encoding in document[ 'files' ]:
+            trigrams = None
+            if None is not encoding:
+                trigrams = _array( 'I' )
+                trigrams.frombytes( b64decode( encoding ) )
+            index.restore( url, IndexedFile(
+                mtime = mtime, bytes_count = bytes_count,
+                trigrams = trigrams ) )
+        return index
+
+    def forget( self, url: str ):
+        ''' Removes file from index. '''
+        file = self.files.pop( url, None )
+        if None is file: return
+        self._altered = True
+        for trigram in file.trigrams or ( ):
+            urls = self.postings[ trigram ]
+            urls.discard( url )
+            if not urls: del self.postings[ trigram ]
+
+    def is_altered( self ) -> bool:
+        ''' Has index changed since it was loaded or last saved? '''
+        return self._altered
+
+    def memoize(
+        self, url: str, mtime: float, bytes_count: int,
+        content: __.typx.Optional[ bytes ],
+    ):
+        ''' Indexes trigrams of file content. Content absent if unsearchable.
+        '''
+        self.forget( url )
+        trigrams = (
+            None if None is content
+            else _array( 'I', sorted( _trigrams_from_content( content ) ) ) )
+        self.restore( url, IndexedFile(
+            mtime = mtime, bytes_count = bytes_count, trigrams = trigrams ) )
+        self._altered = True
+
+    def restore( self, url: str, file: IndexedFile ):
+        ''' Adds file, which was indexed previously, to index. '''
+        self.files[ url ] = file
+        for trigram in file.trigrams or ( ):
+            self.postings.setdefault( trigram, set( ) ).add( url )
+
+    def select_candidates(
+        self, trigrams: __.cabc.Collection[ int ]
+    ) -> list[ str ]:
+        ''' Returns searchable files, which contain all trigrams, in order.
+        '''
+        if not trigrams:
+            return sorted(
+                url for url, file in self.files.items( )
+                if None is not file.trigrams )
+        postings = sorted(
+            ( self.postings.get( trigram, set( ) ) for trigram in trigrams ),
+            key = len )
+        candidates = set( postings[ 0 ] )
+        for urls in postings[ 1 : ]:
+            if not candidates: break
+            candidates &= urls
+        return sorted( candidates )
+
+    def to_document( self ) -> dict[ str, __.typx.Any ]:
+        ''' Produces serializable document from index. '''
+        from base64 import b64encode
+        self._altered = False
+        return {
+            'version': _format_version,
+            'root': self.root,
+            'files': [
+                (   url, file.mtime, file.bytes_count,
+                    None if None is file.trigrams
+                    else b64encode( file.trigrams.tobytes( ) ).decode( ) )
+                for url, file in self.files.items( ) ] }
+
+
+class TrigramIndicesStatistics( __.immut.DataclassObject ):
+    ''' Snapshot of usage statistics for trigram indices. '''
+
+    indices_count: int
+    files_count: int
+    files_indexed: int
+    trigrams_count: int
+
+
+class TrigramIndices:
+    ''' Trigram indices of directories, updated incrementally.
+
+        Each query surveys its directory, honoring ignorefiles and
+        excluding VCS state, and reindexes only files, which are new or
+        have changed modification times or sizes. Indices may be loaded
+        from and saved to files under a cache location, so that they
+        persist across application sessions.
+    '''
+    # TODO: Immutable instance attributes.
+
+    file_bytes_maximum: int
+    files_indexed: int
+    indices: dict[ str, TrigramIndex ]
+    location: __.typx.Optional[ __.Path ]
+    mutexes: dict[ str, __.MutexAsync ]
+
+    def __init__( self ):
+        self.file_bytes_maximum = _file_bytes_maximum_default
+        self.files_indexed = 0
+        self.indices = { }
+        self.location = None
+        self.mutexes = { }
+
+    async def acquire( self, accessor: __.DirectoryAccessor ) -> TrigramIndex:
+        ''' Returns current index for directory. '''
+        root = str( accessor.as_url( ) )
+        mutex = self.mutexes.setdefault( root, __.MutexAsync( ) )
+        async with mutex:
+            index = self.indices.get( root )
+            if None is index:
+                index = await self._load( root ) or TrigramIndex( root )
+                self.indices[ root ] = index
+            await self._update( index, accessor )
+        return index
+
+    def configure(
+        self,
+        configuration: __.cabc.Mapping[ str, __.typx.Any ],
+        location: __.typx.Optional[ __.Path ] = None,
+    ):
+        ''' Applies configuration to indices.
+
+            Indices are persisted under location, if it is given.
+        '''
+        self.file_bytes_maximum = int( configuration.get(
+            'file-bytes-maximum', _file_bytes_maximum_default ) )
+        self.location = location
+
+    def report_statistics( self ) -> TrigramIndicesStatistics:
+        ''' Reports counts of indices, files, and trigrams. '''
+        return TrigramIndicesStatistics(
+            indices_count = len( self.indices ),
+            files_count = sum(
+                len( index.files ) for index in self.indices.values( ) ),
+            files_indexed = self.files_indexed,
+            trigrams_count = sum(
+                len( index.postings ) for index in self.indices.values( ) ) )
+
+    async def save( self ):
+        ''' Saves indices, which are altered, to cache location. '''
+        if None is self.location: return
+        from json import dumps
+        from aiofiles import open as open_
+        from aiofiles.os import makedirs, replace
+        await makedirs( self.location, exist_ok = True )
+        for root, index in self.indices.items( ):
+            if not index.is_altered( ): continue
+            location = self.location / _produce_index_name( root )
+            location_ = location.with_name(
+                f"{location.name}.{__.uuid4( ).hex}" )
+            async with open_( location_, 'w' ) as stream:
+                await stream.write( dumps( index.to_document( ) ) )
+            await replace( location_, location )
+
+    async def _load( self, root: str ) -> __.typx.Optional[ TrigramIndex ]:
+        if None is self.location: return None
+        from json import loads
+        from aiofiles import open as open_
+        location = self.location / _produce_index_name( root )
+        try:
+            async with open_( location ) as stream:
+                document = loads( await stream.read( ) )
+            if _format_version != document.get( 'version' ): return None
+            if root != document.get( 'root' ): return None
+            return TrigramIndex.from_document( document )
+        except FileNotFoundError: return None
+        # Corrupt indices are rebuilt.
+        except ( KeyError, OSError, TypeError, ValueError ): return None
+
+    async def _update(
+        self, index: TrigramIndex, accessor: __.DirectoryAccessor
+    ):
+        attributes = __.InodeAttributes.BytesCount | __.InodeAttributes.Mtime
+        stale: list[ tuple[ str, float, int ] ] = [ ]
+        present: set[ str ] = set( )
+        async with __.ctxl.aclosing( accessor.iterate_entries(
+            attributes = attributes, filters = _survey_filters
+        ) ) as dirents:
+            async for dirent in dirents:
+                if not dirent.is_file( ): continue
+                url = str( dirent.url )
+                inode = dirent.inode
+                mtime = inode.mtime.timestamp( ) if inode.mtime else 0.0
+                bytes_count = inode.bytes_count or 0
+                present.add( url )
+                file = index.files.get( url )
+                if file and file.is_current( mtime, bytes_count ): continue
+                stale.append( ( url, mtime, bytes_count ) )
+        for url in set( index.files ) - present: index.forget( url )
+        semaphore = __.asyncio.Semaphore( _reads_concurrency )
+
+        async def memoize( url: str, mtime: float, bytes_count: int ):
+            content = None
+            if bytes_count <= self.file_bytes_maximum:
+                async with semaphore:
+                    try:
+                        content = await __.file_adapter_from_url(
+                            url ).acquire_content( )
+                    except Exception: return # Retried on next update.
+                if _is_binary( content ): content = None
+            index.memoize( url, mtime, bytes_count, content )
+            self.files_indexed += 1
+
+        await __.asyncio.gather( *(
+            memoize( url, mtime, bytes_count )
+            for url, mtime, bytes_count in stale ) )
+
+
+trigram_indices = TrigramIndices( )
+
+
+async def search_content(
+    context: __.Context, arguments: __.Arguments
+) -> __.cabc.Mapping:
+    ''' Searches text files under directory for literal text or regex.
+
+        Returns matching lines, grouped by file and keyed by line number.
+        Files are located via an index, which honors ignorefiles and
+        excludes VCS state. Use this tool, rather than reading many files,
+        to find definitions, usages, and other text.
+    '''
+    if 'query' not in arguments:
+        return { 'error': "Argument 'query' is required." }
+    arguments_ = dict( arguments )
+    query = arguments_[ 'query' ]
+    regex_ = arguments_.get( 'regex', False )
+    flags = __.re.MULTILINE
+    if not arguments_.get( 'case-sensitive', True ): flags |= __.re.IGNORECASE
+    try:
+        regex = __.re.compile(
+            query if regex_ else __.re.escape( query ), flags )
+    except __.re.error as exc: return { 'error': f"Invalid regex: {exc}" }
+    arguments_.setdefault( 'location', '.' )
+    try: accessor = await __.accessor_from_arguments( arguments_ )
+    except Exception as exc: return { 'error': str( exc ) }
+    if not __.is_directory_accessor( accessor ):
+        return { 'error': 'Cannot search entries of non-directory.' }
+    try: index = await trigram_indices.acquire( accessor )
+    except Exception as exc: return { 'error': str( exc ) }
+    literals = _extract_literals( query ) if regex_ else [ query ]
+    candidates = index.select_candidates( _trigrams_from_literals( literals ) )
+    return await _search_candidates(
+        candidates, regex,
+        results_maximum = arguments_.get(
+            'results-maximum', _results_maximum_default ),
+        bytes_maximum = arguments_.get(
+            'bytes-maximum', _bytes_maximum_default ) )
+
+
+def _extract_literals( pattern: str ) -> list[ str ]:
+    ''' Returns literals, each of which every match must contain.
+
+        Only literals outside of groups and character classes are
+        considered. Alternation at top level yields no literals.
+    '''
+    if __.re.match( r'\(\?[aiLmsux]*x', pattern ): return [ ] # verbose
+    literals: list[ str ] = [ ]
+    run: list[ str ] = [ ]
+
+    def conclude_run( ):
+        if len( run ) >= _literal_size_minimum:
+            literals.append( ''.join( run ) )
+        run.clear( )
+
+    for kind, character, depth in _tokenize_pattern( pattern ):
+        match kind:
+            case _PatternTokens.Alternation:
+                if not depth: return [ ]
+            case _PatternTokens.Literal:
+                if depth: continue
+                run.append( character )
+                continue
+            case _PatternTokens.Optionality:
+                # Quantified character is optional.
+                if run: run.pop( )
+        conclude_run( )
+    conclude_run( )
+    return literals
+
+
+def _is_binary( content: bytes ) -> bool:
+    return b'\x00' in content[ : _binary_probe_size ]
+
+
+def _iterate_matching_lines(
+    text: str, regex: __.re.Pattern[ str ]
+) -> __.cabc.Iterator[ tuple[ int, str ] ]:
+    number = 1
+    position = 0
+    end = -1
+    for match in regex.finditer( text ):
+        start = match.start( )
+        if start < end: continue # Line already reported.
+        number += text.count( '\n', position, start )
+        position = start
+        begin = text.rfind( '\n', 0, start ) + 1
+        end = text.find( '\n', start )
+        if -1 == end: end = len( text )
+        yield number, text[ begin : end ].rstrip( '\r' )
+
+
+def _produce_index_name( root: str ) -> str:
+    from hashlib import sha256
+    return "{}.json".format( sha256( root.encode( ) ).hexdigest( ) )
+
+
+async def _search_candidates(
+    candidates: __.cabc.Sequence[ str ],
+    regex: __.re.Pattern[ str ], *,
+    results_maximum: int,
+    bytes_maximum: int,
+) -> __.cabc.Mapping:
+    results: dict[ str, dict[ int, str ] ] = { }
+    results_count = 0
+    bytes_count = 0
+    for url in candidates:
+        try: content = await __.file_adapter_from_url( url ).acquire_content( )
+        except Exception: continue # noqa: S112 # Vanished or unreadable.
+        text = str( content, 'utf-8', errors = 'replace' )
+        lines: dict[ int, str ] = { }
+        for number, line in _iterate_matching_lines( text, regex ):
+            line_ = line[ : _line_size_maximum ]
+            size = len( line_.encode( ) ) + len( url ) * ( not lines )
+            if (    results_count >= results_maximum
+                or  bytes_count + size > bytes_maximum
+            ):
+                if lines: results[ url ] = lines
+                return { 'success': results, 'truncated': True }
+            lines[ number ] = line_
+            results_count += 1
+            bytes_count += size
+        if lines: results[ url ] = lines
+    return { 'success': results, 'truncated': False }
+
+
+def _skip_character_class( pattern: str, i: int ) -> int:
+    if pattern[ i : i + 1 ] == '^': i += 1
+    if pattern[ i : i + 1 ] == ']': i += 1
+    while i < len( pattern ) and ']' != pattern[ i ]:
+        i += 2 if '\\' == pattern[ i ] else 1
+    return i + 1
+
+
+def _tokenize_pattern(
+    pattern: str
+) -> __.cabc.Iterator[ tuple[ '_PatternTokens', str, int ] ]:
+    depth = 0
+    i = 0
+    while i < len( pattern ):
+        c = pattern[ i ]
+        i += 1
+        kind = _PatternTokens.Boundary
+        if '\\' == c:
+            c = pattern[ i : i + 1 ]
+            i += 1
+            if c and not c.isalnum( ): kind = _PatternTokens.Literal
+        elif '[' == c: i = _skip_character_class( pattern, i )
+        elif c in '()': depth += 1 if '(' == c else -1
+        elif '|' == c: kind = _PatternTokens.Alternation
+        elif c in '*?': kind = _PatternTokens.Optionality
+        elif '{' == c:
+            kind = _PatternTokens.Optionality
+            i = pattern.find( '}', i ) + 1 or len( pattern )
+        elif c not in '.^$+': kind = _PatternTokens.Literal
+        yield kind, c, depth
+
+
+def _trigrams_from_content( content: bytes ) -> set[ int ]:
+    content_ = content.lower( )
+    return {
+        a << 16 | b << 8 | c
+        for a, b, c in set( zip( content_, content_[ 1 : ], content_[ 2 : ] ) )
+    }
+
+
+def _trigrams_from_literals(
+    literals: __.cabc.Iterable[ str ]
+) -> frozenset[ int ]:
+    # Only ASCII runs are reliable across charsets and case folding.
+    trigrams: set[ int ] = set( )
+    for literal in literals:
+        for run in __.re.split( r'[^\x00-\x7f]+', literal ):
+            trigrams.update( _trigrams_from_content( run.encode( 'ascii' ) ) )
+    return frozenset( trigrams )
+
+
+class _PatternTokens( __.enum.Enum ):
+
+    Alternation = __.enum.auto( )
+    Boundary = __.enum.auto( )
+    Literal = __.enum.auto( )
+    Optionality = __.enum.auto( )
@@ -96,7 +96,8 @@ async def _analyze_file( context, path, control = None ):
 
 async def _analyze_http( context, url, control = None ):
     file_name = await _read_http_core( context, url )
-    return await _analyze_file( context, file_name, control = control )
+    try: return await _analyze_file( context, file_name, control = control )
+    finally: __.Path( file_name ).unlink( missing_ok = True )
 
 
 async def _count_tokens( context, content ):
@@ -28,10 +28,11 @@ from . import core
 from . import exceptions
 from . import filters
 from . import interfaces
+from . import metadata
 from . import preparation
 from . import presenters
 from . import registries
 from . import utilities
 
-from .preparation import register_defaults
+from .preparation import prepare, register_defaults
 from ._api import *
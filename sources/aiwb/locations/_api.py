@@ -26,5 +26,8 @@
 from .core import *
 from .exceptions import *
 from .interfaces import *
+from .lines import *
+from .metadata import *
 from .registries import *
 from .utilities import *
+from .watchers import *
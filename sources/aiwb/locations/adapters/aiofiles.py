@@ -22,17 +22,151 @@
 
 
 from os import stat_result as _StatResult
+from threading import local as _ThreadLocal
 
 from . import __
 
 
 _module_name = __name__.replace( f"{__package__}.", '' )
 _entity_name = f"location access adapter '{_module_name}'"
+_head_probe_size = 64 * 1024 # bytes; for partial content acquisitions
+_mapping_size_minimum = 1024 ** 2 # bytes; smaller contents are copied
+_survey_lookahead_maximum = 32 # directories surveyed ahead of consumer
+_survey_probes_maximum = 32 # concurrent MIME type probes
+_survey_scans_maximum = 16 # concurrent directory scans
+
+_mimetype_detectors = _ThreadLocal( )
 
 
 __.AccessImplement.register( __.Path )
 
 
+class DurabilityPolicies( __.enum.Enum ): # TODO: Python 3.11: StrEnum
+    ''' When written content is flushed to storage. '''
+
+    Content =   'content'   # content, before it replaces file
+    Directory = 'directory' # content and then directory, after replacement
+    Volatile =  'volatile'  # whenever operating system decides
+
+
+class ContentWriterStatistics( __.immut.DataclassObject ):
+    ''' Snapshot of statistics for writer of file contents. '''
+
+    commits: int
+    reversions: int
+    stages: int
+    syncs: int
+
+
+class ContentWriter:
+    ''' Writes contents of files atomically, via temporary siblings.
+
+        Content is written to a temporary file beside its destination,
+        flushed to storage according to durability policy, and then renamed
+        over the destination. Hence, readers observe either the prior
+        content or the new content, never a partial write, even if the
+        write is interrupted. Prior content may be kept, as a hard link,
+        until an update is discarded, so that it can be reverted.
+    '''
+    # TODO: Immutable instance attributes.
+
+    commits: int
+    durability: DurabilityPolicies
+    reversions: int
+    stages: int
+    syncs: int
+
+    def __init__( self ):
+        self.commits = 0
+        self.durability = DurabilityPolicies.Content
+        self.reversions = 0
+        self.stages = 0
+        self.syncs = 0
+
+    async def commit(
+        self, temporary: __.Path, location: __.Path, exclusive: bool,
+        keep_prior: bool,
+    ) -> tuple[ bool, __.typx.Optional[ __.Path ] ]:
+        ''' Renames temporary file over destination.
+
+            Returns whether destination existed and where prior content is
+            kept, if it is kept. If exclusive, then destination must not
+            exist.
+        '''
+        sync_directory = DurabilityPolicies.Directory is self.durability
+        outcome = await __.asyncio.to_thread(
+            _commit_temporary,
+            temporary, location, exclusive, keep_prior, sync_directory )
+        self.commits += 1
+        if sync_directory: self.syncs += 1
+        return outcome
+
+    def configure( self, configuration: __.cabc.Mapping[ str, __.typx.Any ] ):
+        ''' Applies configuration to writer. '''
+        self.durability = DurabilityPolicies( configuration.get(
+            'durability', DurabilityPolicies.Content.value ) )
+
+    def report_statistics( self ) -> ContentWriterStatistics:
+        ''' Reports counts of stages, commits, reversions, and syncs. '''
+        return ContentWriterStatistics(
+            commits = self.commits,
+            reversions = self.reversions,
+            stages = self.stages,
+            syncs = self.syncs )
+
+    async def revert(
+        self,
+        location: __.Path,
+        existed: bool,
+        prior: __.typx.Optional[ __.Path ],
+    ):
+        ''' Restores prior content of destination or removes it. '''
+        await __.asyncio.to_thread(
+            _revert_committed, location, existed, prior )
+        self.reversions += 1
+
+    async def stage(
+        self, location: __.Path, content: bytes
+    ) -> tuple[ __.Path, _StatResult ]:
+        ''' Writes content to temporary sibling of destination. '''
+        sync = DurabilityPolicies.Volatile is not self.durability
+        outcome = await __.asyncio.to_thread(
+            _write_temporary, location, content, sync )
+        self.stages += 1
+        if sync: self.syncs += 1
+        return outcome
+
+    async def stage_stream(
+        self, location: __.Path, chunks: __.cabc.AsyncIterable[ bytes ]
+    ) -> tuple[ __.Path, _StatResult ]:
+        ''' Writes chunks of content to temporary sibling of destination.
+        '''
+        from aiofiles import open as open_
+        sync = DurabilityPolicies.Volatile is not self.durability
+        temporary = _produce_temporary_location( location )
+        try:
+            async with open_( temporary, 'xb' ) as stream:
+                async for chunk in chunks: await stream.write( chunk )
+                await stream.flush( )
+                stat = await __.asyncio.to_thread(
+                    _conclude_temporary, stream.fileno( ), location, sync )
+        except BaseException:
+            _remove_if_exists( temporary )
+            raise
+        self.stages += 1
+        if sync: self.syncs += 1
+        return temporary, stat
+
+    async def sync( self, descriptor: int ):
+        ''' Flushes file to storage, unless policy is volatile. '''
+        if DurabilityPolicies.Volatile is self.durability: return
+        await __.asyncio.to_thread( __.os.fsync, descriptor )
+        self.syncs += 1
+
+
+content_writer = ContentWriter( )
+
+
 class _Common( __.AdapterBase ):
     # TODO: Immutable instance attributes.
 
@@ -90,6 +224,22 @@ class _Common( __.AdapterBase ):
         self,
         attributes: __.InodeAttributes = __.InodeAttributes.Nothing,
         pursue_indirection: bool = True,
+    ) -> __.Inode:
+        return await __.single_flights.coalesce(
+            ( 'examine', self.url.geturl( ), attributes, pursue_indirection ),
+            __.funct.partial(
+                self._examine,
+                attributes = attributes,
+                pursue_indirection = pursue_indirection ) )
+
+    def expose_implement( self ) -> __.AccessImplement:
+        # Cast because we do not have a common protocol.
+        return __.typx.cast( __.AccessImplement, self.implement )
+
+    async def _examine(
+        self,
+        attributes: __.InodeAttributes,
+        pursue_indirection: bool,
     ) -> __.Inode:
         Error = __.funct.partial(
             __.LocationExamineFailure, url = self.url )
@@ -101,21 +251,20 @@ class _Common( __.AdapterBase ):
             from aiofiles.os import stat
             stat = await stat( location, follow_symlinks = False )
         except Exception as exc: raise Error( reason = str( exc ) ) from exc
-        inode_s = _inode_from_stat( stat )
+        inode_s = _recall_inode( stat )
         if (    __.LocationSpecies.File is inode_s.species
                 and __.InodeAttributes.Mimetype & attributes
+                and not inode_s.mimetype
         ):
             from magic import from_file
             mimetype = from_file( str( self.implement ), mime = True )
             inode = inode_s.with_attributes( mimetype = mimetype )
         # TODO? Probe block devices with 'blkid' or similar.
         else: inode = inode_s
-        return __.honor_inode_attributes(
+        inode = __.honor_inode_attributes(
             inode = inode, attributes = attributes, error_to_raise = Error )
-
-    def expose_implement( self ) -> __.AccessImplement:
-        # Cast because we do not have a common protocol.
-        return __.typx.cast( __.AccessImplement, self.implement )
+        _memoize_inode( stat, inode, attributes )
+        return inode
 
 
 class GeneralAdapter( _Common, __.GeneralAdapter ):
@@ -277,11 +426,43 @@ class DirectoryAdapter( _Common, __.DirectoryAdapter ):
         absent_ok: bool = True,
         safe: bool = True,
     ):
-        # TODO: Implement.
-        pass
+        try: accessor = self.produce_entry_accessor( name )
+        except Exception as exc:
+            raise __.LocationDeleteFailure(
+                url = self.url, reason = str( exc ) ) from exc
+        url = accessor.as_url( )
+        Error = __.funct.partial( __.LocationDeleteFailure, url = url )
+        from aiofiles.os import remove
+        try: await remove( url.path )
+        except FileNotFoundError as exc:
+            if absent_ok: return
+            raise Error( reason = str( exc ) ) from exc
+        except Exception as exc: raise Error( reason = str( exc ) ) from exc
 
     # TODO: delete_indirection
 
+    async def iterate_entries(
+        self,
+        attributes: __.InodeAttributes = __.InodeAttributes.Nothing,
+        filters: __.Absential[
+            __.cabc.Iterable[ __.PossibleFilter ]
+        ] = __.absent,
+        recurse: bool = True,
+        depth_maximum: __.SurveyDepthMaximumArgument = __.absent,
+        entries_maximum: __.SurveyEntriesMaximumArgument = __.absent,
+    ) -> __.cabc.AsyncIterator[ __.DirectoryEntry ]:
+        filters_ = (
+            ( ) if __.is_absent( filters )
+            else __.filters_from_specifiers( filters ) )
+        surveyor = _Surveyor( attributes = attributes, filters = filters_ )
+        async with __.ctxl.aclosing( surveyor.iterate(
+            self.implement,
+            recurse = recurse,
+            depth_maximum = depth_maximum,
+            entries_maximum = entries_maximum,
+        ) ) as dirents:
+            async for dirent in dirents: yield dirent
+
     def produce_entry_accessor(
         self, name: __.PossibleRelativeLocator
     ) -> __.GeneralAdapter:
@@ -301,37 +482,42 @@ class DirectoryAdapter( _Common, __.DirectoryAdapter ):
         ] = __.absent,
         recurse: bool = True
     ) -> __.cabc.Sequence[ __.DirectoryEntry ]:
-        from aiofiles.os import scandir
-        filters_ = (
-            ( ) if __.is_absent( filters )
-            else __.filters_from_specifiers( filters ) )
-        scanners = [ ]
-        results = [ ]
-        # TODO: Handle scandir exceptions.
-        with await scandir( self.implement ) as dirents:
-            # TODO: Process dirents concurrently.
-            for dirent in dirents:
-                url = __.Url.from_url( dirent.path )
-                inode = (
-                    await GeneralAdapter( url = url )
-                    .examine(
-                        attributes = attributes,
-                        pursue_indirection = False ) )
-                dirent_ = __.DirectoryEntry( inode = inode, url = url )
-                if filters_ and await __.apply_filters( dirent_, filters_ ):
-                    continue
-                if recurse and inode.is_directory( ):
-                    scanners.append(
-                        DirectoryAdapter( url = url )
-                        .survey_entries(
-                            attributes = attributes,
-                            filters = filters_,
-                            recurse = recurse ) )
-                results.append( dirent_ )
-            if recurse:
-                results.extend( __.chain.from_iterable(
-                    await __.asyncf.gather_async( *scanners ) ) )
-        return results
+        filters_ = None if __.is_absent( filters ) else tuple( filters )
+        return await __.single_flights.coalesce(
+            ( 'survey-entries', self.url.geturl( ),
+              attributes, filters_, recurse ),
+            __.funct.partial(
+                self._survey_entries,
+                attributes = attributes,
+                filters = filters,
+                recurse = recurse ) )
+
+    async def _survey_entries(
+        self,
+        attributes: __.InodeAttributes,
+        filters: __.Absential[ __.cabc.Iterable[ __.PossibleFilter ] ],
+        recurse: bool,
+    ) -> __.cabc.Sequence[ __.DirectoryEntry ]:
+        # Tuple, since results may be shared by coalesced requests.
+        return tuple( [
+            dirent async for dirent in self.iterate_entries(
+                attributes = attributes, filters = filters, recurse = recurse )
+        ] )
+
+    @__.ctxl.asynccontextmanager
+    async def watch(
+        self, subscriber: __.Absential[ __.WatchSubscriber ] = __.absent
+    ) -> __.cabc.AsyncIterator[ __.typx.Optional[ __.DirectoryWatcher ] ]:
+        ''' Watches directory tree for alterations, for duration of context.
+
+            While watched, surveys of the tree and reads of small files
+            within it are answered from memory, until alterations to them
+            are observed. Subscriber, if supplied, is notified of altered
+            paths. Provides nothing, if watchers are disabled.
+        '''
+        async with __.directory_watchers.watch(
+            self.url, subscriber = subscriber
+        ) as watcher: yield watcher
 
 
 class FileAdapter( _Common, __.FileAdapter ):
@@ -344,22 +530,133 @@ class FileAdapter( _Common, __.FileAdapter ):
     async def acquire_content_result(
         self, attributes: __.InodeAttributes = __.InodeAttributes.Nothing
     ) -> __.AcquireContentBytesResult:
+        return await __.single_flights.coalesce(
+            ( 'acquire-content', self.url.geturl( ), attributes ),
+            __.funct.partial(
+                self._acquire_content_result, attributes = attributes ) )
+
+    @__.ctxl.asynccontextmanager
+    async def acquire_content_mapping(
+        self,
+        attributes: __.InodeAttributes = __.InodeAttributes.Nothing,
+    ) -> __.cabc.AsyncIterator[ __.AcquireContentViewResult ]:
+        ''' Provides inode and content of file as memory-mapped view.
+
+            Avoids copying file content into process memory. Pages are read
+            from the operating system page cache on demand, so repeated reads
+            of the same file are cheap. The view, and any views derived from
+            it, must not be used after the context exits.
+
+            Small files are copied rather than mapped. Mapped pages, which
+            are beyond the end of a file, after it is truncated in place by
+            another writer, cannot be read and the process may be killed
+            by the operating system on access to them. Writes through this
+            adapter replace files rather than truncating them.
+        '''
+        Error = __.funct.partial(
+            __.LocationAcquireContentFailure, url = self.url )
+        async with __.ctxl.AsyncExitStack( ) as exits:
+            try:
+                from os import fstat
+                from aiofiles import open as open_
+                stream = await exits.enter_async_context(
+                    open_( self.implement, 'rb' ) )
+                stat = fstat( stream.fileno( ) )
+                content = exits.enter_context(
+                    _map_content( stream.fileno( ), stat.st_size ) )
+            except Exception as exc:
+                raise Error( reason = str( exc ) ) from exc
+            inode = await __.honor_inode_attributes_async(
+                inode = _recall_inode( stat ),
+                attributes = attributes,
+                error_to_raise = Error,
+                content = content )
+            # Zero size may be reported by pseudo-files, which have content.
+            if stat.st_size: _memoize_inode( stat, inode, attributes )
+            yield __.AcquireContentViewResult(
+                content = content, inode = inode )
+
+    async def acquire_content_range(
+        self,
+        start: int,
+        end: __.Absential[ int ] = __.absent,
+        attributes: __.InodeAttributes = __.InodeAttributes.Nothing,
+    ) -> __.AcquireContentRangeResult:
+        ''' Returns inode and range of content of file as raw bytes.
+
+            Only the range is read, after seeking to it. MIME type and
+            charset, if not already known for the file, are detected from
+            its head.
+        '''
         Error = __.funct.partial(
             __.LocationAcquireContentFailure, url = self.url )
         try:
             from os import fstat
             from aiofiles import open as open_
             async with open_( self.implement, 'rb' ) as stream:
-                content = await stream.read( )
                 stat = fstat( stream.fileno( ) )
+                inode = _recall_inode( stat )
+                start_, end_ = __.clip_content_range(
+                    stat.st_size, start, end )
+                await stream.seek( start_ )
+                content = await stream.read( end_ - start_ )
+                head = await _read_head_if_necessary(
+                    stream, inode, attributes,
+                    content = content if 0 == start_ else b'' )
         except Exception as exc: raise Error( reason = str( exc ) ) from exc
-        inode_s = _inode_from_stat( stat )
-        inode = __.honor_inode_attributes(
-            inode = inode_s,
+        inode = __.honor_inode_attributes_from_head(
+            inode = inode,
             attributes = attributes,
             error_to_raise = Error,
-            content = content )
-        return __.AcquireContentBytesResult( content = content, inode = inode )
+            head = head )
+        return __.AcquireContentRangeResult(
+            content = content, inode = inode, start = start_, end = end_ )
+
+    @__.ctxl.asynccontextmanager
+    async def acquire_content_stream(
+        self,
+        attributes: __.InodeAttributes = __.InodeAttributes.Nothing,
+        chunk_size: __.ContentChunkSizeArgument =
+            __.content_chunk_size_default,
+    ) -> __.cabc.AsyncIterator[ __.ContentStream ]:
+        Error = __.funct.partial(
+            __.LocationAcquireContentFailure, url = self.url )
+        async with __.ctxl.AsyncExitStack( ) as exits:
+            try:
+                from os import fstat
+                from aiofiles import open as open_
+                stream = await exits.enter_async_context(
+                    open_( self.implement, 'rb' ) )
+                stat = fstat( stream.fileno( ) )
+            except Exception as exc:
+                raise Error( reason = str( exc ) ) from exc
+
+            async def read_chunks( ) -> __.cabc.AsyncIterator[ bytes ]:
+                while True:
+                    try: chunk = await stream.read( chunk_size )
+                    except Exception as exc:
+                        raise Error( reason = str( exc ) ) from exc
+                    if not chunk: break
+                    yield chunk
+
+            yield __.ContentStream(
+                chunks = read_chunks( ),
+                inode = _inode_from_stat( stat ),
+                observer = __.InodeAttributesAccumulator(
+                    attributes = attributes, error_to_raise = Error ) )
+
+    async def stage_content(
+        self,
+        content: bytes,
+        attributes: __.InodeAttributes = __.InodeAttributes.Nothing,
+        options: __.FileUpdateOptions = __.FileUpdateOptions.Defaults,
+    ) -> __.StagedContentUpdate:
+        # Note: Appends are not staged, since that would copy prior content.
+        if __.FileUpdateOptions.Append & options:
+            return await super( ).stage_content(
+                content, attributes = attributes, options = options )
+        return await self._stage_content(
+            content, attributes, options, keep_prior = True )
 
     async def update_content(
         self,
@@ -367,26 +664,405 @@ class FileAdapter( _Common, __.FileAdapter ):
         attributes: __.InodeAttributes = __.InodeAttributes.Nothing,
         options: __.FileUpdateOptions = __.FileUpdateOptions.Defaults,
     ) -> __.Inode:
+        if __.FileUpdateOptions.Append & options:
+            return await self._append_content_stream(
+                ( content, ), attributes )
+        staging = await self._stage_content(
+            content, attributes, options, keep_prior = False )
+        try: return await staging.commit( )
+        finally: await staging.discard( )
+
+    async def update_content_stream(
+        self,
+        chunks: __.cabc.AsyncIterable[ bytes ],
+        attributes: __.InodeAttributes = __.InodeAttributes.Nothing,
+        options: __.FileUpdateOptions = __.FileUpdateOptions.Defaults,
+    ) -> __.Inode:
+        if __.FileUpdateOptions.Append & options:
+            return await self._append_content_stream( chunks, attributes )
+        Error = __.funct.partial(
+            __.LocationUpdateContentFailure, url = self.url )
+        accumulator = __.InodeAttributesAccumulator(
+            attributes = attributes, error_to_raise = Error )
+
+        async def observe( ) -> __.cabc.AsyncIterator[ bytes ]:
+            async for chunk in chunks:
+                accumulator.observe( chunk )
+                yield chunk
+
+        location = _resolve_destination( self.implement )
+        temporary, stat = await _stage_with_parents(
+            self.url, Error,
+            lambda: content_writer.stage_stream( location, observe( ) ) )
+        staging = _StagedFile(
+            location = location, temporary = temporary,
+            inode = accumulator.conclude( _inode_from_stat( stat ) ),
+            stat = stat, attributes = attributes,
+            exclusive = bool( __.FileUpdateOptions.Absence & options ),
+            keep_prior = False, error_to_raise = Error )
+        try: return await staging.commit( )
+        finally: await staging.discard( )
+
+    async def _acquire_content_result(
+        self, attributes: __.InodeAttributes
+    ) -> __.AcquireContentBytesResult:
+        Error = __.funct.partial(
+            __.LocationAcquireContentFailure, url = self.url )
+        try: content, stat = await _read_content( self.implement )
+        except Exception as exc: raise Error( reason = str( exc ) ) from exc
+        inode = await __.honor_inode_attributes_async(
+            inode = _recall_inode( stat ),
+            attributes = attributes,
+            error_to_raise = Error,
+            content = content )
+        _memoize_inode( stat, inode, attributes )
+        return __.AcquireContentBytesResult( content = content, inode = inode )
+
+    async def _append_content_stream(
+        self,
+        chunks: __.cabc.Iterable[ bytes ] | __.cabc.AsyncIterable[ bytes ],
+        attributes: __.InodeAttributes,
+    ) -> __.Inode:
+        # Note: Appends are made in place and so are not atomic.
         Error = __.funct.partial(
             __.LocationUpdateContentFailure, url = self.url )
-        flags = _flags_from_file_update_options( options )
         await _create_parent_directories(
             self.url, __.Permissions_RCUD, error_to_raise = Error )
+        accumulator = __.InodeAttributesAccumulator(
+            attributes = attributes, error_to_raise = Error )
         try:
             from os import fstat
             async with __.ctxl.AsyncExitStack( ) as exits:
                 stream = await exits.enter_async_context(
-                    _open_binary_for_update( self.implement, flags ) )
-                await stream.write( content )
+                    _open_binary_for_update( self.implement, 'a' ) )
+                async for chunk in __.chain_async( chunks ):
+                    accumulator.observe( chunk )
+                    await stream.write( chunk )
                 await stream.flush( ) # Cannot use bytes count in append mode.
+                await content_writer.sync( stream.fileno( ) )
                 stat = fstat( stream.fileno( ) )
         except Exception as exc: raise Error( reason = str( exc ) ) from exc
-        inode_s = _inode_from_stat( stat )
-        return __.honor_inode_attributes(
-            inode = inode_s,
-            attributes = attributes,
-            error_to_raise = Error,
-            content = content )
+        return accumulator.conclude( _inode_from_stat( stat ) )
+
+    async def _stage_content(
+        self,
+        content: bytes,
+        attributes: __.InodeAttributes,
+        options: __.FileUpdateOptions,
+        keep_prior: bool,
+    ) -> '_StagedFile':
+        Error = __.funct.partial(
+            __.LocationUpdateContentFailure, url = self.url )
+        location = _resolve_destination( self.implement )
+        temporary, stat = await _stage_with_parents(
+            self.url, Error,
+            lambda: content_writer.stage( location, content ) )
+        try:
+            inode = await __.honor_inode_attributes_async(
+                inode = _inode_from_stat( stat ),
+                attributes = attributes,
+                error_to_raise = Error,
+                content = content )
+        except BaseException:
+            _remove_if_exists( temporary )
+            raise
+        return _StagedFile(
+            location = location, temporary = temporary,
+            inode = inode, stat = stat, attributes = attributes,
+            exclusive = bool( __.FileUpdateOptions.Absence & options ),
+            keep_prior = keep_prior, error_to_raise = Error )
+
+
+class _StagedFile( __.StagedContentUpdate ):
+    ''' Content in temporary file, which is staged to replace file. '''
+    # TODO: Immutable instance attributes.
+
+    def __init__( # noqa: PLR0913
+        self, *,
+        location: __.Path,
+        temporary: __.Path,
+        inode: __.Inode,
+        stat: _StatResult,
+        attributes: __.InodeAttributes,
+        exclusive: bool,
+        keep_prior: bool,
+        error_to_raise: __.typx.Callable[ ..., __.LocationOperateFailure ],
+    ):
+        self.attributes = attributes
+        self.committed = False
+        self.error_to_raise = error_to_raise
+        self.exclusive = exclusive
+        self.existed = False
+        self.inode = inode
+        self.keep_prior = keep_prior
+        self.location = location
+        self.prior: __.typx.Optional[ __.Path ] = None
+        self.stat = stat
+        self.temporary = temporary
+
+    async def commit( self ) -> __.Inode:
+        try:
+            self.existed, self.prior = await content_writer.commit(
+                self.temporary, self.location,
+                exclusive = self.exclusive, keep_prior = self.keep_prior )
+        except Exception as exc:
+            raise self.error_to_raise( reason = str( exc ) ) from exc
+        self.committed = True
+        _memoize_inode( self.stat, self.inode, self.attributes )
+        return self.inode
+
+    async def discard( self ) -> None:
+        location = self.prior if self.committed else self.temporary
+        self.prior = None
+        if None is not location:
+            await __.asyncio.to_thread( _remove_if_exists, location )
+
+    async def revert( self ) -> None:
+        if not self.committed: return
+        if self.existed and None is self.prior: return # Prior is lost.
+        try:
+            await content_writer.revert(
+                self.location, self.existed, self.prior )
+        except Exception as exc:
+            raise self.error_to_raise( reason = str( exc ) ) from exc
+        self.committed = False
+        self.prior = None
+
+
+# Note: Plain dataclass, because immutable class machinery is costly in a
+#       record created per directory entry.
+@__.dcls.dataclass( frozen = True, slots = True )
+class _ScanRecord:
+    ''' Directory entry from scan, with species and maybe status. '''
+
+    path: str
+    species: __.LocationSpecies
+    stat: __.typx.Optional[ _StatResult ]
+    entry: __.typx.Any # os.DirEntry
+
+    def as_provisional_entry( self ) -> __.DirectoryEntry:
+        ''' Produces directory entry with inode of only known species. '''
+        inode = __.Inode(
+            species = self.species,
+            permissions = __.Permissions.Abstain,
+            supplement = self.stat,
+            mimetype = _derive_mimetype( self.species ) )
+        return __.DirectoryEntry(
+            inode = inode, url = __.Url.from_url( self.path ) )
+
+
+class _Surveyor:
+    ''' Surveys directory trees, breadth-first, with bounded concurrency.
+
+        Entries of each directory are yielded in order of their names.
+
+        Each directory is scanned in a single worker thread hop. Filters
+        which do not require inodes are applied to entries from the scan,
+        before any status is gathered, and pruned directories are never
+        descended into. Status information for the survivors is gathered in
+        one more worker thread hop and is reused for inodes. MIME type
+        probes for files are run concurrently in worker threads. Scans and
+        probes are capped for the whole survey, regardless of tree shape.
+
+        Symbolic links are resolved to their targets, as by examination of
+        their locations. Dangling links remain symbolic links. Linked
+        directories are only descended into, if they are outside of trees
+        already being surveyed, so that cycles of links terminate.
+    '''
+    # TODO: Immutable instance attributes.
+
+    attributes: __.InodeAttributes
+    filters: __.cabc.Sequence[ __.Filter ]
+
+    def __init__(
+        self,
+        attributes: __.InodeAttributes,
+        filters: __.cabc.Sequence[ __.Filter ],
+    ):
+        self.attributes = attributes
+        self.filters = filters
+        self._filters_early = tuple(
+            filter_ for filter_ in filters
+            if not filter_.requires_inode( ) )
+        self._filters_late = tuple(
+            filter_ for filter_ in filters if filter_.requires_inode( ) )
+        self._links: set[ str ] = set( )
+        self._probes = __.asyncio.Semaphore( _survey_probes_maximum )
+        self._roots: list[ str ] = [ ]
+        self._scans = __.asyncio.Semaphore( _survey_scans_maximum )
+
+    async def iterate(
+        self,
+        location: __.Path,
+        recurse: bool = True,
+        depth_maximum: __.Absential[ int ] = __.absent,
+        entries_maximum: __.Absential[ int ] = __.absent,
+    ) -> __.cabc.AsyncIterator[ __.DirectoryEntry ]:
+        ''' Yields entries of directory and, optionally, descendants. '''
+        if not __.is_absent( depth_maximum ) and 1 > depth_maximum: return
+        if not __.is_absent( entries_maximum ) and 1 > entries_maximum:
+            return
+        self._roots.append(
+            await __.asyncio.to_thread( __.os.path.realpath, location ) )
+        count = 0
+        depth = 1
+        level = [ location ]
+        while level:
+            descend = recurse and (
+                __.is_absent( depth_maximum ) or depth < depth_maximum )
+            level_next: list[ __.Path ] = [ ]
+            async for dirents in self._survey_level( level ):
+                for dirent in dirents:
+                    yield dirent
+                    count += 1
+                    if count == entries_maximum: return
+                    if not descend or not dirent.is_directory( ): continue
+                    path = dirent.url.path
+                    if path in self._links and not await self._admit_link(
+                        path
+                    ): continue
+                    level_next.append( __.Path( path ) )
+            level = level_next
+            depth += 1
+
+    async def _admit_link( self, path: str ) -> bool:
+        location = await __.asyncio.to_thread( __.os.path.realpath, path )
+        if any(
+            location == root or location.startswith( f"{root.rstrip( '/' )}/" )
+            for root in self._roots
+        ): return False
+        self._roots.append( location )
+        return True
+
+    async def _examine(
+        self, url: __.Url, stat: _StatResult
+    ) -> __.DirectoryEntry:
+        Error = __.funct.partial( __.LocationExamineFailure, url = url )
+        inode = _recall_inode( stat )
+        if (    inode.is_file( ) and not inode.mimetype
+            and __.InodeAttributes.Mimetype & self.attributes
+        ):
+            async with self._probes:
+                try:
+                    mimetype = await __.single_flights.coalesce(
+                        ( 'probe-mimetype', url.path ),
+                        __.funct.partial(
+                            __.asyncio.to_thread,
+                            _probe_mimetype, url.path ) )
+                except Exception as exc:
+                    raise Error( reason = str( exc ) ) from exc
+            inode = inode.with_attributes( mimetype = mimetype )
+        inode = __.honor_inode_attributes(
+            inode = inode, attributes = self.attributes,
+            error_to_raise = Error )
+        _memoize_inode( stat, inode, self.attributes )
+        return __.DirectoryEntry( inode = inode, url = url )
+
+    async def _filter(
+        self,
+        dirents: __.cabc.Sequence[ __.DirectoryEntry ],
+        filters: __.cabc.Sequence[ __.Filter ],
+    ) -> list[ __.DirectoryEntry ]:
+        if not filters: return list( dirents )
+        return [
+            dirent for dirent in dirents
+            if not await __.apply_filters( dirent, filters ) ]
+
+    def _is_linked( self, path: str ) -> bool:
+        return any(
+            path == link or path.startswith( f"{link}/" )
+            for link in self._links )
+
+    async def _scan( self, location: __.Path ) -> list[ _ScanRecord ]:
+        # Watchers do not follow links, so their indices would go stale.
+        watcher = (
+            None if self._is_linked( str( location ) )
+            else __.directory_watchers.find( location ) )
+        async with self._scans:
+            try:
+                if None is not watcher:
+                    return await _scan_indexed_directory(
+                        location, watcher.index )
+                return await __.single_flights.coalesce(
+                    ( 'scan-directory', str( location ) ),
+                    __.funct.partial(
+                        __.asyncio.to_thread, _scan_directory, location ) )
+            except Exception as exc:
+                raise __.LocationSurveyEntriesFailure(
+                    url = location, reason = str( exc ) ) from exc
+
+    async def _stat(
+        self, records: __.cabc.Sequence[ _ScanRecord ]
+    ) -> list[ _StatResult ]:
+        if not records: return [ ]
+        async with self._scans:
+            return await __.asyncio.to_thread( _stat_scan_records, records )
+
+    async def _survey_directory(
+        self, location: __.Path
+    ) -> list[ __.DirectoryEntry ]:
+        # Sorted by name, so that order of survey is deterministic.
+        records = sorted(
+            await self._scan( location ), key = lambda record: record.path )
+        if self._filters_early:
+            dirents = await self._filter(
+                [ record.as_provisional_entry( ) for record in records ],
+                self._filters_early )
+            survivors = frozenset( dirent.url.path for dirent in dirents )
+            records = [
+                record for record in records if record.path in survivors ]
+        stats = await self._stat( records )
+        self._links.update(
+            record.path for record, stat in zip( records, stats )
+            if  __.LocationSpecies.Symlink is record.species
+            and __.LocationSpecies.Directory is _species_from_stat( stat ) )
+        dirents = await __.asyncf.gather_async( *(
+            self._examine( __.Url.from_url( record.path ), stat )
+            for record, stat in zip( records, stats ) ) )
+        return await self._filter( dirents, self._filters_late )
+
+    async def _survey_level(
+        self, level: __.cabc.Sequence[ __.Path ]
+    ) -> __.cabc.AsyncIterator[ list[ __.DirectoryEntry ] ]:
+        # Directories are surveyed concurrently, but yielded in order, so
+        # that results are deterministic. Only a bounded window of surveys
+        # runs ahead of the consumer. Early exits cancel pending work.
+        locations = iter( level )
+        tasks: list[ __.asyncio.Task[ list[ __.DirectoryEntry ] ] ] = [ ]
+
+        def replenish( ):
+            for location in locations:
+                tasks.append( __.asyncio.create_task(
+                    self._survey_directory( location ) ) )
+                if len( tasks ) >= _survey_lookahead_maximum: break
+
+        replenish( )
+        try:
+            while tasks:
+                dirents = await tasks[ 0 ]
+                tasks.pop( 0 )
+                replenish( )
+                yield dirents
+        finally:
+            for task in tasks: task.cancel( )
+            await __.asyncio.gather( *tasks, return_exceptions = True )
+
+
+async def prepare( auxdata: __.appcore.Globals ):
+    configuration = (
+        auxdata.configuration
+        .get( 'location-adapters', { } ).get( _module_name, { } ) )
+    __.directory_watchers.configure( configuration.get( 'watchers', { } ) )
+    content_writer.configure( configuration.get( 'writes', { } ) )
+    auxdata.exits.push_async_callback( __.directory_watchers.close )
+    __.inode_metadata_cache.configure(
+        configuration.get( 'inode-metadata-cache', { } ) )
+    if not __.inode_metadata_cache.enabled: return
+    location = auxdata.provide_cache_location(
+        'locations', 'inode-metadata.json' )
+    await __.inode_metadata_cache.load( location )
+    auxdata.exits.push_async_callback(
+        __.inode_metadata_cache.save, location )
 
 
 async def register_defaults( ):
@@ -417,6 +1093,66 @@ def _access_mode_from_permissions(
     return mode
 
 
+def _advise_mapping( mapping: __.typx.Any ):
+    ''' Hints to kernel that mapping will be read once, front to back. '''
+    import mmap
+    if not hasattr( mapping, 'madvise' ): return
+    for name in ( 'MADV_SEQUENTIAL', 'MADV_WILLNEED' ):
+        advice = getattr( mmap, name, None )
+        if None is advice: continue
+        # Advice is only a hint. Failure to apply it is harmless.
+        with __.ctxl.suppress( OSError ): mapping.madvise( advice )
+
+
+def _commit_temporary(
+    temporary: __.Path,
+    location: __.Path,
+    exclusive: bool,
+    keep_prior: bool,
+    sync_directory: bool,
+) -> tuple[ bool, __.typx.Optional[ __.Path ] ]:
+    from os import link, replace
+    existed = False
+    prior = None
+    if exclusive: _link_exclusively( temporary, location )
+    else:
+        existed = location.exists( )
+        if existed and keep_prior:
+            prior = _produce_temporary_location( location )
+            try: link( location, prior )
+            except OSError: prior = None
+        try: replace( temporary, location )
+        except BaseException:
+            if None is not prior: _remove_if_exists( prior )
+            raise
+    if sync_directory: _sync_directory( location.parent )
+    return existed, prior
+
+
+def _conclude_temporary(
+    descriptor: int, location: __.Path, sync: bool
+) -> _StatResult:
+    from os import fchmod, fstat, fsync, stat
+    # Replacement keeps permissions of prior file, if any.
+    with __.ctxl.suppress( FileNotFoundError ):
+        fchmod( descriptor, stat( location ).st_mode & 0o7777 )
+    if sync: fsync( descriptor )
+    return fstat( descriptor )
+
+
+def _copy_content( descriptor: int, size: int ) -> memoryview:
+    from io import FileIO
+    view = memoryview( bytearray( size ) )
+    count = 0
+    with FileIO( descriptor, closefd = False ) as stream:
+        stream.seek( 0 )
+        while count < size:
+            count_ = stream.readinto( view[ count : ] )
+            if not count_: break
+            count += count_
+    return view[ : count ]
+
+
 async def _create_parent_directories(
     url: __.Url,
     permissions: __.Permissions | __.PermissionsTable,
@@ -447,14 +1183,6 @@ def _derive_mimetype( species: __.LocationSpecies ) -> __.typx.Optional[ str ]:
     return None
 
 
-def _flags_from_file_update_options( options: __.FileUpdateOptions ) -> str:
-    flags = [ ]
-    if __.FileUpdateOptions.Append & options: flags.append( 'a' )
-    else: flags.append( 'w' )
-    if __.FileUpdateOptions.Absence & options: flags.append( 'x' )
-    return ''.join( flags )
-
-
 def _inode_from_stat( stat: _StatResult ) -> __.Inode:
     permissions = _permissions_from_stat( stat )
     species = _species_from_stat( stat )
@@ -494,6 +1222,13 @@ def _permissions_from_stat( inode: _StatResult ) -> __.Permissions:
     return permissions
 
 
+def _memoize_inode(
+    stat: _StatResult, inode: __.Inode, attributes: __.InodeAttributes
+):
+    if inode.is_file( ):
+        __.inode_metadata_cache.memoize( stat, inode, attributes )
+
+
 def _normalize_path_parts(
     parts: __.cabc.Iterable[ __.PossiblePath ]
 ) -> tuple[ str | __.PathLike[ str ], ... ]:
@@ -502,6 +1237,43 @@ def _normalize_path_parts(
         for part in parts )
 
 
+def _link_exclusively( temporary: __.Path, location: __.Path ):
+    from os import link, replace
+    # Note: Hard link fails, if destination exists, unlike rename.
+    try: link( temporary, location )
+    except FileExistsError as exc:
+        raise FileExistsError(
+            exc.errno, exc.strerror, str( location ) ) from None
+    except OSError:
+        if location.exists( ): raise
+        replace( temporary, location )
+    else: _remove_if_exists( temporary )
+
+
+@__.ctxl.contextmanager
+def _map_content(
+    descriptor: int, size: int
+) -> __.cabc.Iterator[ memoryview ]:
+    # Note: Empty files cannot be mapped and copies of small files are
+    #       cheap, while not exposing them to truncations by other writers.
+    if size < _mapping_size_minimum:
+        yield _copy_content( descriptor, size )
+        return
+    from mmap import ACCESS_READ, mmap
+    mapping = mmap( descriptor, size, access = ACCESS_READ )
+    # Truncation between status and mapping would leave pages unbacked.
+    if __.os.fstat( descriptor ).st_size < size:
+        mapping.close( )
+        yield _copy_content( descriptor, size )
+        return
+    _advise_mapping( mapping )
+    content = memoryview( mapping )
+    try: yield content
+    finally:
+        content.release( )
+        mapping.close( )
+
+
 def _open_binary_for_update( location: __.Path, flags: str ) -> __.typx.Any:
     from aiofiles import open as open_
     match flags:
@@ -510,6 +1282,19 @@ def _open_binary_for_update( location: __.Path, flags: str ) -> __.typx.Any:
         case _: return open_( location, 'wb' )
 
 
+def _probe_mimetype( location: str ) -> str:
+    # Note: Each python-magic detector serializes its callers with a lock.
+    #       Per-thread detectors allow probes to proceed in parallel.
+    detector = getattr( _mimetype_detectors, 'detector', None )
+    if None is detector:
+        from magic import Magic
+        detector = _mimetype_detectors.detector = Magic( mime = True )
+    # Note: Probes would otherwise describe symbolic links themselves.
+    if __.os.path.islink( location ):
+        location = __.os.path.realpath( location )
+    return detector.from_file( location )
+
+
 async def _probe_accessor_if_exists(
     accessor: __.GeneralAccessor,
     species: __.LocationSpecies,
@@ -532,6 +1317,183 @@ async def _probe_accessor_if_exists(
     return False
 
 
+def _produce_temporary_location( location: __.Path ) -> __.Path:
+    return location.with_name( f".{location.name}.{__.uuid4( ).hex}.tmp" )
+
+
+async def _read_content(
+    location: __.Path
+) -> tuple[ bytes, _StatResult ]:
+    from os import fstat
+    from aiofiles import open as open_
+    watcher = __.directory_watchers.find( location )
+    location_ = __.os.path.abspath( location )
+    generation = 0
+    if None is not watcher:
+        record = watcher.index.recall_content( location_ )
+        if None is not record: return record[ 1 ], record[ 0 ]
+        generation = watcher.index.produce_generation(
+            __.os.path.dirname( location_ ) )
+    async with open_( location, 'rb' ) as stream:
+        content = await stream.read( )
+        stat = fstat( stream.fileno( ) )
+    if None is not watcher:
+        watcher.index.memoize_content( location_, stat, content, generation )
+    return content, stat
+
+
+async def _read_head_if_necessary(
+    stream: __.typx.Any,
+    inode: __.Inode,
+    attributes: __.InodeAttributes,
+    content: bytes,
+) -> __.Absential[ bytes ]:
+    needs_mimetype = (
+        bool( __.InodeAttributes.Mimetype & attributes )
+        and not inode.mimetype )
+    needs_charset = (
+        bool( __.InodeAttributes.Charset & attributes )
+        and not inode.charset )
+    if not needs_mimetype and not needs_charset: return __.absent
+    # Leading content, already read, is reused when sufficient.
+    if (    len( content ) >= _head_probe_size
+        or  len( content ) == inode.bytes_count
+    ): return content[ : _head_probe_size ]
+    await stream.seek( 0 )
+    return await stream.read( _head_probe_size )
+
+
+def _recall_inode( stat: _StatResult ) -> __.Inode:
+    inode = _inode_from_stat( stat )
+    if inode.is_file( ): return __.inode_metadata_cache.apply( stat, inode )
+    return inode
+
+
+def _remove_if_exists( location: __.Path ):
+    location.unlink( missing_ok = True )
+
+
+def _resolve_destination( location: __.Path ) -> __.Path:
+    # Note: Replacement of symlink target, rather than symlink itself.
+    from os.path import realpath
+    return __.Path( realpath( location ) )
+
+
+def _revert_committed(
+    location: __.Path, existed: bool, prior: __.typx.Optional[ __.Path ]
+):
+    from os import replace
+    if None is not prior: replace( prior, location )
+    elif not existed: _remove_if_exists( location )
+
+
+def _scan_directory(
+    location: __.Path, stat_all: bool = False
+) -> list[ _ScanRecord ]:
+    from os import scandir
+    records: list[ _ScanRecord ] = [ ]
+    # Note: Entry types usually come from the scan, without further calls.
+    with scandir( location ) as dirents:
+        for dirent in dirents:
+            stat = None
+            if stat_all:
+                stat = dirent.stat( follow_symlinks = False )
+                species = _species_from_stat( stat )
+            elif dirent.is_symlink( ): species = __.LocationSpecies.Symlink
+            elif dirent.is_dir( follow_symlinks = False ):
+                species = __.LocationSpecies.Directory
+            elif dirent.is_file( follow_symlinks = False ):
+                species = __.LocationSpecies.File
+            else:
+                stat = dirent.stat( follow_symlinks = False )
+                species = _species_from_stat( stat )
+            records.append( _ScanRecord(
+                path = dirent.path, species = species,
+                stat = stat, entry = dirent ) )
+    return records
+
+
+async def _scan_indexed_directory(
+    location: __.Path, index: __.SurveyIndex
+) -> list[ _ScanRecord ]:
+    # Note: Entries of watched directories are gathered with their statuses,
+    #       so that later surveys need only restate altered entries.
+    directory = __.os.path.abspath( location )
+    generation = index.produce_generation( directory )
+    statuses = index.recall_directory( directory )
+    if None is statuses:
+        records = await __.asyncio.to_thread(
+            _scan_directory, location, stat_all = True )
+        index.memoize_directory(
+            directory,
+            { __.os.path.basename( record.path ): record.stat
+              for record in records },
+            generation )
+        return records
+    statuses_ = dict( statuses )
+    names = [ name for name, stat in statuses_.items( ) if None is stat ]
+    if names:
+        restats = await __.asyncio.to_thread( _stat_names, directory, names )
+        index.memoize_directory( directory, restats, generation )
+        statuses_.update( restats )
+    return [
+        _ScanRecord(
+            path = __.os.path.join( location, name ),
+            species = _species_from_stat( stat ),
+            stat = stat, entry = None )
+        for name, stat in statuses_.items( ) if None is not stat ]
+
+
+async def _stage_with_parents(
+    url: __.Url,
+    error_to_raise: __.typx.Callable[ ..., __.LocationOperateFailure ],
+    stager: __.cabc.Callable[
+        [ ], __.cabc.Awaitable[ tuple[ __.Path, _StatResult ] ] ],
+) -> tuple[ __.Path, _StatResult ]:
+    # Note: Parent directories are only created after a failure to write,
+    #       which saves a check on every write to an existing directory.
+    try:
+        try: return await stager( )
+        except FileNotFoundError:
+            await _create_parent_directories(
+                url, __.Permissions_RCUD, error_to_raise = error_to_raise )
+            return await stager( )
+    except __.LocationOperateFailure: raise
+    except Exception as exc:
+        raise error_to_raise( reason = str( exc ) ) from exc
+
+
+def _stat_if_exists( location: str ) -> __.typx.Optional[ _StatResult ]:
+    from os import lstat
+    try: return lstat( location )
+    except FileNotFoundError: return None
+
+
+def _stat_names(
+    directory: str, names: __.cabc.Sequence[ str ]
+) -> dict[ str, __.typx.Optional[ _StatResult ] ]:
+    return {
+        name: _stat_if_exists( __.os.path.join( directory, name ) )
+        for name in names }
+
+
+def _stat_scan_records(
+    records: __.cabc.Sequence[ _ScanRecord ]
+) -> list[ _StatResult ]:
+    # Note: On Windows, directory entries carry status from the scan.
+    #       On POSIX, this is one 'lstat' per entry, without path resolution.
+    #       Symbolic links are resolved, unless they dangle.
+    return [ _stat_scan_record( record ) for record in records ]
+
+
+def _stat_scan_record( record: _ScanRecord ) -> _StatResult:
+    if __.LocationSpecies.Symlink is record.species:
+        try: return __.os.stat( record.path )
+        except OSError: pass
+    if None is not record.stat: return record.stat
+    return record.entry.stat( follow_symlinks = False )
+
+
 def _species_from_stat( stat: _StatResult ) -> __.LocationSpecies:  # noqa: PLR0911
     from stat import (
         S_IFMT,
@@ -550,6 +1512,17 @@ def _species_from_stat( stat: _StatResult ) -> __.LocationSpecies:  # noqa: PLR0
     raise __.InodeSpeciesNoSupport( inode_type, _entity_name )
 
 
+def _sync_directory( location: __.Path ):
+    from os import O_RDONLY, close, fsync
+    from os import open as open_
+    # Note: Directories cannot be opened for syncing on some platforms.
+    try: descriptor = open_( location, O_RDONLY )
+    except OSError: return
+    try: fsync( descriptor )
+    except OSError: pass
+    finally: close( descriptor )
+
+
 def _tabulate_permissions(
     permissions: __.Permissions | __.PermissionsTable
 ) -> __.PermissionsTable:
@@ -560,3 +1533,18 @@ def _tabulate_permissions(
         } )
     if __.is_permissions_table( permissions ): return permissions
     raise __.PermissionsClassValidityError( type( permissions ) )
+
+
+def _write_temporary(
+    location: __.Path, content: bytes, sync: bool
+) -> tuple[ __.Path, _StatResult ]:
+    temporary = _produce_temporary_location( location )
+    try:
+        with temporary.open( 'xb' ) as stream:
+            stream.write( content )
+            stream.flush( )
+            stat = _conclude_temporary( stream.fileno( ), location, sync )
+    except BaseException:
+        _remove_if_exists( temporary )
+        raise
+    return temporary, stat
@@ -27,11 +27,118 @@ from . import __
 
 _module_name = __name__.replace( f"{__package__}.", '' )
 _entity_name = f"location access adapter '{_module_name}'"
+_closure_timeout = 5.0 # seconds; for clients of other event loops
+_connections_maximum_default = 100
+_keepalive_connections_maximum_default = 20
+_keepalive_expiry_default = 5.0 # seconds
+_scribe = __.acquire_scribe( __package__ )
 
 
 __.AccessImplement.register( _httpx.URL )
 
 
+class ClientsPoolStatistics( __.immut.DataclassObject ):
+    ''' Snapshot of reuse statistics for pool of HTTP clients. '''
+
+    clients_count: int
+    hits: int
+    misses: int
+
+
+class ClientsPool:
+    ''' Shared HTTP clients, one per event loop.
+
+        Each client maintains its own pool of connections, which are kept
+        alive between requests. Reuse of clients avoids TCP and TLS handshakes
+        on every operation.
+    '''
+    # TODO: Immutable instance attributes.
+
+    clients: __.cabc.MutableMapping[
+        __.asyncio.AbstractEventLoop, _httpx.AsyncClient ]
+    http2: bool
+    limits: _httpx.Limits
+    hits: int
+    misses: int
+
+    def __init__( self ):
+        from weakref import WeakKeyDictionary
+        self.clients = WeakKeyDictionary( )
+        self.http2 = False
+        self.limits = _httpx.Limits(
+            max_connections = _connections_maximum_default,
+            max_keepalive_connections = _keepalive_connections_maximum_default,
+            keepalive_expiry = _keepalive_expiry_default )
+        self.hits = 0
+        self.misses = 0
+
+    def acquire( self ) -> _httpx.AsyncClient:
+        ''' Returns client for current event loop, creating if necessary. '''
+        loop = __.asyncio.get_running_loop( )
+        client = self.clients.get( loop )
+        if None is not client and not client.is_closed:
+            self.hits += 1
+            return client
+        self.misses += 1
+        client = _httpx.AsyncClient( http2 = self.http2, limits = self.limits )
+        self.clients[ loop ] = client
+        return client
+
+    async def close( self ):
+        ''' Closes clients for all event loops.
+
+            Clients belonging to other running event loops are closed on
+            their own loops. Clients belonging to event loops, which are not
+            running, cannot be closed and are abandoned.
+        '''
+        loop = __.asyncio.get_running_loop( )
+        clients = tuple( self.clients.items( ) )
+        self.clients.clear( )
+        closures: list[ __.cabc.Awaitable[ None ] ] = [ ]
+        for loop_, client in clients:
+            if client.is_closed: continue
+            if loop_ is loop:
+                closures.append( client.aclose( ) )
+                continue
+            if not loop_.is_running( ):
+                _scribe.warning(
+                    "Abandoned HTTP client of event loop, "
+                    "which is not running." )
+                continue
+            closure = __.asyncio.run_coroutine_threadsafe(
+                client.aclose( ), loop_ )
+            closures.append( __.asyncio.wait_for(
+                __.asyncio.wrap_future( closure ),
+                timeout = _closure_timeout ) )
+        results = await __.asyncio.gather(
+            *closures, return_exceptions = True )
+        for result in results:
+            if not isinstance( result, Exception ): continue
+            _scribe.warning( f"Could not close HTTP client. Reason: {result}" )
+
+    def configure( self, configuration: __.cabc.Mapping[ str, __.typx.Any ] ):
+        ''' Applies configuration to clients created hereafter. '''
+        self.http2 = bool( configuration.get( 'http2', False ) )
+        self.limits = _httpx.Limits(
+            max_connections = configuration.get(
+                'connections-maximum', _connections_maximum_default ),
+            max_keepalive_connections = configuration.get(
+                'keepalive-connections-maximum',
+                _keepalive_connections_maximum_default ),
+            keepalive_expiry = configuration.get(
+                'keepalive-expiry', _keepalive_expiry_default ) )
+
+    def report_statistics( self ) -> ClientsPoolStatistics:
+        ''' Reports counts of clients and of reuses. '''
+        return ClientsPoolStatistics(
+            clients_count = len( self.clients ),
+            hits = self.hits,
+            misses = self.misses )
+
+
+clients_pool = ClientsPool( )
+
+
 class _Common( __.AdapterBase ):
     # TODO: Immutable instance attributes.
 
@@ -70,9 +177,9 @@ class _Common( __.AdapterBase ):
         self, pursue_indirection: bool = True
     ) -> bool:
         from http import HTTPStatus
-        async with _httpx.AsyncClient(
-            follow_redirects = pursue_indirection
-        ) as client: response = await client.head( self.implement )
+        client = clients_pool.acquire( )
+        response = await client.head(
+            self.implement, follow_redirects = pursue_indirection )
         return HTTPStatus.OK == response.status_code
 
     async def examine(
@@ -80,9 +187,12 @@ class _Common( __.AdapterBase ):
         attributes: __.InodeAttributes = __.InodeAttributes.Nothing,
         pursue_indirection: bool = True,
     ) -> __.Inode:
-        inode = await self._examine(
-            attributes = attributes,
-            pursue_indirection = pursue_indirection )
+        inode = await __.single_flights.coalesce(
+            ( 'examine', self.url.geturl( ), attributes, pursue_indirection ),
+            __.funct.partial(
+                self._examine,
+                attributes = attributes,
+                pursue_indirection = pursue_indirection ) )
         if __.LocationSpecies.Void is inode.species:
             raise __.LocationExamineFailure(
                 self.url, reason = "Location does not exist." )
@@ -113,14 +223,14 @@ class _Common( __.AdapterBase ):
             permissions = __.Permissions.Abstain,
             species = __.LocationSpecies.Void,
             supplement = { } )
-        async with _httpx.AsyncClient(
-            follow_redirects = pursue_indirection
-        ) as client:
-            response_h = await client.head( self.implement )
-            if HTTPStatus.NOT_FOUND == response_h.status_code:
-                return inode_absent
-            response_h.raise_for_status( )
-            response_o = await client.options( self.implement )
+        client = clients_pool.acquire( )
+        response_h = await client.head(
+            self.implement, follow_redirects = pursue_indirection )
+        if HTTPStatus.NOT_FOUND == response_h.status_code:
+            return inode_absent
+        response_h.raise_for_status( )
+        response_o = await client.options(
+            self.implement, follow_redirects = pursue_indirection )
         species = __.LocationSpecies.File
         if HTTPStatus.OK != response_o.status_code:
             return __.Inode(
@@ -189,9 +299,9 @@ class GeneralAdapter( _Common, __.GeneralAdapter ):
 
     async def is_indirection( self ) -> bool:
         # HTTP locations can be redirects.
-        async with _httpx.AsyncClient( ) as client:
-            response = await client.head( self.implement )
-            return response.is_redirect
+        client = clients_pool.acquire( )
+        response = await client.head( self.implement )
+        return response.is_redirect
 
 
 class FileAdapter( _Common, __.FileAdapter ):
@@ -204,39 +314,168 @@ class FileAdapter( _Common, __.FileAdapter ):
     async def acquire_content_result(
         self, attributes: __.InodeAttributes = __.InodeAttributes.Nothing,
     ) -> __.AcquireContentBytesResult:
+        return await __.single_flights.coalesce(
+            ( 'acquire-content', self.url.geturl( ), attributes ),
+            __.funct.partial(
+                self._acquire_content_result, attributes = attributes ) )
+
+    async def acquire_content_range(
+        self,
+        start: int,
+        end: __.Absential[ int ] = __.absent,
+        attributes: __.InodeAttributes = __.InodeAttributes.Nothing,
+    ) -> __.AcquireContentRangeResult:
+        ''' Returns inode and range of content of file as raw bytes.
+
+            Requests only the range, if the server supports ranges.
+            Otherwise, the whole content is acquired and then sliced.
+        '''
+        from http import HTTPStatus
+        Error = __.funct.partial(
+            __.LocationAcquireContentFailure, url = self.url )
+        start = max( start, 0 )
+        if not __.is_absent( end ) and end <= start:
+            # Empty ranges cannot be requested; the inode is still useful.
+            inode = await self.examine( attributes = attributes )
+            start_, end_ = __.clip_content_range(
+                inode.bytes_count or 0, start, end )
+            return __.AcquireContentRangeResult(
+                content = b'', inode = inode, start = start_, end = end_ )
+        last = '' if __.is_absent( end ) else str( end - 1 )
+        client = clients_pool.acquire( )
+        response = await client.get(
+            self.implement, headers = { 'Range': f"bytes={start}-{last}" } )
+        if HTTPStatus.OK == response.status_code:
+            # Server ignores ranges; whole content is available anyway.
+            inode = await __.honor_inode_attributes_async(
+                inode = _inode_from_headers(
+                    headers = response.headers,
+                    permissions = __.Permissions.Retrieve, # at least
+                    species = __.LocationSpecies.File ),
+                attributes = attributes,
+                error_to_raise = Error,
+                content = response.content )
+            return __.AcquireContentRangeResult.from_content(
+                response.content, start, end, inode = inode )
+        if HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE != response.status_code:
+            try: response.raise_for_status( )
+            except _httpx.HTTPStatusError as exc:
+                raise Error( reason = str( exc ) ) from exc
+        start_, bytes_count = _parse_content_range(
+            response.headers.get( 'Content-Range', '' ), start )
+        content = (
+            b'' if HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+            == response.status_code else response.content )
+        inode = __.honor_inode_attributes_from_head(
+            inode = _inode_from_headers(
+                headers = response.headers,
+                permissions = __.Permissions.Retrieve, # at least
+                species = __.LocationSpecies.File,
+            ).with_attributes( bytes_count = bytes_count ),
+            attributes = attributes,
+            error_to_raise = Error,
+            head = content if 0 == start_ else __.absent )
+        return __.AcquireContentRangeResult(
+            content = content, inode = inode,
+            start = start_, end = start_ + len( content ) )
+
+    @__.ctxl.asynccontextmanager
+    async def acquire_content_stream(
+        self,
+        attributes: __.InodeAttributes = __.InodeAttributes.Nothing,
+        chunk_size: __.ContentChunkSizeArgument =
+            __.content_chunk_size_default,
+    ) -> __.cabc.AsyncIterator[ __.ContentStream ]:
         Error = __.funct.partial(
             __.LocationAcquireContentFailure, url = self.url )
-        async with _httpx.AsyncClient( ) as client:
-            response = await client.get( self.implement )
+        client = clients_pool.acquire( )
+        async with client.stream( 'GET', self.implement ) as response:
+            yield _produce_content_stream(
+                response, attributes, chunk_size, error_to_raise = Error )
+
+    @__.ctxl.asynccontextmanager
+    async def acquire_content_stream_if_modified(
+        self,
+        inode: __.Inode,
+        attributes: __.InodeAttributes = __.InodeAttributes.Nothing,
+        chunk_size: __.ContentChunkSizeArgument =
+            __.content_chunk_size_default,
+    ) -> __.cabc.AsyncIterator[ __.ContentStream | __.Inode ]:
+        ''' Provides stream of content, if modified since inode observed.
+
+            Entity tag and modification time of observed inode are sent as
+            conditional request headers. If upstream content is unmodified,
+            then observed inode, refreshed from response headers, is provided
+            instead of stream and no content is transferred.
+        '''
+        from http import HTTPStatus
+        Error = __.funct.partial(
+            __.LocationAcquireContentFailure, url = self.url )
+        headers = _headers_from_validators( inode )
+        client = clients_pool.acquire( )
+        async with client.stream(
+            'GET', self.implement, headers = headers
+        ) as response:
+            if HTTPStatus.NOT_MODIFIED == response.status_code:
+                yield _refresh_inode_from_headers( inode, response.headers )
+                return
+            yield _produce_content_stream(
+                response, attributes, chunk_size, error_to_raise = Error )
+
+    async def update_content(
+        self,
+        content: bytes,
+        attributes: __.InodeAttributes = __.InodeAttributes.Nothing,
+        options: __.FileUpdateOptions = __.FileUpdateOptions.Defaults,
+    ) -> __.Inode:
+        Error = __.funct.partial(
+            __.LocationUpdateContentFailure, url = self.url )
+        try: inode_ = await self._examine( )
+        except Exception as exc: raise Error( reason = str( exc ) ) from exc
+        headers = _headers_from_file_update_options( options, inode_, content )
+        client = clients_pool.acquire( )
+        response = await client.put(
+            self.implement, content = content, headers = headers )
         try: response.raise_for_status( )
         except _httpx.HTTPStatusError as exc:
+            _react_http_status_error( exc, headers, Error )
             raise Error( reason = str( exc ) ) from exc
         inode_h = _inode_from_headers(
             headers = response.headers,
-            permissions = __.Permissions.Retrieve, # at least
-            species = __.LocationSpecies.File )
-        inode = __.honor_inode_attributes(
+            permissions = inode_.permissions,
+            species = inode_.species )
+        return await __.honor_inode_attributes_async(
             inode = inode_h,
             attributes = attributes,
             error_to_raise = Error,
-            content = response.content )
-        return __.AcquireContentBytesResult(
-            content = response.content, inode = inode )
+            content = content )
 
-    async def update_content(
+    async def update_content_stream(
         self,
-        content: bytes,
+        chunks: __.cabc.AsyncIterable[ bytes ],
         attributes: __.InodeAttributes = __.InodeAttributes.Nothing,
         options: __.FileUpdateOptions = __.FileUpdateOptions.Defaults,
     ) -> __.Inode:
         Error = __.funct.partial(
             __.LocationUpdateContentFailure, url = self.url )
+        if __.FileUpdateOptions.Append & options:
+            # Content range for append cannot be known before transfer.
+            reason = "Cannot append streamed content."
+            raise Error( reason = reason )
         try: inode_ = await self._examine( )
         except Exception as exc: raise Error( reason = str( exc ) ) from exc
-        headers = _headers_from_file_update_options( options, inode_, content )
-        async with _httpx.AsyncClient( ) as client:
-            response = await client.put(
-                self.implement, content = content, headers = headers )
+        headers = _headers_from_file_update_options( options, inode_, b'' )
+        accumulator = __.InodeAttributesAccumulator(
+            attributes = attributes, error_to_raise = Error )
+
+        async def observe_chunks( ) -> __.cabc.AsyncIterator[ bytes ]:
+            async for chunk in chunks:
+                accumulator.observe( chunk )
+                yield chunk
+
+        client = clients_pool.acquire( )
+        response = await client.put(
+            self.implement, content = observe_chunks( ), headers = headers )
         try: response.raise_for_status( )
         except _httpx.HTTPStatusError as exc:
             _react_http_status_error( exc, headers, Error )
@@ -245,11 +484,37 @@ class FileAdapter( _Common, __.FileAdapter ):
             headers = response.headers,
             permissions = inode_.permissions,
             species = inode_.species )
-        return __.honor_inode_attributes(
+        return accumulator.conclude( inode_h )
+
+    async def _acquire_content_result(
+        self, attributes: __.InodeAttributes
+    ) -> __.AcquireContentBytesResult:
+        Error = __.funct.partial(
+            __.LocationAcquireContentFailure, url = self.url )
+        client = clients_pool.acquire( )
+        response = await client.get( self.implement )
+        try: response.raise_for_status( )
+        except _httpx.HTTPStatusError as exc:
+            raise Error( reason = str( exc ) ) from exc
+        inode_h = _inode_from_headers(
+            headers = response.headers,
+            permissions = __.Permissions.Retrieve, # at least
+            species = __.LocationSpecies.File )
+        inode = await __.honor_inode_attributes_async(
             inode = inode_h,
             attributes = attributes,
             error_to_raise = Error,
-            content = content )
+            content = response.content )
+        return __.AcquireContentBytesResult(
+            content = response.content, inode = inode )
+
+
+async def prepare( auxdata: __.appcore.Globals ):
+    configuration = (
+        auxdata.configuration
+        .get( 'location-adapters', { } ).get( _module_name, { } ) )
+    clients_pool.configure( configuration )
+    auxdata.exits.push_async_callback( clients_pool.close )
 
 
 async def register_defaults( ):
@@ -273,7 +538,7 @@ def _expiration_from_headers(
         max_age = directives.get( 'max-age' )
         if max_age:
             expiration = (
-                __.DateTime.utcnow( )
+                __.DateTime.now( __.TimeZone.utc )
                 + __.TimeDelta( seconds = int( max_age ) ) )
     if not expiration and expires:
         expiration = parsedate_to_datetime( expires )
@@ -298,6 +563,22 @@ def _headers_from_file_update_options(
     return __.types.MappingProxyType( headers )
 
 
+def _headers_from_validators(
+    inode: __.Inode
+) -> __.cabc.Mapping[ str, str ]:
+    from email.utils import format_datetime
+    headers = { }
+    content_id = inode.content_id
+    if content_id and content_id.startswith( 'etag:' ):
+        headers[ 'If-None-Match' ] = content_id.removeprefix( 'etag:' )
+    if ( mtime := inode.mtime ):
+        if None is mtime.tzinfo:
+            mtime = mtime.replace( tzinfo = __.TimeZone.utc )
+        headers[ 'If-Modified-Since' ] = format_datetime(
+            mtime.astimezone( __.TimeZone.utc ), usegmt = True )
+    return __.types.MappingProxyType( headers )
+
+
 def _inode_from_headers(
     headers: __.cabc.Mapping[ str, str ],
     permissions: __.Permissions,
@@ -344,6 +625,48 @@ def _methods_to_permissions(
     return permissions
 
 
+def _parse_content_range(
+    content_range: str, start: int
+) -> tuple[ int, __.typx.Optional[ int ] ]:
+    # Forms: 'bytes <first>-<last>/<size>' and 'bytes */<size>'.
+    # Size may be '*', if unknown.
+    unit, _, range_ = content_range.partition( ' ' )
+    span, _, size = range_.partition( '/' )
+    if 'bytes' != unit.strip( ).lower( ): return start, None
+    bytes_count = int( size ) if size.isdigit( ) else None
+    first, _, _ = span.partition( '-' )
+    if first.isdigit( ): return int( first ), bytes_count
+    if None is bytes_count: return start, None
+    return min( start, bytes_count ), bytes_count
+
+
+def _produce_content_stream(
+    response: _httpx.Response,
+    attributes: __.InodeAttributes,
+    chunk_size: int,
+    error_to_raise: __.typx.Callable[ ..., __.LocationOperateFailure ],
+) -> __.ContentStream:
+    try: response.raise_for_status( )
+    except _httpx.HTTPStatusError as exc:
+        raise error_to_raise( reason = str( exc ) ) from exc
+
+    async def read_chunks( ) -> __.cabc.AsyncIterator[ bytes ]:
+        try:
+            async for chunk in response.aiter_bytes( chunk_size ):
+                yield chunk
+        except _httpx.HTTPError as exc:
+            raise error_to_raise( reason = str( exc ) ) from exc
+
+    return __.ContentStream(
+        chunks = read_chunks( ),
+        inode = _inode_from_headers(
+            headers = response.headers,
+            permissions = __.Permissions.Retrieve, # at least
+            species = __.LocationSpecies.File ),
+        observer = __.InodeAttributesAccumulator(
+            attributes = attributes, error_to_raise = error_to_raise ) )
+
+
 def _react_http_status_error( response_error, headers, error_to_raise ):
     from http import HTTPStatus
     match response_error.response.status_code:
@@ -357,3 +680,20 @@ def _react_http_status_error( response_error, headers, error_to_raise ):
             if 'Content-Range' in headers:
                 reason = "Server does not support append operation."
                 raise error_to_raise( reason = reason )
+
+
+def _refresh_inode_from_headers(
+    inode: __.Inode, headers: __.cabc.Mapping[ str, str ]
+) -> __.Inode:
+    # Responses for unmodified content may omit entity headers.
+    # Their headers amend original headers, from which freshness is renewed.
+    headers_ = _httpx.Headers( inode.supplement )
+    headers_.update( headers )
+    inode_h = _inode_from_headers(
+        headers = headers_,
+        permissions = inode.permissions,
+        species = inode.species )
+    return inode.with_attributes(
+        content_id = inode_h.content_id or inode.content_id,
+        mtime = inode_h.mtime or inode.mtime,
+        etime = inode_h.etime )
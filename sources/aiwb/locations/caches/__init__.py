@@ -23,6 +23,8 @@
 
 
 from . import __
+from . import accounting
+from . import blobs
 from . import simple
 # TODO: archive (tarball, zip)
 # TODO? edit
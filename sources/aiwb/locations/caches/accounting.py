@@ -0,0 +1,445 @@
+# vim: set filetype=python fileencoding=utf-8:
+# -*- coding: utf-8 -*-
+
+#============================================================================#
+#                                                                            #
+#  Licensed under the Apache License, Version 2.0 (the "License");           #
+#  you may not use this file except in compliance with the License.          #
+#  You may obtain a copy of the License at                                   #
+#                                                                            #
+#      http://www.apache.org/licenses/LICENSE-2.0                            #
+#                                                                            #
+#  Unless required by applicable law or agreed to in writing, software       #
+#  distributed under the License is distributed on an "AS IS" BASIS,         #
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  #
+#  See the License for the specific language governing permissions and       #
+#  limitations under the License.                                            #
+#                                                                            #
+#============================================================================#
+
+
+''' Accounting of cache storage, with quotas and eviction.
+
+    Each cache manager, which registers its storage location, has an
+    accountant. Accountants record sizes and access times of cached
+    entries and evict least recently used entries in the background, when
+    byte or entry quotas are exceeded.
+
+    Entries are units of ingestion. A directory tree, which is ingested as
+    a whole, is a single entry; files within it are accounted to it. Hence,
+    eviction never leaves partial directory trees in storage.
+
+    Limitations:
+    * Storage locations must be on local filesystems.
+    * Sizes of entries are measured from storage, after ingestions, and
+      are not tracked as cached files are altered.
+'''
+
+
+from collections import OrderedDict as _OrderedDict
+
+from . import __
+
+
+# TODO: Python 3.12: type statement for aliases
+CacheEvictor: __.typx.TypeAlias = __.cabc.Callable[
+    [ __.cabc.Sequence[ __.Url ] ],
+    __.cabc.Coroutine[ __.typx.Any, __.typx.Any, None ] ]
+
+
+_module_name = __name__.replace( f"{__package__}.", '' )
+_accounting_file_name = '.accounting.json'
+_format_version = 1
+_scribe = __.acquire_scribe( __package__ )
+
+
+class CacheAccountingEntry( __.immut.DataclassObject ):
+    ''' Size and time of last access of cached entry. '''
+
+    bytes_count: int
+    atime: int # nanoseconds since epoch
+    measured: bool = True
+
+
+class CacheAccountantStatistics( __.immut.DataclassObject ):
+    ''' Snapshot of storage and usage statistics for cache manager. '''
+
+    bytes_count: int
+    bytes_maximum: __.typx.Optional[ int ]
+    entries_count: int
+    entries_maximum: __.typx.Optional[ int ]
+    evictions: int
+    evictions_bytes: int
+    hits: int
+    misses: int
+
+
+class CacheAccountant:
+    ''' Accounts for entries in storage location of cache manager.
+
+        Quotas are optional; storage is unbounded without them. Entries
+        are evicted, least recently used first, until storage is within
+        quotas. Evictions happen in the background, after ingestions.
+    '''
+    # TODO: Immutable instance attributes.
+
+    bytes_maximum: __.typx.Optional[ int ]
+    entries: _OrderedDict[ str, CacheAccountingEntry ]
+    entries_maximum: __.typx.Optional[ int ]
+    evictions: int
+    evictions_bytes: int
+    evictor: CacheEvictor
+    hits: int
+    location: __.Path
+    misses: int
+
+    def __init__(
+        self,
+        location: __.Path,
+        evictor: __.Absential[ CacheEvictor ] = __.absent,
+    ):
+        self.bytes_maximum = None
+        self.entries = _OrderedDict( )
+        self.entries_maximum = None
+        self.evictions = 0
+        self.evictions_bytes = 0
+        self.hits = 0
+        self.location = location
+        self.misses = 0
+        self.evictor = (
+            delete_locations if __.is_absent( evictor ) else evictor )
+        self._eviction: __.typx.Optional[ __.asyncio.Task[ None ] ] = None
+
+    def access( self, url: __.Url ) -> bool:
+        ''' Records access of cached location. Returns if it is accounted.
+        '''
+        key = self._find_entry_key( __.Path( url.path ) )
+        if None is key:
+            self.misses += 1
+            return False
+        self.hits += 1
+        entry = self.entries[ key ]
+        self.entries[ key ] = CacheAccountingEntry(
+            bytes_count = entry.bytes_count,
+            atime = __.time_ns( ),
+            measured = entry.measured )
+        self.entries.move_to_end( key )
+        return True
+
+    def configure( self, configuration: __.cabc.Mapping[ str, __.typx.Any ] ):
+        ''' Applies quotas from configuration. '''
+        bytes_maximum = configuration.get( 'bytes-maximum' )
+        entries_maximum = configuration.get( 'entries-maximum' )
+        self.bytes_maximum = (
+            None if None is bytes_maximum else int( bytes_maximum ) )
+        self.entries_maximum = (
+            None if None is entries_maximum else int( entries_maximum ) )
+
+    async def evict( self ):
+        ''' Evicts least recently used entries until within quotas. '''
+        await self._measure( )
+        victims: list[ tuple[ str, CacheAccountingEntry ] ] = [ ]
+        bytes_count = self.report_bytes_count( )
+        while self.entries and self._is_over_quotas(
+            bytes_count, len( self.entries )
+        ):
+            victim = self.entries.popitem( last = False )
+            bytes_count -= victim[ 1 ].bytes_count
+            victims.append( victim )
+        if not victims: return
+        try:
+            await self.evictor( [
+                __.Url.from_url( key ) for key, _ in victims ] )
+        except Exception:
+            # Unevicted entries are still in storage; keep accounting them.
+            for key, entry in reversed( victims ):
+                self.entries[ key ] = entry
+                self.entries.move_to_end( key, last = False )
+            raise
+        self.evictions += len( victims )
+        self.evictions_bytes += sum(
+            entry.bytes_count for _, entry in victims )
+        await self.save( )
+
+    def forget( self, url: __.Url ):
+        ''' Forgets cached location and any entries beneath it. '''
+        path = __.Path( url.path )
+        for key in tuple( self.entries ):
+            if __.Path( key ).is_relative_to( path ): del self.entries[ key ]
+
+    async def load( self ):
+        ''' Loads entries and cumulative statistics, if compatible. '''
+        from json import loads
+        from aiofiles import open as open_
+        location = self.location / _accounting_file_name
+        try:
+            async with open_( location ) as stream:
+                document = loads( await stream.read( ) )
+        except FileNotFoundError: return
+        except ( OSError, ValueError ): return # Corrupt records are rebuilt.
+        if _format_version != document.get( 'version' ): return
+        for key, bytes_count, atime in document.get( 'entries', ( ) ):
+            self.entries[ key ] = CacheAccountingEntry(
+                bytes_count = bytes_count, atime = atime )
+        statistics = document.get( 'statistics', { } )
+        self.evictions = statistics.get( 'evictions', 0 )
+        self.evictions_bytes = statistics.get( 'evictions-bytes', 0 )
+        self.hits = statistics.get( 'hits', 0 )
+        self.misses = statistics.get( 'misses', 0 )
+
+    def memoize( self, url: __.Url ):
+        ''' Records ingestion of cached location.
+
+            If location is beneath an entry, then that entry is remeasured.
+            Else, location becomes a new entry, which absorbs any entries
+            beneath it. Eviction is scheduled, if quotas are exceeded.
+        '''
+        path = __.Path( url.path )
+        key = self._find_entry_key( path )
+        if None is key:
+            key = str( path )
+            self.forget( url )
+        self.entries[ key ] = CacheAccountingEntry(
+            bytes_count = (
+                self.entries[ key ].bytes_count if key in self.entries
+                else 0 ),
+            atime = __.time_ns( ),
+            measured = False )
+        self.entries.move_to_end( key )
+        # Eviction passes also measure entries, even without quotas.
+        self._evict_soon( )
+
+    def report_bytes_count( self ) -> int:
+        ''' Reports total size of entries, as of their last measurements. '''
+        return sum( entry.bytes_count for entry in self.entries.values( ) )
+
+    def report_statistics( self ) -> CacheAccountantStatistics:
+        ''' Reports sizes of storage and counts of accesses and evictions.
+        '''
+        return CacheAccountantStatistics(
+            bytes_count = self.report_bytes_count( ),
+            bytes_maximum = self.bytes_maximum,
+            entries_count = len( self.entries ),
+            entries_maximum = self.entries_maximum,
+            evictions = self.evictions,
+            evictions_bytes = self.evictions_bytes,
+            hits = self.hits,
+            misses = self.misses )
+
+    async def save( self ):
+        ''' Saves entries and cumulative statistics. '''
+        from json import dumps
+        from aiofiles import open as open_
+        from aiofiles.os import makedirs, replace
+        location = self.location / _accounting_file_name
+        document = dumps( {
+            'version': _format_version,
+            'entries': [
+                ( key, entry.bytes_count, entry.atime )
+                for key, entry in self.entries.items( ) ],
+            'statistics': {
+                'evictions': self.evictions,
+                'evictions-bytes': self.evictions_bytes,
+                'hits': self.hits,
+                'misses': self.misses } } )
+        location_ = location.with_name( f"{location.name}.{__.uuid4( ).hex}" )
+        await makedirs( location.parent, exist_ok = True )
+        async with open_( location_, 'w' ) as stream:
+            await stream.write( document )
+        await replace( location_, location )
+
+    def _evict_soon( self ):
+        # Coalesces evictions after concurrent ingestions into fewer passes.
+        if None is not self._eviction and not self._eviction.done( ): return
+        self._eviction = __.asyncio.create_task( self.evict( ) )
+
+        def conclude( task: __.asyncio.Task[ None ] ):
+            if task.cancelled( ): return
+            if None is ( exc := task.exception( ) ): return
+            _scribe.warning(
+                f"Could not evict entries from cache location "
+                f"'{self.location}'. Reason: {exc}" )
+
+        self._eviction.add_done_callback( conclude )
+
+    def _find_entry_key( self, path: __.Path ) -> __.typx.Optional[ str ]:
+        for path_ in ( path, *path.parents ):
+            key = str( path_ )
+            if key in self.entries: return key
+            if path_ == self.location: break
+        return None
+
+    def _is_over_quotas( self, bytes_count: int, entries_count: int ) -> bool:
+        return (
+                (   None is not self.bytes_maximum
+                    and bytes_count > self.bytes_maximum )
+            or  (   None is not self.entries_maximum
+                    and entries_count > self.entries_maximum ) )
+
+    async def _measure( self ):
+        keys = [
+            key for key, entry in self.entries.items( )
+            if not entry.measured ]
+        if not keys: return
+        sizes = await __.asyncio.to_thread(
+            lambda: [ _measure_location( __.Path( key ) ) for key in keys ] )
+        for key, bytes_count in zip( keys, sizes ):
+            # Entries may have been evicted or absorbed while measuring.
+            if key not in self.entries: continue
+            self.entries[ key ] = CacheAccountingEntry(
+                bytes_count = bytes_count,
+                atime = self.entries[ key ].atime )
+
+
+class CacheAccountants:
+    ''' Accountants for storage locations of cache managers.
+
+        Caches report accesses and ingestions by cache URL. Reports are
+        routed to the accountant for the storage location, which contains
+        the URL, if any. Hence, any cache manager implementation can
+        participate by registering its storage location.
+    '''
+    # TODO: Immutable instance attributes.
+
+    accountants: dict[ __.Path, CacheAccountant ]
+    configuration: __.cabc.Mapping[ str, __.typx.Any ]
+
+    def __init__( self ):
+        self.accountants = { }
+        self.configuration = { }
+
+    def access( self, url: __.Url ) -> bool:
+        ''' Records access of cached location, if accounted. '''
+        accountant = self.find( url )
+        if None is accountant: return False
+        return accountant.access( url )
+
+    def configure( self, configuration: __.cabc.Mapping[ str, __.typx.Any ] ):
+        ''' Applies quotas from configuration to every accountant. '''
+        self.configuration = configuration
+        for accountant in self.accountants.values( ):
+            accountant.configure( configuration )
+
+    def find( self, url: __.Url ) -> __.typx.Optional[ CacheAccountant ]:
+        ''' Returns accountant for storage location containing URL. '''
+        if url.scheme not in ( '', 'file' ): return None
+        path = __.Path( url.path )
+        for location in ( path, *path.parents ):
+            if location in self.accountants:
+                return self.accountants[ location ]
+        return None
+
+    def memoize( self, url: __.Url ):
+        ''' Records ingestion of cached location, if accounted. '''
+        accountant = self.find( url )
+        if None is accountant: return
+        accountant.memoize( url )
+
+    async def produce(
+        self,
+        url: __.Url,
+        evictor: __.Absential[ CacheEvictor ] = __.absent,
+    ) -> __.typx.Optional[ CacheAccountant ]:
+        ''' Returns accountant for storage location, creating if necessary.
+
+            Evictor, if supplied, replaces that of any existing accountant,
+            such as one loaded for previously known storage location.
+            Returns nothing, if storage location is not local.
+        '''
+        if url.scheme not in ( '', 'file' ): return None
+        location = __.Path( url.path )
+        accountant = self.accountants.get( location )
+        if None is accountant:
+            accountant = CacheAccountant( location = location )
+            accountant.configure( self.configuration )
+            await accountant.load( )
+            self.accountants[ location ] = accountant
+        if not __.is_absent( evictor ): accountant.evictor = evictor
+        return accountant
+
+    def report_statistics(
+        self
+    ) -> __.cabc.Mapping[ str, CacheAccountantStatistics ]:
+        ''' Reports statistics for each storage location. '''
+        return {
+            str( location ): accountant.report_statistics( )
+            for location, accountant in self.accountants.items( ) }
+
+    async def load( self, location: __.Path ):
+        ''' Loads accountants for storage locations known from file. '''
+        from json import loads
+        from aiofiles import open as open_
+        try:
+            async with open_( location ) as stream:
+                document = loads( await stream.read( ) )
+        except FileNotFoundError: return
+        except ( OSError, ValueError ): return # Corrupt records are rebuilt.
+        if _format_version != document.get( 'version' ): return
+        locations = [
+            __.Path( location_ )
+            for location_ in document.get( 'locations', ( ) )
+            if __.Path( location_ ).is_dir( ) ]
+        await __.asyncf.gather_async(
+            *( self.produce( __.Url.from_url( location_ ) )
+               for location_ in locations ),
+            error_message = 'Failure to load cache accounting.' )
+
+    async def save( self, location: __.Path ):
+        ''' Saves entries of every accountant and their locations to file.
+        '''
+        from json import dumps
+        from aiofiles import open as open_
+        from aiofiles.os import makedirs, replace
+        await __.asyncf.gather_async(
+            *( accountant.save( )
+               for accountant in self.accountants.values( ) ),
+            error_message = 'Failure to save cache accounting.' )
+        document = dumps( {
+            'version': _format_version,
+            'locations': [
+                str( location_ ) for location_ in self.accountants ] } )
+        location_ = location.with_name( f"{location.name}.{__.uuid4( ).hex}" )
+        await makedirs( location.parent, exist_ok = True )
+        async with open_( location_, 'w' ) as stream:
+            await stream.write( document )
+        await replace( location_, location )
+
+
+cache_accountants = CacheAccountants( )
+
+
+async def prepare( auxdata: __.appcore.Globals ):
+    configuration = (
+        auxdata.configuration
+        .get( 'location-caches', { } ).get( _module_name, { } ) )
+    cache_accountants.configure( configuration )
+    location = auxdata.provide_cache_location(
+        'locations', 'caches-accounting.json' )
+    await cache_accountants.load( location )
+    auxdata.exits.push_async_callback( cache_accountants.save, location )
+
+
+async def delete_locations( urls: __.cabc.Sequence[ __.Url ] ):
+    ''' Deletes cached files and directory trees. Default evictor. '''
+    await __.asyncio.to_thread(
+        lambda: [ _delete_location( __.Path( url.path ) ) for url in urls ] )
+
+
+def _delete_location( location: __.Path ):
+    from shutil import rmtree
+    if location.is_dir( ) and not location.is_symlink( ):
+        rmtree( location, ignore_errors = True )
+    else: location.unlink( missing_ok = True )
+
+
+def _measure_file( location: __.Path ) -> int:
+    try: return location.lstat( ).st_size
+    except FileNotFoundError: return 0
+
+
+def _measure_location( location: __.Path ) -> int:
+    if not location.is_dir( ) or location.is_symlink( ):
+        return _measure_file( location )
+    return sum(
+        _measure_file( __.Path( base ) / name )
+        for base, _, names in __.os.walk( location ) for name in names )
@@ -0,0 +1,201 @@
+# vim: set filetype=python fileencoding=utf-8:
+# -*- coding: utf-8 -*-
+
+#============================================================================#
+#                                                                            #
+#  Licensed under the Apache License, Version 2.0 (the "License");           #
+#  you may not use this file except in compliance with the License.          #
+#  You may obtain a copy of the License at                                   #
+#                                                                            #
+#      http://www.apache.org/licenses/LICENSE-2.0                            #
+#                                                                            #
+#  Unless required by applicable law or agreed to in writing, software       #
+#  distributed under the License is distributed on an "AS IS" BASIS,         #
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  #
+#  See the License for the specific language governing permissions and       #
+#  limitations under the License.                                            #
+#                                                                            #
+#============================================================================#
+
+
+
+''' Cache which stores file contents as content-addressed blobs.
+
+    File contents are stored once per distinct SHA-256 digest, regardless
+    of how many source locations share them, such as mirrors, vendored
+    copies, or redirects. Cached files are materialized from blobs as
+    reflinks (copy-on-write clones), where the filesystem supports them,
+    else as hardlinks, else as copies. The manifest of ingestions, which
+    is shared with simple caches, maps source URLs to digests.
+
+    Limitations:
+    * Storage location must be on a local filesystem.
+    * Blobs are only collected upon eviction of cached locations. Blobs
+      orphaned otherwise, such as by reingestion, remain until then.
+    * Otherwise, same as simple caches.
+'''
+
+
+from . import __
+from . import simple as _simple
+
+
+_blobs_directory_name = '.blobs'
+_reflink_request = 0x40049409 # FICLONE ioctl on Linux
+
+
+class BlobStoreStatistics( __.immut.DataclassObject ):
+    ''' Snapshot of storage statistics for blob store. '''
+
+    blobs_count: int
+    entries_count: int
+    logical_bytes: int
+    stored_bytes: int
+
+
+class BlobStore( _simple.ContentStore ):
+    ''' Content-addressed storage for contents of cached files. '''
+    # TODO: Immutable instance attributes.
+
+    async def collect_blobs( self, digests: __.cabc.Collection[ str ] ):
+        ''' Deletes blobs for digests, which no manifest entry references.
+        '''
+        referenced = { entry.digest for entry in self.entries.values( ) }
+        blobs = [
+            self.locate_blob( digest ) for digest in digests
+            if digest not in referenced ]
+        await __.asyncio.to_thread(
+            lambda: [ blob.unlink( missing_ok = True ) for blob in blobs ] )
+
+    async def detach( self, cache_url: __.Url ) -> None:
+        await __.asyncio.to_thread(
+            _detach_file,
+            __.Path( cache_url.path ),
+            self._locate_incoming( __.Path( cache_url.path ) ) )
+
+    def locate_blob( self, digest: str ) -> __.Path:
+        ''' Returns location of blob for SHA-256 digest. '''
+        digest = digest.removeprefix( 'sha256:' )
+        return (
+            self.location / _blobs_directory_name / 'sha256'
+            / digest[ : 2 ] / digest )
+
+    def report_statistics( self ) -> BlobStoreStatistics:
+        ''' Reports counts of blobs and entries and of bytes.
+
+            Logical bytes are the total size of all ingested sources. Stored
+            bytes are the total size of blobs on disk, including blobs which
+            are orphaned but not yet collected.
+        '''
+        blobs_count, stored_bytes = _measure_blobs(
+            self.location / _blobs_directory_name )
+        return BlobStoreStatistics(
+            blobs_count = blobs_count,
+            entries_count = len( self.entries ),
+            logical_bytes = sum(
+                entry.bytes_count for entry in self.entries.values( ) ),
+            stored_bytes = stored_bytes )
+
+    async def _place_content(
+        self, incoming: __.Path, digest: str, location: __.Path
+    ):
+        blob = self.locate_blob( digest )
+        await __.asyncio.to_thread( _admit_blob, incoming, blob )
+        await __.asyncio.to_thread(
+            _materialize_blob, blob, location,
+            self._locate_incoming( location ) )
+
+
+class CacheManager( _simple.CacheManager ):
+    ''' Cache manager which stores file contents as content-addressed blobs.
+    '''
+    # TODO: Immutable instance attributes.
+
+    store: BlobStore
+
+    @classmethod
+    async def from_url( selfclass, url: __.PossibleUrl ) -> __.typx.Self:
+        url_ = __.adapter_from_url( url ).as_url( )
+        if url_.scheme not in ( '', 'file' ):
+            raise __.UrlSchemeAssertionError(
+                entity_name = "cache manager 'blobs'", url = url_ )
+        return await super( ).from_url( url_ )
+
+    @classmethod
+    def produce_store( selfclass, adapter: __.DirectoryAdapter ) -> BlobStore:
+        return BlobStore( location = __.Path( adapter.as_url( ).path ) )
+
+    async def evict_locations( self, urls: __.cabc.Sequence[ __.Url ] ):
+        ''' Deletes cached locations and forgets their ingestions.
+
+            Blobs, which backed only evicted locations, are collected, so
+            that quotas bound the storage actually used.
+        '''
+        paths = [ __.Path( url.path ) for url in urls ]
+        digests = {
+            entry.digest for entry in self.store.entries.values( )
+            if any(
+                __.Path( entry.cache_url.path ).is_relative_to( path )
+                for path in paths ) }
+        await super( ).evict_locations( urls )
+        await self.store.collect_blobs( digests )
+
+    def report_statistics( self ) -> BlobStoreStatistics:
+        ''' Reports storage statistics of blob store. '''
+        return self.store.report_statistics( )
+
+
+def _admit_blob( incoming: __.Path, blob: __.Path ):
+    if blob.exists( ): return
+    blob.parent.mkdir( parents = True, exist_ok = True )
+    # Blobs are shared; discourage alteration through hardlinks.
+    incoming.chmod( 0o444 )
+    __.os.replace( incoming, blob )
+
+
+def _clone_file( source: __.Path, target: __.Path ):
+    from fcntl import ioctl
+    with source.open( 'rb' ) as source_, target.open( 'wb' ) as target_:
+        ioctl( target_.fileno( ), _reflink_request, source_.fileno( ) )
+
+
+def _detach_file( location: __.Path, location_: __.Path ):
+    from shutil import copyfile
+    try: stat = location.stat( )
+    except FileNotFoundError: return
+    if stat.st_nlink <= 1:
+        # Former link to blob, which is since collected, is read-only.
+        if not stat.st_mode & 0o200: location.chmod( stat.st_mode | 0o200 )
+        return
+    location_.parent.mkdir( parents = True, exist_ok = True )
+    try:
+        copyfile( location, location_ )
+        __.os.replace( location_, location )
+    finally: location_.unlink( missing_ok = True )
+
+
+def _materialize_blob(
+    blob: __.Path, location: __.Path, location_: __.Path
+):
+    from shutil import copyfile
+    location.parent.mkdir( parents = True, exist_ok = True )
+    location_.parent.mkdir( parents = True, exist_ok = True )
+    try:
+        try: _clone_file( blob, location_ )
+        except ( ImportError, OSError ):
+            location_.unlink( missing_ok = True )
+            try: __.os.link( blob, location_ )
+            except OSError: copyfile( blob, location_ )
+        __.os.replace( location_, location )
+    finally: location_.unlink( missing_ok = True )
+
+
+def _measure_blobs( location: __.Path ) -> tuple[ int, int ]:
+    count = bytes_count = 0
+    for directory, _, names in __.os.walk( location ):
+        for name in names:
+            try: stat = __.os.stat( __.os.path.join( directory, name ) )
+            except FileNotFoundError: continue
+            count += 1
+            bytes_count += stat.st_size
+    return count, bytes_count
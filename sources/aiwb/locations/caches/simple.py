@@ -23,17 +23,19 @@
     Limitations:
     * Does not track indirection (symlinks, redirects, etc...). Always caches
       location referenced by fully-resolved URL.
-    * Does not track upstream expiries (e.g., HTTP cache controls).
+    * Only tracks upstream expiries (e.g., HTTP cache controls) for
+      sources which support conditional acquisition of content.
     * Does not track upstream MIME type or charset hints (e.g., HTTP
       'Content-Type' headers).
 
     TODO: Refactor to avoid accessing private members (_ingest,
-          _ingest_if_absent). Consider making these protected/public or
+          _ingest_if_stale). Consider making these protected/public or
           using a cleaner interface pattern.
 '''
 
 
 from . import __
+from . import accounting as _accounting
 
 
 _module_name = __name__.replace( f"{__package__}.", '' )
@@ -41,6 +43,309 @@ _entity_name = f"cache '{_module_name}'"
 _A = __.typx.TypeVar( '_A', bound = __.AdapterBase )
 _F = __.typx.TypeVar(
     '_F', bound = __.cabc.Callable[ ..., __.typx.Any ] )
+_expiration_interval_default = 300 # seconds
+_directory_permissions = __.accret.Dictionary( {
+    __.Possessor.CurrentPopulation: __.Permissions_RCUDX,
+    __.Possessor.CurrentUser: __.Permissions_RCUDX } )
+_incoming_directory_name = '.incoming'
+_ingest_workers_maximum = 16
+_manifest_file_name = '.manifest.json'
+_manifest_format_version = 1
+_record_file_name = 'inode.json'
+_record_format_version = 1
+_records_directory_name = '.records'
+_scribe = __.acquire_scribe( __package__ )
+
+
+class CacheManifestEntry( __.immut.DataclassObject ):
+    ''' Record of file, as ingested from source into cache.
+
+        Sizes and modification times of both sides are recorded, so that
+        later comparisons need only examine inodes, unless they differ.
+    '''
+
+    cache_url: __.Url
+    digest: str
+    bytes_count: int
+    cache_mtime: __.typx.Optional[ __.DateTime ] = None
+    source_bytes_count: __.typx.Optional[ int ] = None
+    source_content_id: __.typx.Optional[ str ] = None
+    source_mtime: __.typx.Optional[ __.DateTime ] = None
+
+
+class ContentStore:
+    ''' Storage for contents of cached files, with manifest of ingestions.
+
+        Contents are written to temporary files and then moved into place,
+        so that readers never observe partial contents. Each ingested file
+        is recorded in a manifest, keyed by source URL, along with each
+        ingested directory tree. The manifest persists in storage location.
+
+        Incoming contents and records of source inodes are kept in reserved
+        directories at the top of the storage location, apart from cached
+        files, so that they can never be mistaken for files from sources.
+    '''
+    # TODO: Immutable instance attributes.
+
+    entries: dict[ str, CacheManifestEntry ]
+    location: __.Path
+    roots: dict[ str, __.Url ]
+
+    def __init__( self, location: __.Path ):
+        self.entries = { }
+        self.location = location
+        self.roots = { }
+        self._altered = False
+        self._saver: __.typx.Optional[ __.asyncio.Task[ None ] ] = None
+
+    async def detach( self, cache_url: __.Url ) -> None:
+        ''' Ensures that cached file may be altered without side effects. '''
+
+    def locate_records( self, cache_url: __.Url ) -> __.Path:
+        ''' Returns location of records for cached location. '''
+        path = __.Path( cache_url.path ).relative_to( self.location )
+        return self.location / _records_directory_name / path
+
+    def forget_entry( self, source_url: __.Url ):
+        ''' Forgets ingestion of file from source. '''
+        if None is self.entries.pop( source_url.geturl( ), None ): return
+        self._altered = True
+
+    def forget_location( self, cache_url: __.Url ):
+        ''' Forgets ingestions into cached location or beneath it. '''
+        path = __.Path( cache_url.path )
+        for entries in ( self.entries, self.roots ):
+            for url, entry in tuple( entries.items( ) ):
+                cache_url_ = (
+                    entry.cache_url if isinstance( entry, CacheManifestEntry )
+                    else entry )
+                if not __.Path( cache_url_.path ).is_relative_to( path ):
+                    continue
+                del entries[ url ]
+                self._altered = True
+
+    async def ingest_stream(
+        self,
+        source_url: __.Url,
+        cache_url: __.Url,
+        stream: __.ContentStream,
+    ) -> None:
+        ''' Stores content from source and places it at cache location. '''
+        location = __.Path( cache_url.path )
+        incoming = self._locate_incoming( location )
+        await __.asyncio.to_thread(
+            incoming.parent.mkdir, parents = True, exist_ok = True )
+        try:
+            digest, bytes_count = await _receive_content( stream, incoming )
+            await self._place_content( incoming, digest, location )
+        finally:
+            await __.asyncio.to_thread( incoming.unlink, missing_ok = True )
+        await self.memoize_entry(
+            source_url, cache_url,
+            digest = digest,
+            bytes_count = bytes_count,
+            source_inode = stream.inode )
+
+    async def load( self ):
+        ''' Loads manifest, if it exists and is compatible. '''
+        from json import loads
+        from aiofiles import open as open_
+        try:
+            async with open_( self.location / _manifest_file_name ) as stream:
+                document = loads( await stream.read( ) )
+        except FileNotFoundError: return
+        except ( OSError, ValueError ): return # Corrupt manifests are rebuilt.
+        if _manifest_format_version != document.get( 'version' ): return
+        self.entries.update( {
+            url: _manifest_entry_from_json( entry )
+            for url, entry in document.get( 'entries', { } ).items( ) } )
+        self.roots.update( {
+            url: __.Url.from_url( cache_url )
+            for url, cache_url in document.get( 'roots', { } ).items( ) } )
+
+    async def memoize_entry(
+        self,
+        source_url: __.Url,
+        cache_url: __.Url,
+        digest: str,
+        bytes_count: int,
+        source_inode: __.Inode,
+    ):
+        ''' Records ingestion of file from source. '''
+        cache_inode = await __.adapter_from_url( cache_url ).examine( )
+        self.entries[ source_url.geturl( ) ] = CacheManifestEntry(
+            cache_url = cache_url,
+            digest = digest,
+            bytes_count = bytes_count,
+            cache_mtime = cache_inode.mtime,
+            source_bytes_count = source_inode.bytes_count,
+            source_content_id = source_inode.content_id,
+            source_mtime = source_inode.mtime )
+        self._altered = True
+        await self._save_soon( )
+
+    async def memoize_root( self, source_url: __.Url, cache_url: __.Url ):
+        ''' Records ingestion of directory tree from source. '''
+        self.roots[ source_url.geturl( ) ] = cache_url
+        self._altered = True
+        await self._save_soon( )
+
+    async def save( self ):
+        ''' Saves manifest, if altered since load or last save. '''
+        from json import dumps
+        from aiofiles import open as open_
+        from aiofiles.os import makedirs, replace
+        location = self.location / _manifest_file_name
+        while self._altered:
+            self._altered = False
+            document = dumps( {
+                'version': _manifest_format_version,
+                'entries': {
+                    url: _json_from_manifest_entry( entry )
+                    for url, entry in self.entries.items( ) },
+                'roots': {
+                    url: cache_url.geturl( )
+                    for url, cache_url in self.roots.items( ) } } )
+            location_ = location.with_name(
+                f"{location.name}.{__.uuid4( ).hex}" )
+            await makedirs( location.parent, exist_ok = True )
+            async with open_( location_, 'w' ) as stream:
+                await stream.write( document )
+            await replace( location_, location )
+
+    def _locate_incoming( self, location: __.Path ) -> __.Path:
+        # Same filesystem as destination, so that move is atomic.
+        return self.location / _incoming_directory_name / __.uuid4( ).hex
+
+    async def _place_content(
+        self, incoming: __.Path, digest: str, location: __.Path
+    ):
+        from aiofiles.os import makedirs, replace
+        await makedirs( location.parent, exist_ok = True )
+        await replace( incoming, location )
+
+    async def _save_soon( self ):
+        # Coalesces saves from concurrent ingestions into fewer writes.
+        if None is self._saver or self._saver.done( ):
+            self._saver = __.asyncio.create_task( self.save( ) )
+        await __.asyncio.shield( self._saver )
+
+
+class RevalidatorStatistics( __.immut.DataclassObject ):
+    ''' Snapshot of freshness statistics for cached content. '''
+
+    hits: int
+    misses: int
+    revalidations: int
+
+
+class Revalidator:
+    ''' Keeps cached content fresh with respect to its sources.
+
+        For sources which support conditional acquisition of content, such
+        as HTTP locations, records of source inodes (entity tags,
+        modification times, and expiration times) are kept in the records
+        directory of the content store. Cached content is fresh until its
+        expiration time or, if its source declared none, for a configurable
+        interval after it was last validated. Stale content is revalidated
+        with a conditional request; unmodified content is not transferred
+        again. Optionally, stale content is served while it is revalidated
+        in the background.
+    '''
+    # TODO: Immutable instance attributes.
+
+    expiration_interval: float
+    hits: int
+    misses: int
+    revalidations: int
+    stale_while_revalidate: bool
+
+    def __init__( self ):
+        self.expiration_interval = _expiration_interval_default
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.stale_while_revalidate = False
+        self._records: dict[ str, __.typx.Optional[ __.Inode ] ] = { }
+        self._tasks: dict[ str, __.asyncio.Task[ None ] ] = { }
+
+    async def close( self ):
+        ''' Waits for background revalidations to complete. '''
+        await __.asyncio.gather(
+            *self._tasks.values( ), return_exceptions = True )
+
+    def configure( self, configuration: __.cabc.Mapping[ str, __.typx.Any ] ):
+        ''' Applies configuration to revalidations hereafter. '''
+        self.expiration_interval = float( configuration.get(
+            'expiration-interval', _expiration_interval_default ) )
+        self.stale_while_revalidate = bool(
+            configuration.get( 'stale-while-revalidate', False ) )
+
+    async def acquire_record(
+        self, cache_url: __.Url, store: ContentStore
+    ) -> __.typx.Optional[ __.Inode ]:
+        ''' Returns record of source inode for cached content, if any. '''
+        key = cache_url.path
+        if key in self._records: return self._records[ key ]
+        adapter = __.file_adapter_from_url(
+            store.locate_records( cache_url ) / _record_file_name )
+        try: content = await adapter.acquire_content( )
+        except __.LocationAcquireContentFailure: record = None
+        else: record = _record_from_json( content )
+        self._records[ key ] = record
+        return record
+
+    async def memoize_record(
+        self, cache_url: __.Url, store: ContentStore, record: __.Inode
+    ):
+        ''' Records source inode for cached content.
+
+            Records without expiration times expire after the configured
+            interval, so that their content is eventually revalidated.
+        '''
+        if None is record.etime:
+            record = record.with_attributes(
+                etime = __.DateTime.now( __.TimeZone.utc )
+                + __.TimeDelta( seconds = self.expiration_interval ) )
+        location = store.locate_records( cache_url ) / _record_file_name
+        await __.asyncio.to_thread(
+            location.parent.mkdir, parents = True, exist_ok = True )
+        adapter = __.file_adapter_from_url( location )
+        await adapter.update_content( _json_from_record( record ) )
+        self._records[ cache_url.path ] = record
+
+    def report_statistics( self ) -> RevalidatorStatistics:
+        ''' Reports counts of hits, misses, and revalidations. '''
+        return RevalidatorStatistics(
+            hits = self.hits,
+            misses = self.misses,
+            revalidations = self.revalidations )
+
+    def schedule(
+        self,
+        cache_url: __.Url,
+        revalidation: __.cabc.Coroutine[ __.typx.Any, __.typx.Any, None ],
+    ):
+        ''' Revalidates in background, unless already in progress. '''
+        key = cache_url.path
+        if key in self._tasks:
+            revalidation.close( )
+            return
+        task = __.asyncio.create_task( revalidation )
+        self._tasks[ key ] = task
+
+        def conclude( task_: __.asyncio.Task[ None ] ):
+            self._tasks.pop( key, None )
+            if task_.cancelled( ): return
+            if None is ( exc := task_.exception( ) ): return
+            _scribe.warning(
+                f"Could not revalidate cache location '{cache_url}'. "
+                f"Reason: {exc}" )
+
+        task.add_done_callback( conclude )
+
+
+revalidator = Revalidator( )
 
 
 def _ensures_cache( function: _F ) -> _F:
@@ -49,7 +354,7 @@ def _ensures_cache( function: _F ) -> _F:
 
     @wraps( function )
     async def invoker( cache, *posargs, **nomargs ):
-        await cache._ingest_if_absent( )  # noqa: SLF001
+        await cache._ingest_if_stale( )  # noqa: SLF001
         return await function( cache, *posargs, **nomargs )
 
     return __.typx.cast( _F, invoker )
@@ -59,10 +364,17 @@ class _Common( __.CacheBase, __.typx.Protocol, __.typx.Generic[ _A ] ):
 
     adapter: _A
     cache_url: __.Url
+    store: __.Absential[ ContentStore ]
 
-    def __init__( self, adapter: _A, cache_url: __.Url ):
+    def __init__(
+        self,
+        adapter: _A,
+        cache_url: __.Url,
+        store: __.Absential[ ContentStore ] = __.absent,
+    ):
         self.adapter = adapter
         self.cache_url = cache_url
+        self.store = store
         super( ).__init__( )
 
     def as_url( self ) -> __.Url: return self.adapter.as_url( )
@@ -109,32 +421,66 @@ class _Common( __.CacheBase, __.typx.Protocol, __.typx.Generic[ _A ] ):
     async def _ingest( self ):
         raise NotImplementedError
 
-    async def _ingest_if_absent( self ):
+    async def _ingest_if_stale( self ):
+        # Concurrent accessors of same cache share one check and ingestion.
+        await __.single_flights.coalesce(
+            ( 'ingest-if-stale', type( self ), self.cache_url.geturl( ) ),
+            self._ingest_if_stale_core )
+
+    async def _ingest_if_stale_core( self ):
         Error = __.funct.partial(
             __.LocationCacheIngestFailure,
             source_url = self.adapter.as_url( ), cache_url = self.cache_url )
+        accounted = _accounting.cache_accountants.access( self.cache_url )
         cache_adapter = __.adapter_from_url( self.cache_url )
         try: exists = await cache_adapter.check_existence( )
         except Exception as exc: raise Error( reason = str( exc ) ) from exc
         if not exists: await self._ingest( )
+        elif not accounted:
+            _accounting.cache_accountants.memoize( self.cache_url )
 
 
 class CacheManager( __.CacheManager ):
-    ''' Simple cache manager which uses separate storage adapter. '''
+    ''' Simple cache manager which uses separate storage adapter.
+
+        Reconciliation with sources is based on manifest of ingestions.
+        Inodes of both sides are examined concurrently and contents are only
+        hashed where inodes differ from those recorded at ingestion.
+    '''
     # TODO: Immutable instance attributes.
 
     adapter: __.DirectoryAdapter # for storage not source
+    store: ContentStore
 
     @classmethod
     async def from_url( selfclass, url: __.PossibleUrl ) -> __.typx.Self:
         general_adapter = __.adapter_from_url( url )
         await general_adapter.as_specific(
             species = __.LocationSpecies.Directory )
-        return selfclass( adapter = general_adapter.as_directory( ) )
+        adapter = general_adapter.as_directory( )
+        store = selfclass.produce_store( adapter )
+        await store.load( )
+        manager = selfclass( adapter = adapter, store = store )
+        await _accounting.cache_accountants.produce(
+            adapter.as_url( ), evictor = manager.evict_locations )
+        return manager
 
-    def __init__( self, adapter: __.DirectoryAdapter ):
+    @classmethod
+    def produce_store(
+        selfclass, adapter: __.DirectoryAdapter
+    ) -> ContentStore:
+        ''' Produces content store for storage location. '''
+        return ContentStore( location = __.Path( adapter.as_url( ).path ) )
+
+    def __init__(
+        self,
+        adapter: __.DirectoryAdapter,
+        store: __.Absential[ ContentStore ] = __.absent,
+    ):
         super( ).__init__( )
         self.adapter = adapter
+        self.store = (
+            self.produce_store( adapter ) if __.is_absent( store ) else store )
 
     def as_url( self ) -> __.Url: return self.adapter.as_url( )
 
@@ -148,23 +494,53 @@ class CacheManager( __.CacheManager ):
             = __.ImpurityResolutionActions.Ignore,
     ) -> __.typx.Self:
         # No concept of aliens or impurities. Everything is considered.
-        # TODO: Implement.
-        raise NotImplementedError
+        Error = __.funct.partial(
+            __.LocationCacheReconcileFailure, cache_url = self.as_url( ) )
+        differences = await self.difference( )
+        _assert_no_conflicts(
+            differences, _is_commit_conflict, conflicts,
+            error_to_raise = Error )
+        await _reconcile_concurrently(
+            self._commit_difference( difference, conflicts )
+            for difference in differences )
+        await self.store.save( )
+        return self
 
     async def difference(
         self
     ) -> __.cabc.Sequence[ __.CacheDifferenceBase ]:
         # No concept of aliens or impurities. Everything is considered.
-        # TODO: Implement.
-        raise NotImplementedError
+        store = self.store
+        workers = __.asyncio.Semaphore( _ingest_workers_maximum )
+        differences_e = await __.asyncio.gather( *(
+            _compare_entry( __.Url.from_url( url ), entry, workers )
+            for url, entry in tuple( store.entries.items( ) ) ) )
+        differences_r = await __.asyncio.gather( *(
+            _compare_root( __.Url.from_url( url ), cache_url, store )
+            for url, cache_url in tuple( store.roots.items( ) ) ) )
+        differences = [
+            difference for difference in differences_e
+            if None is not difference ]
+        unique_urls = { difference.source_url for difference in differences }
+        for differences_ in differences_r:
+            for difference in differences_:
+                if difference.source_url in unique_urls: continue
+                unique_urls.add( difference.source_url )
+                differences.append( difference )
+        return differences
 
     async def is_divergent( self ) -> bool:
         # No concept of aliens or impurities. Everything is considered.
-        # TODO: Survey directory.
-        #       Derive source URL from cache URL.
-        #       Compare entries in source directories versus cache directories.
-        #       Compare contents of source files versus cache files.
-        raise NotImplementedError
+        return bool( await self.difference( ) )
+
+    async def evict_locations( self, urls: __.cabc.Sequence[ __.Url ] ):
+        ''' Deletes cached locations and forgets their ingestions. '''
+        await _accounting.delete_locations( [
+            *urls,
+            *(  url.with_path( str( self.store.locate_records( url ) ) )
+                for url in urls ) ] )
+        for url in urls: self.store.forget_location( url )
+        await self.store.save( )
 
     def produce_cache(
         self, adapter: '__.GeneralAdapter'
@@ -172,7 +548,7 @@ class CacheManager( __.CacheManager ):
         cache_url = self._calculate_cache_url(
             source_adapter = adapter )
         return GeneralCache(
-            adapter = adapter, cache_url = cache_url )
+            adapter = adapter, cache_url = cache_url, store = self.store )
 
     async def reingest(
         self, *,
@@ -184,8 +560,43 @@ class CacheManager( __.CacheManager ):
             = __.ImpurityResolutionActions.Ignore,
     ) -> __.typx.Self:
         # No concept of aliens or impurities. Everything is considered.
-        # TODO: Implement.
-        raise NotImplementedError
+        Error = __.funct.partial(
+            __.LocationCacheReconcileFailure, cache_url = self.as_url( ) )
+        differences = await self.difference( )
+        _assert_no_conflicts(
+            differences, _is_reingest_conflict, conflicts,
+            error_to_raise = Error )
+        # Conflicts, which are not errors, are resolved in favor of sources.
+        await _reconcile_concurrently(
+            _reingest_difference( self.store, difference )
+            for difference in differences )
+        await self.store.save( )
+        return self
+
+    async def _commit_difference(
+        self,
+        difference: __.CacheDifferenceBase,
+        conflicts: __.ConflictResolutionActions,
+    ):
+        # Conflicts, which are not errors, are resolved in favor of sources.
+        # Files removed from cache are left in sources, since simple caches
+        # reingest absent files on access.
+        if isinstance( difference, __.ContentCacheDifference ):
+            if not difference.cache_altered or difference.source_altered:
+                return
+        elif isinstance( difference, __.DirentsCacheDifference ):
+            if not difference.cache_present or difference.recorded: return
+        else: return
+        source_url, cache_url = difference.source_url, difference.cache_url
+        cache_adapter = __.file_adapter_from_url( cache_url )
+        content = await cache_adapter.acquire_content( )
+        inode = await __.file_adapter_from_url( source_url ).update_content(
+            content, attributes = __.InodeAttributes.Mtime )
+        await self.store.memoize_entry(
+            source_url, cache_url,
+            digest = _calculate_digest( content ),
+            bytes_count = len( content ),
+            source_inode = inode )
 
     def _calculate_cache_url(
         self, source_adapter: __.AdapterBase
@@ -214,11 +625,13 @@ class GeneralCache( _Common[ __.GeneralAdapter ], __.GeneralCache ):
 
     def as_directory( self ) -> '__.DirectoryCache':
         adapter = self.adapter.as_directory( )
-        return DirectoryCache( adapter = adapter, cache_url = self.cache_url )
+        return DirectoryCache(
+            adapter = adapter, cache_url = self.cache_url, store = self.store )
 
     def as_file( self ) -> '__.FileCache':
         adapter = self.adapter.as_file( )
-        return FileCache( adapter = adapter, cache_url = self.cache_url )
+        return FileCache(
+            adapter = adapter, cache_url = self.cache_url, store = self.store )
 
     async def as_specific(
         self,
@@ -244,11 +657,13 @@ class GeneralCache( _Common[ __.GeneralAdapter ], __.GeneralCache ):
             case __.LocationSpecies.Directory:
                 return DirectoryCache(
                     adapter = self.adapter.as_directory( ),
-                    cache_url = self.cache_url )
+                    cache_url = self.cache_url,
+                    store = self.store )
             case __.LocationSpecies.File:
                 return FileCache(
                     adapter = self.adapter.as_file( ),
-                    cache_url = self.cache_url )
+                    cache_url = self.cache_url,
+                    store = self.store )
             case _:
                 reason = (
                     "No derivative available for species "
@@ -276,15 +691,18 @@ class GeneralCache( _Common[ __.GeneralAdapter ], __.GeneralCache ):
         Error = __.funct.partial(
             __.LocationCacheIngestFailure,
             source_url = self.adapter.as_url( ), cache_url = self.cache_url )
-        try: species = await self.discover_species( )
+        try: species = await self.adapter.discover_species( )
         except Exception as exc: raise Error( reason = str( exc ) ) from exc
         if __.LocationSpecies.Directory is species:
             cache = DirectoryCache(
                 adapter = self.adapter.as_directory( ),
-                cache_url = self.cache_url )
+                cache_url = self.cache_url,
+                store = self.store )
         elif __.LocationSpecies.File is species:
             cache = FileCache(
-                adapter = self.adapter.as_file( ), cache_url = self.cache_url )
+                adapter = self.adapter.as_file( ),
+                cache_url = self.cache_url,
+                store = self.store )
         else:
             reason = f"Cannot ingest entities of species {species.value!r}."
             raise Error( reason = reason )
@@ -351,6 +769,27 @@ class DirectoryCache( _Common[ __.DirectoryAdapter ], __.DirectoryCache ):
             absent_ok = absent_ok,
             safe = safe )
 
+    async def iterate_entries(
+        self,
+        attributes: __.InodeAttributes = __.InodeAttributes.Nothing,
+        filters: __.Absential[
+            __.cabc.Iterable[ __.PossibleFilter ]
+        ] = __.absent,
+        recurse: bool = True,
+        depth_maximum: __.SurveyDepthMaximumArgument = __.absent,
+        entries_maximum: __.SurveyEntriesMaximumArgument = __.absent,
+    ) -> __.cabc.AsyncIterator[ __.DirectoryEntry ]:
+        await self._ingest_if_stale( )
+        cache_adapter = __.adapter_from_url( self.cache_url ).as_directory( )
+        async with __.ctxl.aclosing( cache_adapter.iterate_entries(
+            attributes = attributes,
+            filters = filters,
+            recurse = recurse,
+            depth_maximum = depth_maximum,
+            entries_maximum = entries_maximum,
+        ) ) as dirents:
+            async for dirent in dirents: yield dirent
+
     def produce_entry_accessor(
         self, name: __.PossibleRelativeLocator
     ) -> 'GeneralCache':
@@ -364,7 +803,9 @@ class DirectoryCache( _Common[ __.DirectoryAdapter ], __.DirectoryCache ):
             cache_url = self.cache_url.with_path(
                 __.Path( self.cache_url.path ).joinpath( *name ) )
             return GeneralCache(
-                adapter = source_adapter, cache_url = cache_url )
+                adapter = source_adapter,
+                cache_url = cache_url,
+                store = self.store )
         raise __.RelativeLocatorClassValidityError( type( name ) )
 
     @_ensures_cache
@@ -380,33 +821,209 @@ class DirectoryCache( _Common[ __.DirectoryAdapter ], __.DirectoryCache ):
         return await cache_adapter.survey_entries(
             attributes = attributes, filters = filters, recurse = recurse )
 
-    async def _ingest( self ):
+    async def ingest(
+        self, reporter: __.Absential[ __.CacheIngestReporter ] = __.absent
+    ):
+        ''' Ingests source directory tree into cache.
+
+            Entries are ingested concurrently, by a bounded number of
+            workers, as the source directory tree is surveyed. Each cache
+            directory is created once, before any entries within it. Failure
+            to ingest an entry does not prevent ingestion of other entries;
+            failures are reported together after all entries are attempted.
+        '''
         Error = __.funct.partial(
             __.LocationCacheIngestFailure,
             source_url = self.adapter.as_url( ), cache_url = self.cache_url )
+        async with __.single_flights.serialize(
+            ( 'ingest', self.cache_url.geturl( ) )
+        ):
+            failures = await self._ingest_tree(
+                reporter, error_to_raise = Error )
+        if not failures: return
+        from exceptiongroup import ExceptionGroup  # TODO: Python 3.11: builtin
+        reason = (
+            f"Could not ingest {len( failures )} entries. "
+            f"First failure: {failures[ 0 ]}" )
+        raise Error( reason = reason ) from ExceptionGroup(
+            'Failures of entry ingestion.', failures )
+
+    @__.ctxl.asynccontextmanager
+    async def watch(
+        self
+    ) -> __.cabc.AsyncIterator[ __.typx.Optional[ __.DirectoryWatcher ] ]:
+        ''' Watches source directory tree, for duration of context.
+
+            Files, which are altered in sources but not in cache, are
+            reingested as their alterations are observed. Conflicting
+            alterations are left for reconciliation through cache manager.
+            Provides nothing, if source is not local or watchers are
+            disabled.
+        '''
+        async with __.directory_watchers.watch(
+            self.adapter.as_url( ), subscriber = self._reingest_alterations
+        ) as watcher: yield watcher
+
+    async def _ingest( self ): await self.ingest( )
+
+    async def _ingest_tree(
+        self,
+        reporter: __.Absential[ __.CacheIngestReporter ],
+        error_to_raise: __.typx.Callable[ ..., Exception ],
+    ) -> __.cabc.Sequence[ Exception ]:
         cache_adapter = __.adapter_from_url( self.cache_url ).as_directory( )
         try:
             await cache_adapter.create_directory(
                 name = '.',
-                permissions = __.accret.Dictionary( {
-                    __.Possessor.CurrentPopulation: __.Permissions_RCUDX,
-                    __.Possessor.CurrentUser: __.Permissions_RCUDX } ),
+                permissions = _directory_permissions,
                 exist_ok = True,
                 parents = True )
-        except Exception as exc: raise Error( reason = str( exc ) ) from exc
-        source_base_url = self.adapter.as_url( )
-        # TODO: Parallel async fanout for entry ingestion.
-        for dirent in await self.adapter.survey_entries(
-            filters = ( ), recurse = False
-        ):
-            name = (
-                __.Path( dirent.url.path )
-                .relative_to( source_base_url.path ) )
-            try:
-                entry_accessor = self.produce_entry_accessor( name )
-                await entry_accessor._ingest( )  # noqa: SLF001
-            except Exception as exc:
-                raise Error( reason = str( exc ) ) from exc
+        except Exception as exc:
+            raise error_to_raise( reason = str( exc ) ) from exc
+        if not __.is_absent( self.store ):
+            await self.store.memoize_root(
+                self.adapter.as_url( ), self.cache_url )
+        ingestor = _DirectoryIngestor( cache = self, reporter = reporter )
+        # Directory tree is accounted as a whole, even if partially ingested.
+        try: return await ingestor.ingest( )
+        finally: _accounting.cache_accountants.memoize( self.cache_url )
+
+    async def _reingest_alterations(
+        self, locations: __.cabc.Set[ __.Path ]
+    ):
+        if __.is_absent( self.store ): return
+        store = self.store
+        workers = __.asyncio.Semaphore( _ingest_workers_maximum )
+        comparisons: list[
+            __.cabc.Awaitable[ __.typx.Optional[ __.CacheDifferenceBase ] ]
+        ] = [ ]
+        for source_url, cache_url in self._locate_alterations( locations ):
+            url = source_url.geturl( )
+            prefix = f"{url.rstrip( '/' )}/"
+            urls = [
+                url_ for url_ in store.entries
+                if url_ == url or url_.startswith( prefix ) ]
+            comparisons.extend(
+                _compare_entry(
+                    __.Url.from_url( url_ ), store.entries[ url_ ], workers )
+                for url_ in urls )
+            if urls: continue
+            comparisons.append(
+                _compare_unrecorded_file( source_url, cache_url ) )
+        differences = [
+            difference for difference in await __.asyncio.gather(
+                *comparisons )
+            if None is not difference
+            and not _is_reingest_conflict( difference ) ]
+        if not differences: return
+        await _reconcile_concurrently(
+            _reingest_difference( store, difference )
+            for difference in differences )
+        await store.save( )
+
+    def _locate_alterations(
+        self, locations: __.cabc.Set[ __.Path ]
+    ) -> __.cabc.Iterator[ tuple[ __.Url, __.Url ] ]:
+        source_url = self.adapter.as_url( )
+        source_path = __.Path( source_url.path )
+        source_path_absolute = __.Path( __.os.path.abspath( source_path ) )
+        cache_path = __.Path( self.cache_url.path )
+        for location in locations:
+            if not location.is_relative_to( source_path_absolute ): continue
+            name = location.relative_to( source_path_absolute )
+            yield (
+                source_url.with_path( source_path / name ),
+                self.cache_url.with_path( cache_path / name ) )
+
+
+class _DirectoryIngestor:
+    ''' Ingests entries of source directory tree into cache concurrently. '''
+    # TODO: Immutable instance attributes.
+
+    def __init__(
+        self,
+        cache: DirectoryCache,
+        reporter: __.Absential[ __.CacheIngestReporter ],
+    ):
+        self.cache = cache
+        self.reporter = reporter
+        self.cache_adapter = (
+            __.adapter_from_url( cache.cache_url ).as_directory( ) )
+        self.source_path = __.Path( cache.adapter.as_url( ).path )
+        self.entries_discovered = 0
+        self.entries_ingested = 0
+        self.failures: list[ Exception ] = [ ]
+        self._directories: dict[ __.Path, __.asyncio.Task[ bool ] ] = { }
+        self._workers = __.asyncio.Semaphore( _ingest_workers_maximum )
+
+    async def ingest( self ) -> __.cabc.Sequence[ Exception ]:
+        ''' Ingests all entries. Returns failures of individual entries. '''
+        tasks: set[ __.asyncio.Task[ bool ] ] = set( )
+        try:
+            async with __.ctxl.aclosing( self.cache.adapter.iterate_entries(
+                filters = ( ), recurse = True
+            ) ) as dirents:
+                async for dirent in dirents:
+                    name = (
+                        __.Path( dirent.url.path )
+                        .relative_to( self.source_path ) )
+                    self.entries_discovered += 1
+                    await self._workers.acquire( )
+                    task = __.asyncio.create_task(
+                        self._ingest_entry( dirent, name ) )
+                    tasks.add( task )
+                    task.add_done_callback( tasks.discard )
+                    if dirent.is_directory( ):
+                        self._directories[ name ] = task
+        except Exception as exc: self.failures.append( exc )
+        except BaseException:
+            for task in tasks: task.cancel( )
+            raise
+        finally:
+            await __.asyncio.gather( *tasks, return_exceptions = True )
+        self._report( )
+        return tuple( self.failures )
+
+    async def _ingest_entry(
+        self, dirent: __.DirectoryEntry, name: __.Path
+    ) -> bool:
+        try:
+            parent = self._directories.get( name.parent )
+            # Entries within failed directories are not attempted.
+            if None is not parent and not await parent: return False
+            if dirent.is_directory( ):
+                await self.cache_adapter.create_directory(
+                    name = name,
+                    permissions = _directory_permissions,
+                    exist_ok = True,
+                    parents = False )
+            elif dirent.is_file( ):
+                cache = FileCache(
+                    adapter = __.file_adapter_from_url( dirent.url ),
+                    cache_url = self.cache.cache_url.with_path(
+                        __.Path( self.cache.cache_url.path ) / name ),
+                    store = self.cache.store )
+                await cache._ingest( parents = False )  # noqa: SLF001
+            else:
+                # Indirections, etc... are resolved by general ingestion.
+                cache_g = self.cache.produce_entry_accessor( name )
+                await cache_g._ingest( )  # noqa: SLF001
+        except Exception as exc:
+            self.failures.append( exc )
+            return False
+        else:
+            self.entries_ingested += 1
+            return True
+        finally:
+            self._workers.release( )
+            self._report( )
+
+    def _report( self ):
+        if __.is_absent( self.reporter ): return
+        self.reporter( __.CacheIngestProgress(
+            entries_discovered = self.entries_discovered,
+            entries_ingested = self.entries_ingested,
+            entries_failed = len( self.failures ) ) )
 
 
 class FileCache( _Common[ __.FileAdapter ], __.FileCache ):
@@ -425,27 +1042,137 @@ class FileCache( _Common[ __.FileAdapter ], __.FileCache ):
             await cache_adapter.acquire_content_result(
                 attributes = attributes ) )
 
+    @_ensures_cache
+    async def acquire_content_range(
+        self,
+        start: int,
+        end: __.Absential[ int ] = __.absent,
+        attributes: __.InodeAttributes = __.InodeAttributes.Nothing,
+    ) -> __.AcquireContentRangeResult:
+        cache_adapter = __.file_adapter_from_url( self.cache_url )
+        return await cache_adapter.acquire_content_range(
+            start, end, attributes = attributes )
+
+    @__.ctxl.asynccontextmanager
+    async def acquire_content_stream(
+        self,
+        attributes: __.InodeAttributes = __.InodeAttributes.Nothing,
+        chunk_size: __.ContentChunkSizeArgument =
+            __.content_chunk_size_default,
+    ) -> __.cabc.AsyncIterator[ __.ContentStream ]:
+        await self._ingest_if_stale( )
+        cache_adapter = __.file_adapter_from_url( self.cache_url )
+        async with cache_adapter.acquire_content_stream(
+            attributes = attributes, chunk_size = chunk_size
+        ) as stream: yield stream
+
     async def update_content(
         self,
         content: bytes,
         attributes: __.InodeAttributes = __.InodeAttributes.Nothing,
         options: __.FileUpdateOptions = __.FileUpdateOptions.Defaults,
     ) -> __.Inode:
-        cache_adapter = await self._create_cache_file_if_absent( )
+        cache_adapter = await self._acquire_cache_file_for_update( )
         return await cache_adapter.update_content(
             content, attributes = attributes, options = options )
 
-    async def _ingest( self ):
+    async def update_content_stream(
+        self,
+        chunks: __.cabc.AsyncIterable[ bytes ],
+        attributes: __.InodeAttributes = __.InodeAttributes.Nothing,
+        options: __.FileUpdateOptions = __.FileUpdateOptions.Defaults,
+    ) -> __.Inode:
+        cache_adapter = await self._acquire_cache_file_for_update( )
+        return await cache_adapter.update_content_stream(
+            chunks, attributes = attributes, options = options )
+
+    async def _ingest( self, parents: bool = True ):
         Error = __.funct.partial(
             __.LocationCacheIngestFailure,
             source_url = self.adapter.as_url( ), cache_url = self.cache_url )
         try:
-            cache_adapter = await self._create_cache_file_if_absent( )
-            acquisition = await self.adapter.acquire_content_result( )
-            await cache_adapter.update_content( acquisition.content )
+            async with self.adapter.acquire_content_stream( ) as stream:
+                await self._ingest_stream( stream, parents = parents )
         except Exception as exc: raise Error( reason = str( exc ) ) from exc
 
-    async def _create_cache_file_if_absent( self ) -> '__.FileAdapter':
+    async def _ingest_if_stale_core( self ):
+        Error = __.funct.partial(
+            __.LocationCacheIngestFailure,
+            source_url = self.adapter.as_url( ), cache_url = self.cache_url )
+        accounted = _accounting.cache_accountants.access( self.cache_url )
+        cache_adapter = __.adapter_from_url( self.cache_url )
+        try: exists = await cache_adapter.check_existence( )
+        except Exception as exc: raise Error( reason = str( exc ) ) from exc
+        if not exists:
+            await self._ingest( )
+            return
+        if not accounted:
+            _accounting.cache_accountants.memoize( self.cache_url )
+        # Records are only kept by content stores.
+        if (    None is _acquire_content_stream_if_modified( self.adapter )
+            or  __.is_absent( self.store )
+        ):
+            revalidator.hits += 1
+            return
+        try:
+            record = await revalidator.acquire_record(
+                self.cache_url, self.store )
+        except Exception as exc: raise Error( reason = str( exc ) ) from exc
+        if None is record or not _is_expired( record ):
+            revalidator.hits += 1
+            return
+        if revalidator.stale_while_revalidate:
+            revalidator.hits += 1
+            revalidator.schedule( self.cache_url, self._revalidate( record ) )
+            return
+        await self._revalidate( record )
+
+    async def _acquire_cache_file_for_update( self ) -> '__.FileAdapter':
+        cache_adapter = await self._create_cache_file_if_absent( )
+        if not __.is_absent( self.store ):
+            await self.store.detach( self.cache_url )
+        return cache_adapter
+
+    async def _ingest_stream( self, stream: __.ContentStream, parents: bool ):
+        # Concurrent ingestions into same cache file must not interleave.
+        async with __.single_flights.serialize(
+            ( 'ingest', self.cache_url.geturl( ) )
+        ):
+            if __.is_absent( self.store ):
+                cache_adapter = await self._create_cache_file_if_absent(
+                    parents = parents )
+                await cache_adapter.update_content_stream( stream )
+            else:
+                await self.store.ingest_stream(
+                    self.adapter.as_url( ), self.cache_url, stream )
+        # Files within directory trees are accounted by their ingestors.
+        if parents: _accounting.cache_accountants.memoize( self.cache_url )
+        revalidator.misses += 1
+        if (    None is _acquire_content_stream_if_modified( self.adapter )
+            or  __.is_absent( self.store )
+        ): return
+        await revalidator.memoize_record(
+            self.cache_url, self.store, stream.inode )
+
+    async def _revalidate( self, record: __.Inode ):
+        Error = __.funct.partial(
+            __.LocationCacheIngestFailure,
+            source_url = self.adapter.as_url( ), cache_url = self.cache_url )
+        acquirer = _acquire_content_stream_if_modified( self.adapter )
+        revalidator.revalidations += 1
+        try:
+            async with acquirer( inode = record ) as result:
+                if isinstance( result, __.Inode ):
+                    revalidator.hits += 1
+                    if not __.is_absent( self.store ):
+                        await revalidator.memoize_record(
+                            self.cache_url, self.store, result )
+                else: await self._ingest_stream( result, parents = True )
+        except Exception as exc: raise Error( reason = str( exc ) ) from exc
+
+    async def _create_cache_file_if_absent(
+        self, parents: bool = True
+    ) -> '__.FileAdapter':
         path = __.Path( self.cache_url.path )
         parent_url = self.cache_url.with_path( path.parent )
         parent_adapter = __.adapter_from_url( parent_url ).as_directory( )
@@ -455,7 +1182,235 @@ class FileCache( _Common[ __.FileAdapter ], __.FileCache ):
                 __.Possessor.CurrentPopulation: __.Permissions_RCUD,
                 __.Possessor.CurrentUser: __.Permissions_RCUD } ),
             exist_ok = True,
-            parents = True )
+            parents = parents )
+
+
+async def prepare( auxdata: __.appcore.Globals ):
+    configuration = (
+        auxdata.configuration
+        .get( 'location-caches', { } ).get( _module_name, { } ) )
+    revalidator.configure( configuration )
+    auxdata.exits.push_async_callback( revalidator.close )
+
+
+def _acquire_content_stream_if_modified(
+    adapter: __.FileAdapter
+) -> __.typx.Optional[ __.cabc.Callable[
+    ..., __.typx.AsyncContextManager[ __.ContentStream | __.Inode ]
+] ]:
+    # Conditional acquisition is an optional capability of adapters.
+    return getattr( adapter, 'acquire_content_stream_if_modified', None )
+
+
+def _assert_no_conflicts(
+    differences: __.cabc.Sequence[ __.CacheDifferenceBase ],
+    is_conflict: __.cabc.Callable[ [ __.CacheDifferenceBase ], bool ],
+    conflicts: __.ConflictResolutionActions,
+    error_to_raise: __.typx.Callable[ ..., Exception ],
+):
+    if __.ConflictResolutionActions.Error is not conflicts: return
+    urls = [
+        str( difference.source_url )
+        for difference in differences if is_conflict( difference ) ]
+    if not urls: return
+    reason = "Conflicts with sources: {}".format( ', '.join( urls ) )
+    raise error_to_raise( reason = reason )
+
+
+def _calculate_digest( content: bytes ) -> str:
+    from hashlib import sha256
+    return f"sha256:{sha256( content ).hexdigest( )}"
+
+
+async def _calculate_digest_from_stream( adapter: __.FileAdapter ) -> str:
+    from hashlib import sha256
+    hasher = sha256( )
+    async with adapter.acquire_content_stream( ) as stream:
+        async for chunk in stream: hasher.update( chunk )
+    return f"sha256:{hasher.hexdigest( )}"
+
+
+async def _compare_entry(
+    source_url: __.Url,
+    entry: CacheManifestEntry,
+    workers: __.asyncio.Semaphore,
+) -> __.typx.Optional[ __.CacheDifferenceBase ]:
+    async with workers:
+        source_adapter = __.file_adapter_from_url( source_url )
+        cache_adapter = __.file_adapter_from_url( entry.cache_url )
+        source_inode, cache_inode = await __.asyncio.gather(
+            _examine_if_exists( source_adapter ),
+            _examine_if_exists( cache_adapter ) )
+        if None is source_inode or None is cache_inode:
+            return __.DirentsCacheDifference(
+                cache_url = entry.cache_url,
+                source_url = source_url,
+                cache_present = None is not cache_inode,
+                source_present = None is not source_inode,
+                recorded = True )
+        cache_altered, source_altered = await __.asyncio.gather(
+            _is_content_altered(
+                cache_adapter, cache_inode, entry.digest,
+                bytes_count = entry.bytes_count,
+                mtime = entry.cache_mtime ),
+            _is_content_altered(
+                source_adapter, source_inode, entry.digest,
+                bytes_count = entry.source_bytes_count,
+                content_id = entry.source_content_id,
+                mtime = entry.source_mtime ) )
+    if not cache_altered and not source_altered: return None
+    return __.ContentCacheDifference(
+        cache_url = entry.cache_url,
+        source_url = source_url,
+        cache_altered = cache_altered,
+        source_altered = source_altered )
+
+
+async def _compare_unrecorded_file(
+    source_url: __.Url, cache_url: __.Url
+) -> __.typx.Optional[ __.DirentsCacheDifference ]:
+    # Only files, which arrived in sources and are absent from cache.
+    if not await __.asyncio.to_thread( __.os.path.isfile, source_url.path ):
+        return None
+    if await __.file_adapter_from_url( cache_url ).check_existence( ):
+        return None
+    return __.DirentsCacheDifference(
+        cache_url = cache_url,
+        source_url = source_url,
+        cache_present = False,
+        source_present = True,
+        recorded = False )
+
+
+async def _compare_root(
+    source_url: __.Url, cache_url: __.Url, store: ContentStore
+) -> __.cabc.Sequence[ __.DirentsCacheDifference ]:
+    source_names, cache_names = await __.asyncio.gather(
+        _survey_file_names( source_url ), _survey_file_names( cache_url ) )
+    source_path = __.Path( source_url.path )
+    cache_path = __.Path( cache_url.path )
+    differences: list[ __.DirentsCacheDifference ] = [ ]
+    for name in source_names ^ cache_names:
+        source_url_ = source_url.with_path( source_path / name )
+        # Recorded files are compared by their manifest entries.
+        if source_url_.geturl( ) in store.entries: continue
+        differences.append( __.DirentsCacheDifference(
+            cache_url = cache_url.with_path( cache_path / name ),
+            source_url = source_url_,
+            cache_present = name in cache_names,
+            source_present = name in source_names,
+            recorded = False ) )
+    return differences
+
+
+def _datetime_from_json(
+    datetime: __.typx.Optional[ str ]
+) -> __.typx.Optional[ __.DateTime ]:
+    return __.DateTime.fromisoformat( datetime ) if datetime else None
+
+
+async def _delete_file( url: __.Url ):
+    path = __.Path( url.path )
+    adapter = __.adapter_from_url( url.with_path( path.parent ) )
+    await adapter.as_directory( ).delete_file( path.name )
+
+
+async def _examine_if_exists(
+    adapter: __.FileAdapter
+) -> __.typx.Optional[ __.Inode ]:
+    try: inode = await adapter.examine( )
+    except __.LocationExamineFailure:
+        if await adapter.check_existence( ): raise
+        return None
+    return None if inode.is_void( ) else inode
+
+
+def _is_commit_conflict( difference: __.CacheDifferenceBase ) -> bool:
+    if isinstance( difference, __.ContentCacheDifference ):
+        return difference.is_conflict( )
+    # Files removed from sources, which are still present in cache.
+    if isinstance( difference, __.DirentsCacheDifference ):
+        return difference.recorded and difference.cache_present
+    return False
+
+
+async def _is_content_altered( # noqa: PLR0913
+    adapter: __.FileAdapter,
+    inode: __.Inode,
+    digest: str, *,
+    bytes_count: __.typx.Optional[ int ] = None,
+    content_id: __.typx.Optional[ str ] = None,
+    mtime: __.typx.Optional[ __.DateTime ] = None,
+) -> bool:
+    # Inodes are cheap to compare; contents are only hashed if inodes differ.
+    if None is not bytes_count and inode.bytes_count == bytes_count:
+        if content_id and inode.content_id == content_id: return False
+        if mtime and inode.mtime == mtime: return False
+    if (    None is not inode.bytes_count and None is not bytes_count
+        and inode.bytes_count != bytes_count
+    ): return True
+    return digest != await _calculate_digest_from_stream( adapter )
+
+
+def _is_expired( record: __.Inode ) -> bool:
+    etime = record.etime
+    # Records from before expiration intervals are always revalidated.
+    if None is etime: return True
+    if None is etime.tzinfo: etime = etime.replace( tzinfo = __.TimeZone.utc )
+    return etime <= __.DateTime.now( __.TimeZone.utc )
+
+
+def _is_reingest_conflict( difference: __.CacheDifferenceBase ) -> bool:
+    if isinstance( difference, __.ContentCacheDifference ):
+        return difference.is_conflict( )
+    return False
+
+
+def _json_from_datetime(
+    datetime: __.typx.Optional[ __.DateTime ]
+) -> __.typx.Optional[ str ]:
+    return datetime.isoformat( ) if datetime else None
+
+
+def _json_from_manifest_entry(
+    entry: CacheManifestEntry
+) -> dict[ str, __.typx.Any ]:
+    return {
+        'cache-url': entry.cache_url.geturl( ),
+        'digest': entry.digest,
+        'bytes-count': entry.bytes_count,
+        'cache-mtime': _json_from_datetime( entry.cache_mtime ),
+        'source-bytes-count': entry.source_bytes_count,
+        'source-content-id': entry.source_content_id,
+        'source-mtime': _json_from_datetime( entry.source_mtime ),
+    }
+
+
+def _json_from_record( record: __.Inode ) -> bytes:
+    from json import dumps
+    inode = {
+        'bytes-count': record.bytes_count,
+        'content-id': record.content_id,
+        'mimetype': record.mimetype,
+        'charset': record.charset,
+        'mtime': record.mtime.isoformat( ) if record.mtime else None,
+        'etime': record.etime.isoformat( ) if record.etime else None,
+    }
+    return dumps(
+        { 'version': _record_format_version, 'inode': inode } ).encode( )
+
+
+def _manifest_entry_from_json(
+    entry: __.cabc.Mapping[ str, __.typx.Any ]
+) -> CacheManifestEntry:
+    return CacheManifestEntry(
+        cache_url = __.Url.from_url( entry[ 'cache-url' ] ),
+        digest = entry[ 'digest' ],
+        bytes_count = entry[ 'bytes-count' ],
+        cache_mtime = _datetime_from_json( entry.get( 'cache-mtime' ) ),
+        source_bytes_count = entry.get( 'source-bytes-count' ),
+        source_content_id = entry.get( 'source-content-id' ),
+        source_mtime = _datetime_from_json( entry.get( 'source-mtime' ) ) )
 
 
 def _normalize_path_parts(
@@ -464,3 +1419,85 @@ def _normalize_path_parts(
     return tuple(
         part.decode( ) if isinstance( part, bytes ) else part
         for part in parts )
+
+
+async def _receive_content(
+    chunks: __.cabc.AsyncIterable[ bytes ], location: __.Path
+) -> tuple[ str, int ]:
+    from hashlib import sha256
+    from aiofiles import open as open_
+    hasher = sha256( )
+    bytes_count = 0
+    async with open_( location, 'wb' ) as stream:
+        async for chunk in chunks:
+            hasher.update( chunk )
+            bytes_count += len( chunk )
+            await stream.write( chunk )
+    return f"sha256:{hasher.hexdigest( )}", bytes_count
+
+
+async def _reconcile_concurrently(
+    reconcilers: __.cabc.Iterable[ __.cabc.Awaitable[ None ] ]
+):
+    workers = __.asyncio.Semaphore( _ingest_workers_maximum )
+
+    async def reconcile( reconciler: __.cabc.Awaitable[ None ] ):
+        async with workers: await reconciler
+
+    await __.asyncf.gather_async(
+        *( reconcile( reconciler ) for reconciler in reconcilers ),
+        error_message = 'Failure to reconcile cache with sources.' )
+
+
+def _record_from_json( content: bytes ) -> __.typx.Optional[ __.Inode ]:
+    from json import loads
+    try: document = loads( content )
+    except ValueError: return None # Corrupt records are rebuilt.
+    if _record_format_version != document.get( 'version' ): return None
+    inode = document[ 'inode' ]
+    mtime, etime = inode.get( 'mtime' ), inode.get( 'etime' )
+    return __.Inode(
+        permissions = __.Permissions.Retrieve,
+        species = __.LocationSpecies.File,
+        supplement = { },
+        bytes_count = inode.get( 'bytes-count' ),
+        content_id = inode.get( 'content-id' ),
+        mimetype = inode.get( 'mimetype' ),
+        charset = inode.get( 'charset' ),
+        mtime = __.DateTime.fromisoformat( mtime ) if mtime else None,
+        etime = __.DateTime.fromisoformat( etime ) if etime else None )
+
+
+async def _reingest_difference(
+    store: ContentStore, difference: __.CacheDifferenceBase
+):
+    source_url, cache_url = difference.source_url, difference.cache_url
+    if isinstance( difference, __.ContentCacheDifference ):
+        if not difference.source_altered: return
+    elif isinstance( difference, __.DirentsCacheDifference ):
+        if difference.source_present: pass
+        # Files added to cache are left in cache.
+        elif not difference.recorded: return
+        else:
+            await _delete_file( cache_url )
+            store.forget_entry( source_url )
+            return
+    else: return
+    cache = FileCache(
+        adapter = __.file_adapter_from_url( source_url ),
+        cache_url = cache_url,
+        store = store )
+    await cache._ingest( )  # noqa: SLF001
+
+
+async def _survey_file_names( url: __.Url ) -> frozenset[ __.Path ]:
+    adapter = __.adapter_from_url( url )
+    if not await adapter.check_existence( ): return frozenset( )
+    path = __.Path( url.path )
+    async with __.ctxl.aclosing( adapter.as_directory( ).iterate_entries(
+        filters = ( ), recurse = True
+    ) ) as dirents:
+        return frozenset( [
+            __.Path( dirent.url.path ).relative_to( path )
+            async for dirent in dirents
+            if dirent.is_file( ) ] )
@@ -62,6 +62,58 @@ class AcquireContentTextResult( AcquireContentResult ):
     content: str
 
 
+class AcquireContentLinesResult( AcquireContentTextResult ):
+    ''' Inode and range of lines, as Unicode string, from acquisition.
+
+        Line numbers start at 1 and the end line is inclusive. The end line
+        precedes the start line, if no lines are in range. Count of lines in
+        whole content is only known, if the acquisition reached its end.
+    '''
+
+    start_line: int
+    end_line: int
+    lines_count: __.typx.Optional[ int ] = None
+
+    def is_partial( self ) -> bool:
+        ''' Are lines beyond range available? '''
+        return None is self.lines_count or self.end_line < self.lines_count
+
+
+class AcquireContentRangeResult( AcquireContentBytesResult ):
+    ''' Inode and range of content, as raw bytes, from acquisition.
+
+        Offsets are of bytes within whole content and the end offset is
+        exclusive. Size of whole content is reported by inode, if known.
+    '''
+
+    start: int
+    end: int
+
+    @classmethod
+    def from_content(
+        selfclass,
+        content: bytes,
+        start: int,
+        end: __.Absential[ int ],
+        inode: 'Inode',
+    ) -> __.typx.Self:
+        ''' Produces result from range of whole content. '''
+        start_, end_ = clip_content_range( len( content ), start, end )
+        return selfclass(
+            content = content[ start_ : end_ ], inode = inode,
+            start = start_, end = end_ )
+
+
+class AcquireContentViewResult( AcquireContentResult ):
+    ''' Inode and content, as memory view, from acquisition operation.
+
+        View is typically backed by a memory mapping and is only valid while
+        the mapping is held open by the acquiring context.
+    '''
+
+    content: memoryview
+
+
 class AlienResolutionActions( __.enum.Enum ): # TODO: Python 3.11: StrEnum
     ''' Which action to take when unregistered cache entity is encountered.
 
@@ -87,14 +139,54 @@ class AlienResolutionActions( __.enum.Enum ): # TODO: Python 3.11: StrEnum
     #   git stash push --include-untracked -- <paths>
 
 
-class CacheDifferenceBase:
+class CacheDifferenceBase( __.immut.DataclassObject ):
     ''' Base for various kinds of cache differences. '''
 
     # TODO: Possible subclasses:
-    #   ContentCacheDifference
-    #   DirentsCacheDifference
     #   InodeCacheDifference (bytes_count, content_id, mtime, species, etc...)
 
+    cache_url: 'Url'
+    source_url: 'Url'
+
+
+class ContentCacheDifference( CacheDifferenceBase ):
+    ''' Content of file differs between cache and sources.
+
+        Alterations are relative to content at time of last ingestion. If
+        both cache and sources are altered, then they are in conflict.
+    '''
+
+    cache_altered: bool
+    source_altered: bool
+
+    def is_conflict( self ) -> bool:
+        ''' Are both cache and sources altered? '''
+        return self.cache_altered and self.source_altered
+
+
+class DirentsCacheDifference( CacheDifferenceBase ):
+    ''' File is present in only one of cache or sources.
+
+        Recorded files were ingested into cache and have since been removed
+        from one side. Unrecorded files have since been added to one side.
+    '''
+
+    cache_present: bool
+    source_present: bool
+    recorded: bool
+
+
+class CacheIngestProgress( __.immut.DataclassObject ):
+    ''' Progress of ingestion of sources into cache.
+
+        Count of discovered entries grows as sources are surveyed, so it is
+        not a final total until ingestion is complete.
+    '''
+
+    entries_discovered: int
+    entries_ingested: int
+    entries_failed: int
+
 
 class ConflictResolutionActions( __.enum.Enum ): # TODO: Python 3.11: StrEnum
     ''' Which action to take upon conflict between cache and sources.
@@ -115,6 +207,54 @@ class ConflictResolutionActions( __.enum.Enum ): # TODO: Python 3.11: StrEnum
     #       <remote>/<branch>
 
 
+class ContentStream( __.cabc.AsyncIterator[ __.typx.Any ] ):
+    ''' Inode and chunks of content from streaming acquisition operation.
+
+        Inode is provisional until stream is exhausted. Attributes, which
+        require the entire content to substantiate (e.g., content hash), are
+        filled upon exhaustion of the stream.
+    '''
+    # TODO: Immutable instance attributes.
+
+    chunks: __.cabc.AsyncIterator[ __.typx.Any ]
+    inode: 'Inode'
+    observer: __.typx.Optional[ 'ContentStreamObserver' ]
+
+    def __init__(
+        self,
+        chunks: __.cabc.AsyncIterator[ __.typx.Any ],
+        inode: 'Inode',
+        observer: __.typx.Optional[ 'ContentStreamObserver' ] = None,
+    ):
+        self.chunks = chunks
+        self.inode = inode
+        self.observer = observer
+
+    def __aiter__( self ) -> __.typx.Self: return self
+
+    async def __anext__( self ) -> __.typx.Any:
+        try: chunk = await self.chunks.__anext__( )
+        except StopAsyncIteration:
+            if None is not self.observer:
+                self.inode = self.observer.conclude( self.inode )
+                self.observer = None
+            raise
+        if None is not self.observer: self.observer.observe( chunk )
+        return chunk
+
+
+class ContentStreamObserver( __.typx.Protocol ):
+    ''' Observes chunks of content stream and concludes inode for it. '''
+
+    def observe( self, chunk: __.typx.Any ) -> None:
+        ''' Observes chunk of content as it passes through stream. '''
+        raise NotImplementedError
+
+    def conclude( self, inode: 'Inode' ) -> 'Inode':
+        ''' Returns inode with attributes derived from observed content. '''
+        raise NotImplementedError
+
+
 class DirectoryEntry(
     __.immut.DataclassObject
 ):
@@ -339,6 +479,8 @@ class Url(
 # TODO: Python 3.12: type statement for aliases
 AlienResolutionActionsTable: __.typx.TypeAlias = (
     __.cabc.Mapping[ Url, AlienResolutionActions ] )
+CacheIngestReporter: __.typx.TypeAlias = (
+    __.cabc.Callable[ [ CacheIngestProgress ], None ] )
 ConflictResolutionActionsTable: __.typx.TypeAlias = (
     __.cabc.Mapping[ Url, ConflictResolutionActions ] )
 ImpurityResolutionActionsTable: __.typx.TypeAlias = (
@@ -348,6 +490,18 @@ PermissionsTable: __.typx.TypeAlias = (
 PossibleUrl: __.typx.TypeAlias = bytes | str | __.PathLike | _UrlParts
 
 
+content_chunk_size_default = 64 * 1024 # bytes
+
+
+def clip_content_range(
+    bytes_count: int, start: int, end: __.Absential[ int ] = __.absent
+) -> tuple[ int, int ]:
+    ''' Clips range of byte offsets to content of size. '''
+    start_ = min( max( start, 0 ), bytes_count )
+    if __.is_absent( end ): return start_, bytes_count
+    return start_, min( max( end, start_ ), bytes_count )
+
+
 def is_permissions_table( table: __.typx.Any ) -> bool:
     ''' Validates table is mapping from possessors to permissions. '''
     if not isinstance( table, __.cabc.Mapping ): return False
@@ -84,6 +84,15 @@ class LocationCacheIngestFailure( __.Omnierror ):
             f"Reason: {reason}" )
 
 
+class LocationCacheReconcileFailure( __.Omnierror ):
+    ''' Failure of attempt to reconcile cache with sources. '''
+
+    def __init__( self, cache_url, reason ):
+        super( ).__init__(
+            f"Could not reconcile cache location '{cache_url}' "
+            f"with sources. Reason: {reason}" )
+
+
 class LocationOperateFailure( __.Omnierror ):
     ''' Failure of attempt to operate on location. '''
 
@@ -169,6 +178,15 @@ class LocationIsIndirectionFailure( LocationOperateFailure ):
             f"Reason: {reason}" )
 
 
+class LocationSurveyEntriesFailure( LocationOperateFailure ):
+    ''' Failure of attempt to survey entries of location. '''
+
+    def __init__( self, url, reason ):
+        super( ).__init__(
+            f"Could not survey entries of location '{url}'. "
+            f"Reason: {reason}" )
+
+
 class LocationUpdateContentFailure( LocationOperateFailure ):
     ''' Failure of attempt to update content at location. '''
 
@@ -178,6 +196,15 @@ class LocationUpdateContentFailure( LocationOperateFailure ):
             f"Reason: {reason}" )
 
 
+class LocationWatchFailure( LocationOperateFailure ):
+    ''' Failure of attempt to watch location for alterations. '''
+
+    def __init__( self, url, reason ):
+        super( ).__init__(
+            f"Could not watch location '{url}' for alterations. "
+            f"Reason: {reason}" )
+
+
 class LocationSpeciesAssertionError(
     __.Omnierror, AssertionError, ValueError
 ):
@@ -18,25 +18,332 @@
 #============================================================================#
 
 
-''' Filter which honors Git ignore files (``.gitignore``). '''
 
+''' Filter which honors Git ignore files (``.gitignore``). '''
 
-from gitignorefile import Cache as _Cache
 
 from . import __
 
 
+_exclusions_location = __.Path( '.git', 'info', 'exclude' )
+_ignore_file_name = '.gitignore'
+_repository_marker_name = '.git'
+_scribe = __.acquire_scribe( __package__ )
+
+
 class Filter( __.Filter ):
-    ''' Filters directory entry according to relevant .gitignore files. '''
-    # TODO: Immutable class and instance attributes.
+    ''' Filters directory entry according to relevant .gitignore files.
 
-    cache: _Cache
+        Ignore files are loaded asynchronously, once each, as directories
+        are entered. Each is compiled into combined regular expressions. The
+        rules are held in a trie of directories, so that a decision for an
+        entry takes time proportional to its depth. Rules from outside of a
+        Git repository do not apply within it and exclusions from the
+        repository (``.git/info/exclude``) are also honored.
+    '''
+    # TODO: Immutable class and instance attributes.
 
-    def __init__( self ): self.cache = _Cache( )
+    def __init__( self ):
+        self._directories: dict[ str, _DirectoryRecord ] = { }
+        self._root = _DirectoryNode( )
 
     async def __call__( self, dirent: __.DirectoryEntry ) -> bool:
-        # TODO: Replace with async implementation.
-        # TODO: Handle exceptions.
-        return self.cache( dirent.url.path )
+        location = dirent.url.path
+        if not __.os.path.isabs( location ):
+            location = __.os.path.abspath( location )
+        directory, _, name = location.rpartition( '/' )
+        record = self._directories.get( directory )
+        if None is record: record = await self._survey_directory( directory )
+        if record.ignored: return True
+        is_directory = dirent.is_directory( )
+        if _match_rulesets( record.rulesets, name, is_directory ):
+            return True
+        if is_directory: # Load rules ahead of survey entering directory.
+            node = record.node.children.get( name )
+            if None is node:
+                node = record.node.children.setdefault(
+                    name, _DirectoryNode( ) )
+            node.acquire_loader( __.Path( location ) )
+        return False
+
+    def requires_inode( self ) -> bool: return False
+
+    async def _survey_directory( self, directory: str ) -> '_DirectoryRecord':
+        ''' Walks trie to directory, loading ignore rules as necessary. '''
+        parts = __.Path( directory ).parts
+        nodes = [ self._root ]
+        node = self._root
+        for name in parts[ 1 : ]:
+            node_ = node.children.get( name )
+            if None is node_:
+                node_ = node.children.setdefault( name, _DirectoryNode( ) )
+            node = node_
+            nodes.append( node )
+        loaders = [
+            node.acquire_loader( __.Path( *parts[ : i + 1 ] ) )
+            for i, node in enumerate( nodes ) if not node.loaded ]
+        if loaders: await __.asyncio.gather( *loaders )
+        names = parts[ 1 : ]
+        record = _DirectoryRecord(
+            ignored = _decide_directory_ignorance( nodes, names ),
+            node = node,
+            rulesets = _collect_rulesets( nodes, names ) )
+        return self._directories.setdefault( directory, record )
+
 
 __.filters_registry[ '@gitignore' ] = Filter
+
+
+_Rulesets: __.typx.TypeAlias = tuple[ tuple[ str, '_Rules' ], ... ]
+
+
+class _DirectoryRecord( __.typx.NamedTuple ):
+    ''' Decision for directory and rules for its entries. '''
+
+    ignored: bool
+    node: '_DirectoryNode'
+    rulesets: '_Rulesets'
+
+
+class _DirectoryNode:
+    ''' Ignore rules and decision for directory, plus subdirectories. '''
+    # TODO: Immutable instance attributes.
+
+    children: dict[ str, '_DirectoryNode' ]
+    exclusions: __.typx.Optional[ '_Rules' ]
+    ignored: __.typx.Optional[ bool ]
+    loaded: bool
+    repository: bool
+    rules: __.typx.Optional[ '_Rules' ]
+
+    def __init__( self ):
+        self.children = { }
+        self.exclusions = None
+        self.ignored = None
+        self.loaded = False
+        self.repository = False
+        self.rules = None
+        self._loader: __.typx.Optional[ __.asyncio.Future[ None ] ] = None
+
+    def acquire_loader( self, location: __.Path ) -> __.asyncio.Future[ None ]:
+        ''' Returns loader of ignore rules, which is shared by callers. '''
+        if None is self._loader:
+            self._loader = __.asyncio.ensure_future( self._load( location ) )
+        return self._loader
+
+    async def _load( self, location: __.Path ) -> None:
+        try:
+            self.rules, self.exclusions, self.repository = (
+                await __.asyncio.to_thread( _load_directory, location ) )
+        except Exception as exc:
+            raise __.LocationAcquireContentFailure(
+                url = location / _ignore_file_name,
+                reason = str( exc ) ) from exc
+        self.loaded = True
+
+
+class _Pattern( __.immut.DataclassObject ):
+    ''' Pattern from ignore file, translated to regular expression. '''
+
+    expression: str
+    directory_only: bool
+    negation: bool
+
+
+class _Rules:
+    ''' Patterns from ignore file, compiled into combined expressions.
+
+        Patterns are combined in reverse order, so that the first matching
+        alternative is the last matching pattern, as precedence requires.
+    '''
+    # TODO: Immutable instance attributes.
+
+    def __init__( self, patterns: __.cabc.Sequence[ _Pattern ] ):
+        self._negations = tuple( pattern.negation for pattern in patterns )
+        self._matcher_directories = _combine_patterns( patterns )
+        self._matcher_files = _combine_patterns(
+            patterns, directories = False )
+
+    def match(
+        self, location: str, is_directory: bool
+    ) -> __.typx.Optional[ bool ]:
+        ''' Is location ignored, unignored, or unmatched (None)? '''
+        matcher = (
+            self._matcher_directories if is_directory
+            else self._matcher_files )
+        if None is matcher: return None
+        match = matcher.fullmatch( location )
+        if None is match or None is match.lastgroup: return None
+        return not self._negations[ int( match.lastgroup[ 1 : ] ) ]
+
+
+def _combine_patterns(
+    patterns: __.cabc.Sequence[ _Pattern ], directories: bool = True
+) -> __.typx.Optional[ __.re.Pattern[ str ] ]:
+    alternatives = [
+        f"(?P<p{index}>{pattern.expression})"
+        for index, pattern in reversed( tuple( enumerate( patterns ) ) )
+        if directories or not pattern.directory_only ]
+    if not alternatives: return None
+    return __.re.compile( '|'.join( alternatives ), __.re.DOTALL )
+
+
+def _collect_rulesets(
+    nodes: __.cabc.Sequence[ _DirectoryNode ],
+    names: __.cabc.Sequence[ str ],
+) -> '_Rulesets':
+    ''' Collects rules for entries of last node, in order of precedence.
+
+        Names are of the nodes after the first. Each set of rules is paired
+        with the prefix of entry locations relative to the rules.
+    '''
+    rulesets: list[ tuple[ str, _Rules ] ] = [ ]
+    for i in range( len( nodes ) - 1, -1, -1 ):
+        node = nodes[ i ]
+        prefix = ''.join( f"{name}/" for name in names[ i : ] )
+        if None is not node.rules: rulesets.append( ( prefix, node.rules ) )
+        if node.repository:
+            if None is not node.exclusions:
+                rulesets.append( ( prefix, node.exclusions ) )
+            break
+    return tuple( rulesets )
+
+
+def _decide_directory_ignorance(
+    nodes: __.cabc.Sequence[ _DirectoryNode ],
+    names: __.cabc.Sequence[ str ],
+) -> bool:
+    ''' Decides if last of nodes is ignored, memoizing along the way. '''
+    # Note: Entries cannot be unignored if their directory is ignored.
+    if None is nodes[ 0 ].ignored: nodes[ 0 ].ignored = False
+    for i in range( 1, len( nodes ) ):
+        node = nodes[ i ]
+        if None is not node.ignored: continue
+        if node.repository: node.ignored = False
+        elif nodes[ i - 1 ].ignored: node.ignored = True
+        else:
+            rulesets = _collect_rulesets( nodes[ : i ], names[ : i - 1 ] )
+            node.ignored = _match_rulesets(
+                rulesets, names[ i - 1 ], is_directory = True )
+    return bool( nodes[ -1 ].ignored )
+
+
+def _load_directory(
+    location: __.Path
+) -> tuple[ __.typx.Optional[ _Rules ], __.typx.Optional[ _Rules ], bool ]:
+    rules = _load_rules( location / _ignore_file_name )
+    marker = location / _repository_marker_name
+    # Note: Marker is a file for worktrees and submodules.
+    #       Their exclusions live elsewhere and are not honored.
+    try: repository = marker.exists( )
+    except OSError: repository = False
+    exclusions = (
+        _load_rules( location / _exclusions_location )
+        if repository else None )
+    return rules, exclusions, repository
+
+
+def _load_rules( location: __.Path ) -> __.typx.Optional[ _Rules ]:
+    try:
+        content = location.read_text(
+            encoding = 'utf-8', errors = 'surrogateescape' )
+    except ( FileNotFoundError, NotADirectoryError ): return None
+    except OSError as exc:
+        # Unreadable ignore files should not abort surveys.
+        _scribe.warning(
+            f"Could not read ignore rules from '{location}'. "
+            f"Treating as empty. Reason: {exc}" )
+        return None
+    patterns = tuple( filter( None, map(
+        _parse_pattern, content.splitlines( ) ) ) )
+    if not patterns: return None
+    return _Rules( patterns )
+
+
+def _match_rulesets(
+    rulesets: '_Rulesets', name: str, is_directory: bool
+) -> bool:
+    for prefix, rules in rulesets:
+        verdict = rules.match( f"{prefix}{name}", is_directory )
+        if None is not verdict: return verdict
+    return False
+
+
+def _parse_pattern( line: str ) -> __.typx.Optional[ _Pattern ]:
+    if not line or line.startswith( '#' ): return None
+    pattern = line.rstrip( ' ' )
+    # Trailing spaces are ignored unless escaped with backslash.
+    if pattern.endswith( '\\' ) and len( pattern ) < len( line ):
+        pattern = f"{pattern} "
+    negation = pattern.startswith( '!' )
+    if negation: pattern = pattern[ 1 : ]
+    directory_only = pattern.endswith( '/' )
+    if directory_only: pattern = pattern[ : -1 ]
+    # Patterns with separators, other than at the end, are anchored.
+    anchored = '/' in pattern
+    pattern = pattern.removeprefix( '/' )
+    if not pattern: return None
+    expression = _translate_pattern( pattern )
+    if not anchored: expression = f"(?:.*/)?{expression}"
+    try: __.re.compile( expression )
+    except __.re.error: return None # Git ignores invalid patterns too.
+    return _Pattern(
+        expression = expression,
+        directory_only = directory_only,
+        negation = negation )
+
+
+def _translate_asterisks( pattern: str, start: int ) -> tuple[ str, int ]:
+    ''' Translates run of asterisks and returns its end. '''
+    size = len( pattern )
+    end = start
+    while end < size and '*' == pattern[ end ]: end += 1
+    # Double asterisks are special only as whole path components.
+    leading = 0 == start or '/' == pattern[ start - 1 ]
+    if leading and '**' == pattern[ start : end ]:
+        if end == size: return '.+', end
+        if '/' == pattern[ end ]: return '(?:.*/)?', end + 1
+    # Other consecutive asterisks are regular asterisks.
+    return '[^/]*', end
+
+
+def _translate_bracket(
+    pattern: str, start: int
+) -> tuple[ __.typx.Optional[ str ], int ]:
+    ''' Translates bracket expression, if closed, and returns its end. '''
+    end = start + 1
+    if end < len( pattern ) and pattern[ end ] in '!^': end += 1
+    if end < len( pattern ) and ']' == pattern[ end ]: end += 1
+    end = pattern.find( ']', end )
+    if -1 == end: return None, start + 1
+    content = pattern[ start + 1 : end ]
+    for character in '[&~|': # Avoid nested set syntax in expressions.
+        content = content.replace( character, f"\\{character}" )
+    if content[ : 1 ] in ( '!', '^' ):
+        return f"[^/{content[ 1 : ]}]", end + 1
+    return f"[{content}]", end + 1
+
+
+def _translate_pattern( pattern: str ) -> str:
+    ''' Translates wildcard pattern to regular expression. '''
+    parts: list[ str ] = [ ]
+    size = len( pattern )
+    i = 0
+    while i < size:
+        character = pattern[ i ]
+        if '*' == character:
+            expression, i = _translate_asterisks( pattern, i )
+            parts.append( expression )
+        elif '?' == character:
+            parts.append( '[^/]' )
+            i += 1
+        elif '[' == character:
+            expression_, i = _translate_bracket( pattern, i )
+            parts.append( expression_ or '\\[' )
+        elif '\\' == character and i + 1 < size:
+            parts.append( __.re.escape( pattern[ i + 1 ] ) )
+            i += 2
+        else:
+            parts.append( __.re.escape( character ) )
+            i += 1
+    return ''.join( parts )
@@ -118,6 +118,8 @@ class Filter( __.Filter ):
                     if isdir and '.svn' == name: return True
         return False
 
+    def requires_inode( self ) -> bool: return False
+
 # TODO: Convert into docstring template and pass 'available' and 'default' via
 #       'docstring_arguments' metaclass argument for 'ImmutableClass'.
 Filter.__doc__ = ( Filter.__doc__ or '' ) + (
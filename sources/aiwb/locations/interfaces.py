@@ -116,6 +116,45 @@ class Filter( __.typx.Protocol ):
     async def __call__( self, dirent: _core.DirectoryEntry ) -> bool:
         raise NotImplementedError
 
+    def requires_inode( self ) -> bool:
+        ''' Does filter require complete inode for directory entries?
+
+            If not, then filter may be applied to directory entries, which
+            only have location species, before status is gathered for them.
+            This allows surveys to prune entries, including entire subtrees,
+            before examining them.
+        '''
+        return True
+
+
+@__.typx.runtime_checkable
+class StagedContentUpdate( __.typx.Protocol ):
+    ''' Update of file content, which is staged until commitment.
+
+        Staged updates of several files can be committed together. If any
+        fails to commit, then those, which were committed, can be reverted.
+        Every staged update must be discarded, whether committed or not, so
+        that resources, such as temporary files, are released.
+    '''
+
+    @__.abc.abstractmethod
+    async def commit( self ) -> _core.Inode:
+        ''' Replaces content of file with staged content. Returns inode. '''
+        raise NotImplementedError
+
+    @__.abc.abstractmethod
+    async def discard( self ) -> None:
+        ''' Releases staged content or, if committed, prior content. '''
+        raise NotImplementedError
+
+    @__.abc.abstractmethod
+    async def revert( self ) -> None:
+        ''' Restores prior content of file, if possible.
+
+            Does nothing, if not committed.
+        '''
+        raise NotImplementedError
+
 
 class DirectoryOperations(
     __.immut.Protocol,
@@ -170,6 +209,23 @@ class DirectoryOperations(
 
     # TODO: delete_indirection
 
+    @__.abc.abstractmethod
+    def iterate_entries(
+        self,
+        attributes: _core.InodeAttributes = _core.InodeAttributes.Nothing,
+        filters: __.Absential[
+            __.cabc.Iterable[ 'PossibleFilter' ]
+        ] = __.absent,
+        recurse: bool = True,
+        depth_maximum: 'SurveyDepthMaximumArgument' = __.absent,
+        entries_maximum: 'SurveyEntriesMaximumArgument' = __.absent,
+    ) -> __.cabc.AsyncIterator[ _core.DirectoryEntry ]:
+        ''' Yields directory entries, subject to filtering, as discovered.
+
+            Shallower entries are yielded before deeper ones.
+        '''
+        raise NotImplementedError
+
     @__.abc.abstractmethod
     def produce_entry_accessor(
         self, name: 'PossibleRelativeLocator'
@@ -202,9 +258,6 @@ class FileOperations(
         ''' Returns content of file as raw bytes. '''
         raise NotImplementedError
 
-    # TODO: acquire_content_continuous
-    #       Returns iterator which has inode attribute.
-
     @__.abc.abstractmethod
     async def acquire_content_result(
         self,
@@ -213,6 +266,55 @@ class FileOperations(
         ''' Returns inode and content of file as raw bytes. '''
         raise NotImplementedError
 
+    async def acquire_content_range(
+        self,
+        start: int,
+        end: __.Absential[ int ] = __.absent,
+        attributes: _core.InodeAttributes = _core.InodeAttributes.Nothing,
+    ) -> _core.AcquireContentRangeResult:
+        ''' Returns inode and range of content of file as raw bytes.
+
+            End offset is exclusive; range extends to end of content, if
+            it is absent. Range is clipped to content. By default, whole
+            content is acquired and then sliced; adapters, which can seek
+            or request ranges, should override this.
+        '''
+        result = await self.acquire_content_result( attributes = attributes )
+        return _core.AcquireContentRangeResult.from_content(
+            result.content, start, end, inode = result.inode )
+
+    @__.abc.abstractmethod
+    def acquire_content_stream(
+        self,
+        attributes: _core.InodeAttributes = _core.InodeAttributes.Nothing,
+        chunk_size: 'ContentChunkSizeArgument' =
+            _core.content_chunk_size_default,
+    ) -> __.typx.AsyncContextManager[ _core.ContentStream ]:
+        ''' Provides stream of inode and content of file as raw bytes.
+
+            Content is read in chunks, which are no larger than the requested
+            size, so that memory use is constant regardless of file size.
+        '''
+        raise NotImplementedError
+
+    async def stage_content(
+        self,
+        content: bytes,
+        attributes: _core.InodeAttributes = _core.InodeAttributes.Nothing,
+        options: _core.FileUpdateOptions = _core.FileUpdateOptions.Defaults,
+    ) -> StagedContentUpdate:
+        ''' Stages update of content of file from raw bytes.
+
+            By default, update is deferred until commitment and cannot be
+            reverted; adapters, which can write atomically, should override
+            this.
+        '''
+        return _DeferredContentUpdate(
+            accessor = self,
+            content = content,
+            attributes = attributes,
+            options = options )
+
     @__.abc.abstractmethod
     async def update_content(
         self,
@@ -223,7 +325,18 @@ class FileOperations(
         ''' Updates content of file from raw bytes. Returns inode. '''
         raise NotImplementedError
 
-    # TODO: update_content_continuous
+    @__.abc.abstractmethod
+    async def update_content_stream(
+        self,
+        chunks: __.cabc.AsyncIterable[ bytes ],
+        attributes: _core.InodeAttributes = _core.InodeAttributes.Nothing,
+        options: _core.FileUpdateOptions = _core.FileUpdateOptions.Defaults,
+    ) -> _core.Inode:
+        ''' Updates content of file from chunks of raw bytes.
+
+            Returns inode.
+        '''
+        raise NotImplementedError
 
 
 class GeneralOperations(
@@ -499,9 +612,6 @@ class FilePresenter(
         ''' Returns content of file as specific type. '''
         raise NotImplementedError
 
-    # TODO: acquire_content_continuous
-    #       Returns iterator which has inode attribute.
-
     @__.abc.abstractmethod
     async def acquire_content_result(
         self, *,
@@ -510,6 +620,17 @@ class FilePresenter(
         ''' Returns inode and content of file as specific type. '''
         raise NotImplementedError
 
+    @__.abc.abstractmethod
+    def acquire_content_stream(
+        self, *,
+        attributes: _core.InodeAttributes = _core.InodeAttributes.Nothing,
+        chunk_size: 'ContentChunkSizeArgument' =
+            _core.content_chunk_size_default,
+    ) -> __.typx.AsyncContextManager[ _core.ContentStream ]:
+        ''' Provides stream of inode and content of file as specific type.
+        '''
+        raise NotImplementedError
+
     @__.abc.abstractmethod
     async def update_content(
         self,
@@ -535,7 +656,50 @@ SpecificAccessor: __.typx.TypeAlias = DirectoryAccessor | FileAccessor
 SpecificAdapter: __.typx.TypeAlias = DirectoryAdapter | FileAdapter
 SpecificCache: __.typx.TypeAlias = DirectoryCache | FileCache
 
+ContentChunkSizeArgument: __.typx.TypeAlias = __.typx.Annotated[
+    int,
+    __.typx.Doc( ''' Maximum number of bytes to read per chunk. ''' ),
+]
 CreateParentsArgument: __.typx.TypeAlias = __.typx.Annotated[
     bool,
     __.typx.Doc( ''' Create parent directories if they do not exist. ''' ),
 ]
+SurveyDepthMaximumArgument: __.typx.TypeAlias = __.typx.Annotated[
+    __.Absential[ int ],
+    __.typx.Doc(
+        ''' Maximum depth of entries to survey.
+
+            Immediate entries of directory are at depth 1.
+        ''' ),
+]
+SurveyEntriesMaximumArgument: __.typx.TypeAlias = __.typx.Annotated[
+    __.Absential[ int ],
+    __.typx.Doc( ''' Maximum number of entries to survey. ''' ),
+]
+
+
+class _DeferredContentUpdate( StagedContentUpdate ):
+    ''' Update of file content, which is deferred until commitment. '''
+    # TODO: Immutable instance attributes.
+
+    def __init__(
+        self,
+        accessor: FileOperations,
+        content: bytes,
+        attributes: _core.InodeAttributes,
+        options: _core.FileUpdateOptions,
+    ):
+        self.accessor = accessor
+        self.attributes = attributes
+        self.content = content
+        self.options = options
+
+    async def commit( self ) -> _core.Inode:
+        return await self.accessor.update_content(
+            self.content,
+            attributes = self.attributes,
+            options = self.options )
+
+    async def discard( self ) -> None: pass
+
+    async def revert( self ) -> None: pass
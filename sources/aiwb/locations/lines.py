@@ -0,0 +1,329 @@
+# vim: set filetype=python fileencoding=utf-8:
+# -*- coding: utf-8 -*-
+
+#============================================================================#
+#                                                                            #
+#  Licensed under the Apache License, Version 2.0 (the "License");           #
+#  you may not use this file except in compliance with the License.          #
+#  You may obtain a copy of the License at                                   #
+#                                                                            #
+#      http://www.apache.org/licenses/LICENSE-2.0                            #
+#                                                                            #
+#  Unless required by applicable law or agreed to in writing, software       #
+#  distributed under the License is distributed on an "AS IS" BASIS,         #
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  #
+#  See the License for the specific language governing permissions and       #
+#  limitations under the License.                                            #
+#                                                                            #
+#============================================================================#
+
+
+
+''' Indices of line boundaries within contents of text files.
+
+    An index records the offset, in bytes, of the end of each line within
+    the raw content of a file, so that ranges of lines can be located
+    without decoding or splitting the whole content. Indices are kept per
+    file version, as identified by inode metadata, and are discarded,
+    least recently used first, beyond a total size.
+'''
+
+
+from array import array as _Array
+from bisect import bisect_right as _bisect_right
+from collections import OrderedDict as _OrderedDict
+from itertools import accumulate as _accumulate
+from itertools import islice as _islice
+
+from . import __
+from . import core as _core
+from . import interfaces as _interfaces
+from . import registries as _registries
+
+
+# TODO: Python 3.12: type statement for aliases
+InodeVersion: __.typx.TypeAlias = tuple[
+    __.typx.Optional[ int ],
+    __.typx.Optional[ __.DateTime ],
+    __.typx.Optional[ str ] ]
+
+
+_indices_bytes_maximum_default = 64 * 1024 ** 2
+_scan_chunk_size = 1024 ** 2
+
+
+class LineIndex( __.immut.DataclassObject ):
+    ''' Offsets of ends of lines within raw content of text file.
+
+        Lines end after their newlines, which may be any of LF, CR-LF, or
+        CR, as with universal newlines. Final line may lack a newline.
+        Offsets are kept as an array of unsigned 64-bit integers, which is
+        a small fraction of the size of the lines as Python strings.
+        Lines are numbered from 1.
+    '''
+
+    bytes_count: int
+    ends: _Array
+    inode: __.typx.Optional[ _core.Inode ] = None
+
+    @classmethod
+    def from_content(
+        selfclass,
+        content: bytes,
+        inode: __.typx.Optional[ _core.Inode ] = None,
+    ) -> __.typx.Self:
+        ''' Produces index from whole raw content. '''
+        scanner = _LineEndsScanner( )
+        # Chunks bound number of lines split from content at once.
+        for start in range( 0, len( content ), _scan_chunk_size ):
+            scanner.scan( content[ start : start + _scan_chunk_size ] )
+        return scanner.conclude( inode )
+
+    def count_lines( self ) -> int:
+        ''' Returns count of lines, including unterminated final line. '''
+        count = len( self.ends )
+        if self.bytes_count > ( self.ends[ -1 ] if count else 0 ):
+            return count + 1
+        return count
+
+    def count_newlines( self ) -> int:
+        ''' Returns count of newlines. '''
+        return len( self.ends )
+
+    def find_line( self, offset: int ) -> int:
+        ''' Returns number of line, which contains offset. '''
+        return _bisect_right( self.ends, offset ) + 1
+
+    def find_lines_within( self, start_line: int, bytes_maximum: int ) -> int:
+        ''' Returns number of last line within size from start of line.
+
+            Returns the start line, if it alone exceeds the size.
+        '''
+        limit = self.locate_line( start_line )[ 0 ] + bytes_maximum
+        end_line = _bisect_right( self.ends, limit )
+        if self.bytes_count <= limit: end_line = self.count_lines( )
+        return max( start_line, end_line )
+
+    def is_current( self, inode: _core.Inode ) -> bool:
+        ''' Does index reflect version of content described by inode? '''
+        if None is self.inode: return False
+        version = produce_inode_version( inode )
+        return (
+            None is not version
+            and version == produce_inode_version( self.inode ) )
+
+    def locate_line( self, number: int ) -> tuple[ int, int ]:
+        ''' Returns offsets of start and end of line.
+
+            End offset is exclusive and follows newline, if any. Offsets
+            are clipped to content.
+        '''
+        return self.locate_lines( number, number )
+
+    def locate_lines(
+        self, start_line: int, end_line: __.Absential[ int ] = __.absent
+    ) -> tuple[ int, int ]:
+        ''' Returns offsets of start of first line and end of last line.
+
+            End line is inclusive; range extends to end of content, if it
+            is absent. End offset is exclusive and follows newline, if any.
+            Offsets are clipped to content.
+        '''
+        count = len( self.ends )
+        if start_line <= 1: start = 0
+        elif start_line - 2 < count: start = self.ends[ start_line - 2 ]
+        else: start = self.bytes_count
+        if __.is_absent( end_line ) or end_line > count:
+            end = self.bytes_count
+        elif end_line < 1: end = 0
+        else: end = self.ends[ end_line - 1 ]
+        return start, max( start, end )
+
+
+class LineIndicesStatistics( __.immut.DataclassObject ):
+    ''' Snapshot of usage statistics for line indices. '''
+
+    bytes_count: int
+    entries_count: int
+    hits: int
+    misses: int
+
+
+class LineIndices:
+    ''' Remembers line indices of files, one per location.
+
+        Index of location is only recalled, if it reflects the version of
+        content, as identified by size, modification time, and content
+        identifier. Least recently used indices are discarded beyond a
+        total size of offsets.
+    '''
+    # TODO: Immutable instance attributes.
+
+    bytes_count: int
+    bytes_maximum: int
+    enabled: bool
+    entries: _OrderedDict[ str, LineIndex ]
+    hits: int
+    misses: int
+
+    def __init__( self, bytes_maximum: int = _indices_bytes_maximum_default ):
+        self.bytes_count = 0
+        self.bytes_maximum = bytes_maximum
+        self.enabled = True
+        self.entries = _OrderedDict( )
+        self.hits = 0
+        self.misses = 0
+
+    async def acquire(
+        self, accessor: _interfaces.FileAccessor
+    ) -> LineIndex:
+        ''' Returns index of file, streaming its content if necessary. '''
+        url = str( accessor.as_url( ) )
+        inode = await accessor.examine( )
+        index = self.recall( url, inode )
+        if None is not index: return index
+        version = produce_inode_version( inode )
+
+        async def produce( ) -> LineIndex:
+            scanner = _LineEndsScanner( )
+            async with accessor.acquire_content_stream( ) as stream:
+                async for chunk in stream: scanner.scan( chunk )
+                index = scanner.conclude( stream.inode )
+            self.memoize( url, index )
+            return index
+
+        if None is version: return await produce( )
+        return await _registries.single_flights.coalesce(
+            ( 'index-lines', url, version ), produce )
+
+    def configure( self, configuration: __.cabc.Mapping[ str, __.typx.Any ] ):
+        ''' Applies configuration to indices. '''
+        self.enabled = bool( configuration.get( 'enable', True ) )
+        self.bytes_maximum = int( configuration.get(
+            'bytes-maximum', _indices_bytes_maximum_default ) )
+        if not self.enabled: self.clear( )
+        self._evict( )
+
+    def clear( self ):
+        ''' Forgets all indices. '''
+        self.entries.clear( )
+        self.bytes_count = 0
+
+    def forget( self, url: str ):
+        ''' Forgets index of location, if any. '''
+        index = self.entries.pop( url, None )
+        if None is not index: self.bytes_count -= _size_index( index )
+
+    def index_content(
+        self, url: str, content: bytes, inode: _core.Inode
+    ) -> LineIndex:
+        ''' Returns index of content, producing it if necessary. '''
+        index = self.recall( url, inode )
+        if None is not index: return index
+        index = LineIndex.from_content( content, inode )
+        self.memoize( url, index )
+        return index
+
+    def memoize( self, url: str, index: LineIndex ):
+        ''' Remembers index of location, if version is identifiable. '''
+        if not self.enabled or None is index.inode: return
+        if None is produce_inode_version( index.inode ): return
+        self.forget( url )
+        self.entries[ url ] = index
+        self.bytes_count += _size_index( index )
+        self._evict( )
+
+    def recall(
+        self, url: str, inode: _core.Inode
+    ) -> __.typx.Optional[ LineIndex ]:
+        ''' Returns index of location, if it reflects version of inode. '''
+        index = self.entries.get( url )
+        if None is index or not index.is_current( inode ):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end( url )
+        return index
+
+    def report_statistics( self ) -> LineIndicesStatistics:
+        ''' Reports size and count of indices and of lookups. '''
+        return LineIndicesStatistics(
+            bytes_count = self.bytes_count,
+            entries_count = len( self.entries ),
+            hits = self.hits,
+            misses = self.misses )
+
+    def _evict( self ):
+        while self.bytes_count > self.bytes_maximum and self.entries:
+            _, index = self.entries.popitem( last = False )
+            self.bytes_count -= _size_index( index )
+
+
+line_indices = LineIndices( )
+
+
+def is_line_indexable_charset( charset: str ) -> bool:
+    ''' Are newlines in charset single bytes, which are never ambiguous?
+
+        Applies to ASCII-compatible charsets, such as UTF-8, but not to
+        charsets, such as UTF-16, which encode newlines as several bytes.
+    '''
+    try: return b'\r\n' == '\r\n'.encode( charset )
+    except LookupError: return False
+
+
+def produce_inode_version(
+    inode: _core.Inode
+) -> __.typx.Optional[ InodeVersion ]:
+    ''' Returns identity of content version, if determinable from inode. '''
+    if None is inode.mtime and None is inode.content_id: return None
+    return ( inode.bytes_count, inode.mtime, inode.content_id )
+
+
+class _LineEndsScanner:
+    ''' Accumulates ends of lines across chunks of raw content. '''
+
+    def __init__( self ):
+        self.carriage = False
+        self.ends = _Array( 'Q' )
+        self.offset = 0
+
+    def conclude(
+        self, inode: __.typx.Optional[ _core.Inode ]
+    ) -> LineIndex:
+        ''' Produces index from accumulated ends of lines. '''
+        # Lone carriage return at end of content terminates final line.
+        if self.carriage: self.ends.append( self.offset )
+        return LineIndex(
+            bytes_count = self.offset, ends = self.ends, inode = inode )
+
+    def scan( self, chunk: bytes ):
+        ''' Accumulates ends of complete lines from chunk.
+
+            Only the new chunk is split. Parts of unterminated lines are
+            not carried between chunks, so that long lines scan linearly.
+        '''
+        if not chunk: return
+        offset = self.offset
+        self.offset += len( chunk )
+        if self.carriage:
+            self.carriage = False
+            if chunk.startswith( b'\n' ):
+                self.ends.append( offset + 1 )
+                chunk = chunk[ 1 : ]
+                offset += 1
+            else: self.ends.append( offset )
+        # Carriage return may be the first half of a CR-LF pair, which
+        # continues in next chunk.
+        self.carriage = chunk.endswith( b'\r' )
+        lines = chunk.splitlines( keepends = True )
+        count = len( lines )
+        # Final line may continue in next chunk.
+        if count and not lines[ -1 ].endswith( b'\n' ): count -= 1
+        ends = _accumulate( map( len, lines ), initial = offset )
+        next( ends )
+        self.ends.extend( _islice( ends, count ) )
+
+
+def _size_index( index: LineIndex ) -> int:
+    return index.ends.itemsize * len( index.ends )
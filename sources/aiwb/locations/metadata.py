@@ -0,0 +1,193 @@
+# vim: set filetype=python fileencoding=utf-8:
+# -*- coding: utf-8 -*-
+
+#============================================================================#
+#                                                                            #
+#  Licensed under the Apache License, Version 2.0 (the "License");           #
+#  you may not use this file except in compliance with the License.          #
+#  You may obtain a copy of the License at                                   #
+#                                                                            #
+#      http://www.apache.org/licenses/LICENSE-2.0                            #
+#                                                                            #
+#  Unless required by applicable law or agreed to in writing, software       #
+#  distributed under the License is distributed on an "AS IS" BASIS,         #
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  #
+#  See the License for the specific language governing permissions and       #
+#  limitations under the License.                                            #
+#                                                                            #
+#============================================================================#
+
+
+
+''' Persistent memoization of costly inode attributes for local files. '''
+
+
+from collections import OrderedDict as _OrderedDict
+
+from . import __
+from . import core as _core
+
+
+_entries_maximum_default = 65536
+_format_version = 1
+
+
+class InodeMetadata( __.immut.DataclassObject ):
+    ''' Memoized attributes of inode. Absent if never determined. '''
+
+    mimetype: __.Absential[ str ] = __.absent
+    charset: __.Absential[ __.typx.Optional[ str ] ] = __.absent
+    content_id: __.Absential[ str ] = __.absent
+
+    def apply( self, inode: _core.Inode ) -> _core.Inode:
+        ''' Fills attributes of inode which are unset and memoized. '''
+        return inode.with_attributes(
+            mimetype = inode.mimetype or self.mimetype,
+            charset = inode.charset or self.charset,
+            content_id = inode.content_id or self.content_id )
+
+
+class InodeMetadataCacheStatistics( __.immut.DataclassObject ):
+    ''' Snapshot of usage statistics for inode metadata cache. '''
+
+    entries_count: int
+    hits: int
+    misses: int
+
+
+class InodeMetadataCache:
+    ''' Memoizes costly inode attributes, such as MIME types.
+
+        Entries are keyed by device, inode number, modification time, and
+        size. Hence, any change to a file invalidates its entry. Least
+        recently used entries are evicted beyond a maximum count. Entries
+        may be loaded from and saved to a file, so that they persist across
+        application sessions.
+    '''
+    # TODO: Immutable instance attributes.
+
+    enabled: bool
+    entries: _OrderedDict[ str, InodeMetadata ]
+    entries_maximum: int
+    hits: int
+    misses: int
+
+    def __init__( self, entries_maximum: int = _entries_maximum_default ):
+        self.enabled = True
+        self.entries = _OrderedDict( )
+        self.entries_maximum = entries_maximum
+        self.hits = 0
+        self.misses = 0
+        self._altered = False
+
+    def access( self, stat: __.os.stat_result ) -> InodeMetadata:
+        ''' Returns memoized attributes for inode, possibly none. '''
+        if not self.enabled: return _metadata_void
+        key = _key_from_stat( stat )
+        metadata = self.entries.get( key )
+        if None is metadata:
+            self.misses += 1
+            return _metadata_void
+        self.hits += 1
+        self.entries.move_to_end( key )
+        return metadata
+
+    def apply(
+        self, stat: __.os.stat_result, inode: _core.Inode
+    ) -> _core.Inode:
+        ''' Fills unset attributes of inode from memoized attributes. '''
+        return self.access( stat ).apply( inode )
+
+    def configure( self, configuration: __.cabc.Mapping[ str, __.typx.Any ] ):
+        ''' Applies configuration to cache. '''
+        self.enabled = bool( configuration.get( 'enable', True ) )
+        self.entries_maximum = int( configuration.get(
+            'entries-maximum', _entries_maximum_default ) )
+        self._evict( )
+
+    async def load( self, location: __.Path ):
+        ''' Loads entries from file, if it exists and is compatible. '''
+        from json import loads
+        from aiofiles import open as open_
+        try:
+            async with open_( location ) as stream:
+                document = loads( await stream.read( ) )
+        except FileNotFoundError: return
+        except ( OSError, ValueError ): return # Corrupt caches are rebuilt.
+        if _format_version != document.get( 'version' ): return
+        for key, attributes in document.get( 'entries', ( ) ):
+            self.entries[ key ] = InodeMetadata( **{
+                name: value for name, value in attributes.items( )
+                if name in _attributes_names } )
+        self._evict( )
+
+    def memoize(
+        self,
+        stat: __.os.stat_result,
+        inode: _core.Inode,
+        attributes: _core.InodeAttributes,
+    ):
+        ''' Memoizes costly attributes, which were determined for inode. '''
+        if not self.enabled: return
+        Iattrs = _core.InodeAttributes
+        key = _key_from_stat( stat )
+        metadata = self.entries.get( key, _metadata_void )
+        metadata_ = InodeMetadata(
+            mimetype = (
+                inode.mimetype or __.absent if Iattrs.Mimetype & attributes
+                else metadata.mimetype ),
+            charset = (
+                inode.charset if Iattrs.Charset & attributes
+                else metadata.charset ),
+            content_id = (
+                inode.content_id or __.absent
+                if Iattrs.ContentId & attributes
+                else metadata.content_id ) )
+        if metadata_ == metadata: return
+        self.entries[ key ] = metadata_
+        self.entries.move_to_end( key )
+        self._altered = True
+        self._evict( )
+
+    def report_statistics( self ) -> InodeMetadataCacheStatistics:
+        ''' Reports count of entries and of lookups. '''
+        return InodeMetadataCacheStatistics(
+            entries_count = len( self.entries ),
+            hits = self.hits,
+            misses = self.misses )
+
+    async def save( self, location: __.Path ):
+        ''' Saves entries to file, if altered since load or last save. '''
+        if not self._altered: return
+        from json import dumps
+        from aiofiles import open as open_
+        from aiofiles.os import makedirs, replace
+        entries = [
+            ( key, {
+                name: getattr( metadata, name )
+                for name in _attributes_names
+                if not __.is_absent( getattr( metadata, name ) ) } )
+            for key, metadata in self.entries.items( ) ]
+        document = dumps( { 'version': _format_version, 'entries': entries } )
+        location_ = location.with_name( f"{location.name}.{__.uuid4( ).hex}" )
+        await makedirs( location.parent, exist_ok = True )
+        async with open_( location_, 'w' ) as stream:
+            await stream.write( document )
+        await replace( location_, location )
+        self._altered = False
+
+    def _evict( self ):
+        while len( self.entries ) > self.entries_maximum:
+            self.entries.popitem( last = False )
+            self._altered = True
+
+
+inode_metadata_cache = InodeMetadataCache( )
+
+
+_attributes_names = frozenset( ( 'mimetype', 'charset', 'content_id' ) )
+_metadata_void = InodeMetadata( )
+
+
+def _key_from_stat( stat: __.os.stat_result ) -> str:
+    return f"{stat.st_dev}:{stat.st_ino}:{stat.st_mtime_ns}:{stat.st_size}"
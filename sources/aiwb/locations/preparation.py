@@ -24,20 +24,38 @@
 from . import __
 
 
+async def prepare( auxdata: __.appcore.Globals ):
+    ''' Prepares location access adapters, caches, etc... from configuration.
+
+        Resources which must be released on application exit, such as pooled
+        network connections, are registered on the exits stack.
+    '''
+    preparers = tuple(
+        species_module.prepare( auxdata )
+        for species_module in _discover_species_modules( )
+        if hasattr( species_module, 'prepare' ) )
+    await __.asyncf.gather_async( *preparers )
+
+
 async def register_defaults( ):
     ''' Registers default location access adapters, etc.... '''
+    registrators = tuple(
+        species_module.register_defaults( )
+        for species_module in _discover_species_modules( )
+        if hasattr( species_module, 'register_defaults' ) )
+    await __.asyncf.gather_async( *registrators )
+
+
+def _discover_species_modules( ) -> tuple[ __.types.ModuleType, ... ]:
     from importlib import import_module
     from inspect import ismodule
     genera_modules = (
         import_module( f".{name}", __package__ )
-        for name in ( 'adapters', 'presenters' ) )
-    species_modules = (
+        for name in ( 'adapters', 'caches', 'presenters' ) )
+    return tuple(
         import_module( f".{name}", genus_module.__package__ )
         for genus_module in genera_modules
         for name, attribute in vars( genus_module ).items( )
-        if not name.startswith( '_' ) and ismodule( attribute ) )
-    registrators = tuple(
-        species_module.register_defaults( )
-        for species_module in species_modules
-        if hasattr( species_module, 'register_defaults' ) )
-    await __.asyncf.gather_async( *registrators )
+        # Test harnesses may inject other modules, like '@py_builtins'.
+        if  not name.startswith( '_' ) and ismodule( attribute )
+        and attribute.__name__.startswith( f"{genus_module.__name__}." ) )
@@ -26,6 +26,7 @@ from . import __
 
 _module_name = __name__.replace( f"{__package__}.", '' )
 _entity_name = f"location content presenter '{_module_name}'"
+_probe_size = 64 * 1024 # bytes
 
 
 class FilePresenter( __.FilePresenter ):
@@ -49,28 +50,211 @@ class FilePresenter( __.FilePresenter ):
             attributes |= __.InodeAttributes.Charset
             charset = None
         else: charset = self.charset
-        bytes_result = await self.accessor.acquire_content_result(
-            attributes = attributes )
-        mimetype = bytes_result.inode.mimetype
+        decoded = await self._acquire_content_mapped(
+            attributes, charset, Error )
+        if None is decoded:
+            bytes_result = await self.accessor.acquire_content_result(
+                attributes = attributes )
+            decoded = self._decode_content(
+                bytes_result.content, bytes_result.inode, charset, Error )
+        content_nl, inode = decoded
+        return __.AcquireContentTextResult(
+            content = content_nl, inode = inode )
+
+    async def acquire_content_lines(
+        self, *,
+        start_line: int = 1,
+        end_line: __.Absential[ int ] = __.absent,
+        bytes_maximum: __.Absential[ int ] = __.absent,
+        attributes: __.InodeAttributes = __.InodeAttributes.Nothing,
+    ) -> __.AcquireContentLinesResult:
+        ''' Returns inode and range of lines of file as Unicode string.
+
+            If newlines are normalized, as by default, then the range is
+            located with the line index of the file and only its bytes are
+            read and decoded. Otherwise, content is streamed and decoded
+            only until the range is complete. Lines keep their newlines. If
+            maximum size is given, then only whole lines, which fit within
+            it, as encoded, are returned, but at least one line, if any are
+            in range.
+        '''
+        start_line = max( start_line, 1 )
+        if self.newline in ( None, '\n' ):
+            result = await self._acquire_content_lines_indexed(
+                start_line, end_line, bytes_maximum, attributes )
+            if None is not result: return result
+        lines: list[ str ] = [ ]
+        lines_count = None
+        line_number = 0
+        size = 0
+        async with self.acquire_content_stream(
+            attributes = attributes
+        ) as stream:
+            charset = stream.inode.charset or 'utf-8'
+            async with __.ctxl.aclosing( _iterate_lines( stream ) ) as lines_:
+                async for line in lines_:
+                    line_number += 1
+                    if line_number < start_line: continue
+                    if not __.is_absent( end_line ) and line_number > end_line:
+                        break
+                    if not __.is_absent( bytes_maximum ):
+                        size += len( line.encode(
+                            charset, errors = self.charset_errors ) )
+                        if lines and size > bytes_maximum: break
+                    lines.append( line )
+                else: lines_count = line_number
+            inode = stream.inode
+        return __.AcquireContentLinesResult(
+            content = ''.join( lines ),
+            inode = inode,
+            start_line = start_line,
+            end_line = start_line + len( lines ) - 1,
+            lines_count = lines_count )
+
+    async def _acquire_content_mapped(
+        self,
+        attributes: __.InodeAttributes,
+        charset: __.typx.Optional[ str ],
+        Error: __.cabc.Callable[ ..., Exception ],
+    ) -> __.typx.Optional[ tuple[ str, __.Inode ] ]:
+        ''' Decodes memory-mapped content, if file can be mapped. '''
+        acquirer = getattr( self.accessor, 'acquire_content_mapping', None )
+        if None is acquirer: return None
+        async with __.ctxl.AsyncExitStack( ) as exits:
+            try:
+                view_result = await exits.enter_async_context(
+                    acquirer( attributes = attributes ) )
+            except __.LocationAcquireContentFailure: return None
+            # Pseudo-files, as in procfs or sysfs, report zero size but may
+            # have content, which can only be read.
+            if not len( view_result.content ): return None
+            return self._decode_content(
+                view_result.content, view_result.inode, charset, Error )
+
+    async def _acquire_content_lines_indexed(
+        self,
+        start_line: int,
+        end_line: __.Absential[ int ],
+        bytes_maximum: __.Absential[ int ],
+        attributes: __.InodeAttributes,
+    ) -> __.typx.Optional[ __.AcquireContentLinesResult ]:
+        Error = __.funct.partial(
+            __.LocationAcquireContentFailure, url = self.accessor.as_url( ) )
+        inode = await self.accessor.examine(
+            attributes = attributes | __.InodeAttributes.Mimetype )
+        mimetype = inode.mimetype
+        if not mimetype or not __.is_textual_mimetype( mimetype ):
+            reason = f"File content is not text. MIME Type: {mimetype!r}"
+            raise Error( reason = reason )
+        if '#DETECT#' == self.charset:
+            attributes |= __.InodeAttributes.Charset
+            charset = None
+        else: charset = self.charset
+        if charset and not __.is_line_indexable_charset( charset ):
+            return None
+        index = await __.line_indices.acquire( self.accessor )
+        lines_count = index.count_lines( )
+        end_line_ = _locate_end_line(
+            index, start_line, end_line, bytes_maximum )
+        start, end = index.locate_lines( start_line, end_line_ )
+        if start == end:
+            return __.AcquireContentLinesResult(
+                content = '',
+                inode = inode.with_attributes( charset = charset ),
+                start_line = start_line,
+                end_line = end_line_,
+                lines_count = lines_count )
+        result = await self.accessor.acquire_content_range(
+            start, end, attributes = attributes )
+        # Content may have changed since it was indexed.
+        if not index.is_current( result.inode ): return None
+        charset = charset or result.inode.charset
+        if not charset:
+            from locale import getpreferredencoding
+            charset = getpreferredencoding( )
+        if not __.is_line_indexable_charset( charset ): return None
+        try:
+            content = self._normalize_newlines(
+                str( result.content, charset, self.charset_errors ) )
+        except Exception as exc: raise Error( reason = str( exc ) ) from exc
+        return __.AcquireContentLinesResult(
+            content = content,
+            inode = result.inode.with_attributes(
+                mimetype = mimetype, charset = charset ),
+            start_line = start_line,
+            end_line = end_line_,
+            lines_count = lines_count )
+
+    def _decode_content(
+        self,
+        content: bytes | memoryview,
+        inode: __.Inode,
+        charset: __.typx.Optional[ str ],
+        Error: __.cabc.Callable[ ..., Exception ],
+    ) -> tuple[ str, __.Inode ]:
+        mimetype = inode.mimetype
         if not mimetype:
             reason = "File content MIME type is unavailable."
             raise Error( reason = reason )
         if not __.is_textual_mimetype( mimetype ):
             reason = f"File content is not text. MIME Type: {mimetype!r}"
             raise Error( reason = reason )
-        charset = charset or bytes_result.inode.charset
+        charset = charset or inode.charset
         if not charset:
             from locale import getpreferredencoding
             charset = getpreferredencoding( )
-        try:
-            content = bytes_result.content.decode(
-                charset, errors = self.charset_errors )
+        # Note: Decoded string is a copy, even of a memory-mapped buffer.
+        try: content_ = str( content, charset, self.charset_errors )
         except Exception as exc: raise Error( reason = str( exc ) ) from exc
-        try: content_nl = self._normalize_newlines( content )
+        try: content_nl = self._normalize_newlines( content_ )
         except Exception as exc: raise Error( reason = str( exc ) ) from exc
-        inode = bytes_result.inode.with_attributes( charset = charset )
-        return __.AcquireContentTextResult(
-            content = content_nl, inode = inode )
+        return content_nl, inode.with_attributes( charset = charset )
+
+    @__.ctxl.asynccontextmanager
+    async def acquire_content_stream(
+        self, *,
+        attributes: __.InodeAttributes = __.InodeAttributes.Nothing,
+        chunk_size: __.ContentChunkSizeArgument =
+            __.content_chunk_size_default,
+    ) -> __.cabc.AsyncIterator[ __.ContentStream ]:
+        Error = __.funct.partial(
+            __.LocationAcquireContentFailure, url = self.accessor.as_url( ) )
+        # MIME type and charset are determined from leading content below,
+        # since the byte stream can only substantiate them upon exhaustion.
+        attributes_ = attributes & ~(
+            __.InodeAttributes.Mimetype | __.InodeAttributes.Charset )
+        async with self.accessor.acquire_content_stream(
+            attributes = attributes_, chunk_size = chunk_size
+        ) as bytes_stream:
+            head = await _peek_content( bytes_stream, _probe_size )
+            inode = bytes_stream.inode
+            mimetype = inode.mimetype or __.detect_mimetype( head )
+            if not __.is_textual_mimetype( mimetype ):
+                reason = f"File content is not text. MIME Type: {mimetype!r}"
+                raise Error( reason = reason )
+            if '#DETECT#' == self.charset:
+                charset = (
+                    inode.charset
+                    or __.detect_charset( head, partial = True ) )
+            else: charset = self.charset or inode.charset
+            if not charset:
+                from locale import getpreferredencoding
+                charset = getpreferredencoding( )
+            try:
+                from codecs import getincrementaldecoder
+                decoder = getincrementaldecoder( charset )(
+                    errors = self.charset_errors )
+                normalizer = self._produce_newlines_normalizer( )
+            except Exception as exc:
+                raise Error( reason = str( exc ) ) from exc
+            chunks = _decode_chunks( head, bytes_stream, decoder, normalizer )
+            yield __.ContentStream(
+                chunks = _intercept_errors( chunks, Error ),
+                inode = inode.with_attributes(
+                    mimetype = mimetype, charset = charset ),
+                observer = _TextStreamObserver(
+                    bytes_stream = bytes_stream,
+                    mimetype = mimetype, charset = charset ) )
 
     async def update_content(
         self,
@@ -94,10 +278,7 @@ class FilePresenter( __.FilePresenter ):
             content_bytes, attributes = attributes, options = options )
         return inode.with_attributes( charset = charset )
 
-    # TODO: Streaming codecs for reduced memory footprint.
-    #       Not zero-copy, but can use constant-sized memory window.
-    #       For charset encoding/decoding and newlines
-    #       nativization/normalization.
+    # TODO: Streaming encoder and newlines nativization for updates.
 
     def _nativize_newlines( self, content: str ) -> str:
         match self.newline:
@@ -122,8 +303,117 @@ class FilePresenter( __.FilePresenter ):
                     .replace( '\r', '\r\n' ) )
             case _: raise __.NewlineSupportError( self.newline )
 
+    def _produce_newlines_normalizer(
+        self
+    ) -> __.cabc.Callable[ ..., str ]:
+        ''' Produces normalizer which is safe across chunk boundaries. '''
+        if '' == self.newline: return lambda content, final = False: content
+        if self.newline not in ( None, '\n', '\r', '\r\n' ):
+            raise __.NewlineSupportError( self.newline )
+        carriage_return = ''
+
+        def normalize( content: str, final: bool = False ) -> str:
+            nonlocal carriage_return
+            content = carriage_return + content
+            # Hold back trailing carriage return, since it may be the first
+            # half of a CR-LF pair, which is split across chunks.
+            if not final and content.endswith( '\r' ):
+                content, carriage_return = content[ : -1 ], '\r'
+            else: carriage_return = ''
+            return self._normalize_newlines( content )
+
+        return normalize
+
+
+class _TextStreamObserver( __.ContentStreamObserver ):
+    ''' Concludes text stream inode from underlying bytes stream. '''
+
+    def __init__(
+        self, bytes_stream: __.ContentStream, mimetype: str, charset: str
+    ):
+        self.bytes_stream = bytes_stream
+        self.mimetype = mimetype
+        self.charset = charset
+
+    def observe( self, chunk: str ) -> None: pass
+
+    def conclude( self, inode: __.Inode ) -> __.Inode:
+        return self.bytes_stream.inode.with_attributes(
+            mimetype = self.mimetype, charset = self.charset )
+
+
+async def prepare( auxdata: __.appcore.Globals ):
+    configuration = (
+        auxdata.configuration
+        .get( 'location-presenters', { } ).get( _module_name, { } ) )
+    __.line_indices.configure( configuration.get( 'line-indices', { } ) )
+
 
 async def register_defaults( ):
     for mimetype in ( 'text/*', ):
         if mimetype in __.file_presenters_registry: continue
         __.file_presenters_registry[ mimetype ] = FilePresenter
+
+
+async def _decode_chunks(
+    head: bytes,
+    chunks: __.cabc.AsyncIterator[ bytes ],
+    decoder: __.typx.Any,
+    normalizer: __.cabc.Callable[ ..., str ],
+) -> __.cabc.AsyncIterator[ str ]:
+    async for chunk in __.chain_async( ( head, ), chunks ):
+        if ( content := normalizer( decoder.decode( chunk ) ) ):
+            yield content
+    if ( content := normalizer( decoder.decode( b'', final = True ), True ) ):
+        yield content
+
+
+async def _intercept_errors(
+    chunks: __.cabc.AsyncIterator[ str ],
+    error_to_raise: __.typx.Callable[ ..., __.LocationOperateFailure ],
+) -> __.cabc.AsyncIterator[ str ]:
+    try:
+        async for chunk in chunks: yield chunk
+    except __.LocationOperateFailure: raise
+    except Exception as exc:
+        raise error_to_raise( reason = str( exc ) ) from exc
+
+
+async def _iterate_lines(
+    chunks: __.cabc.AsyncIterable[ str ]
+) -> __.cabc.AsyncIterator[ str ]:
+    ''' Yields lines, with their newlines, from normalized text chunks. '''
+    remainder = ''
+    async for chunk in chunks:
+        lines = ( remainder + chunk ).split( '\n' )
+        remainder = lines.pop( )
+        for line in lines: yield f"{line}\n"
+    if remainder: yield remainder
+
+
+def _locate_end_line(
+    index: __.LineIndex,
+    start_line: int,
+    end_line: __.Absential[ int ],
+    bytes_maximum: __.Absential[ int ],
+) -> int:
+    lines_count = index.count_lines( )
+    end_line_ = (
+        lines_count if __.is_absent( end_line )
+        else min( end_line, lines_count ) )
+    if not __.is_absent( bytes_maximum ) and start_line <= end_line_:
+        end_line_ = min(
+            end_line_, index.find_lines_within( start_line, bytes_maximum ) )
+    # End line precedes start line, if no lines are in range.
+    return max( end_line_, start_line - 1 )
+
+
+async def _peek_content(
+    stream: __.cabc.AsyncIterator[ bytes ], size: int
+) -> bytes:
+    ''' Reads at least size bytes from stream, unless it is exhausted. '''
+    head = bytearray( )
+    async for chunk in stream:
+        head.extend( chunk )
+        if len( head ) >= size: break
+    return bytes( head )
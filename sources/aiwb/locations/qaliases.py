@@ -28,11 +28,14 @@
 
 from .core import (
     AccessImplement as      LocationAccessImplement,
+    DirectoryEntry,
     FileUpdateOptions,
+    Inode,
     InodeAttributes,
     LocationSpecies,
     PossibleUrl,
     Url,
+    content_chunk_size_default as   location_content_chunk_size_default,
 )
 from .exceptions import *
 from .interfaces import (
@@ -42,7 +45,14 @@ from .interfaces import (
     FileAdapter,
     FileAccessor,
     FileCache,
+    Filter as               LocationFilter,
     SpecificAccessor as     SpecificLocationAccessor,
+    StagedContentUpdate,
+)
+from .lines import (
+    LineIndex,
+    is_line_indexable_charset,
+    line_indices,
 )
 from .registries import (
     adapter_from_url as             location_adapter_from_url,
@@ -57,3 +67,10 @@ from .registries import (
     text_file_presenter_from_accessor,
     text_file_presenter_from_url,
 )
+from .utilities import (
+    is_textual_mimetype,
+    update_contents_many as         update_location_contents_many,
+)
+from .watchers import (
+    directory_watchers as           location_directory_watchers,
+)
@@ -37,6 +37,11 @@ FilePresentersRegistry: __.typx.TypeAlias = (
 # TODO: Content filters versus dirent filters.
 FiltersRegistry: __.typx.TypeAlias = (
     __.accret.Dictionary[ str, type[ '_interfaces.Filter' ] ] )
+# TODO: Python 3.12: type statement for aliases
+FlightKey: __.typx.TypeAlias = __.cabc.Hashable
+
+
+_T = __.typx.TypeVar( '_T' )
 
 
 @__.typx.runtime_checkable
@@ -49,11 +54,93 @@ class _CacheProducer( __.typx.Protocol ):
         raise NotImplementedError
 
 
+class SingleFlightsStatistics( __.immut.DataclassObject ):
+    ''' Snapshot of statistics for single flights. '''
+
+    coalescences: int
+    flights: int
+    flights_count: int
+    serializations: int
+
+
+class SingleFlights:
+    ''' Registry of operations in flight, by key.
+
+        Concurrent requests for identical operations share one flight and
+        its outcome. Keys are usually tuples of operation name, location
+        URL, and arguments, such as inode attributes. Operations may also
+        be serialized by key, such as ingestions into cache locations.
+    '''
+    # TODO: Immutable instance attributes.
+
+    coalescences: int
+    flights: int
+    serializations: int
+
+    def __init__( self ):
+        self.coalescences = 0
+        self.flights = 0
+        self.serializations = 0
+        self._flights: dict[ FlightKey, __.asyncio.Future[ __.typx.Any ] ] = (
+            { } )
+        self._mutexes: dict[ FlightKey, tuple[ __.MutexAsync, int ] ] = { }
+
+    async def coalesce(
+        self,
+        key: FlightKey,
+        producer: __.cabc.Callable[ [ ], __.cabc.Awaitable[ _T ] ],
+    ) -> _T:
+        ''' Awaits flight for key, starting it with producer if none.
+
+            Cancellation of one requester does not cancel flight for others.
+        '''
+        flight = self._flights.get( key )
+        if None is not flight:
+            self.coalescences += 1
+            return await __.asyncio.shield( flight )
+        self.flights += 1
+        flight = __.asyncio.ensure_future( producer( ) )
+        self._flights[ key ] = flight
+
+        def conclude( flight_: __.asyncio.Future[ __.typx.Any ] ):
+            if self._flights.get( key ) is flight_: del self._flights[ key ]
+            # Outcome may have no requesters left to retrieve it.
+            if not flight_.cancelled( ): flight_.exception( )
+
+        flight.add_done_callback( conclude )
+        return await __.asyncio.shield( flight )
+
+    def report_statistics( self ) -> SingleFlightsStatistics:
+        ''' Reports counts of flights, coalescences, and serializations. '''
+        return SingleFlightsStatistics(
+            coalescences = self.coalescences,
+            flights = self.flights,
+            flights_count = len( self._flights ),
+            serializations = self.serializations )
+
+    @__.ctxl.asynccontextmanager
+    async def serialize(
+        self, key: FlightKey
+    ) -> __.cabc.AsyncIterator[ None ]:
+        ''' Excludes other holders of key for duration of context. '''
+        mutex, count = self._mutexes.get( key, ( None, 0 ) )
+        if None is mutex: mutex = __.MutexAsync( )
+        elif mutex.locked( ): self.serializations += 1
+        self._mutexes[ key ] = ( mutex, count + 1 )
+        try:
+            async with mutex: yield
+        finally:
+            mutex, count = self._mutexes[ key ]
+            if 1 == count: del self._mutexes[ key ]
+            else: self._mutexes[ key ] = ( mutex, count - 1 )
+
+
 # TODO: Use accretive validator dictionaries for registries.
 adapters_registry: AdaptersRegistry = __.accret.Dictionary( )
 caches_registry: CachesRegistry = __.accret.Dictionary( )
 file_presenters_registry: FilePresentersRegistry = __.accret.Dictionary( )
 filters_registry: FiltersRegistry = __.accret.Dictionary( )
+single_flights = SingleFlights( )
 
 
 def adapter_from_url( url: _core.PossibleUrl ) -> '_interfaces.GeneralAdapter':
@@ -23,6 +23,87 @@
 from . import __
 from . import core as _core
 from . import exceptions as _exceptions
+from . import interfaces as _interfaces
+
+
+_charset_window_size = 64 * 1024 # bytes
+_content_thread_threshold = 1024 * 1024 # bytes
+_mimetype_probe_size = 1024 * 1024 # bytes; libmagic default maximum
+_utf8_bom = b'\xef\xbb\xbf'
+
+
+class InodeAttributesAccumulator( _core.ContentStreamObserver ):
+    ''' Substantiates inode attributes incrementally over content stream.
+
+        Only retains bounded amounts of content, regardless of stream length.
+    '''
+    # TODO: Immutable instance attributes.
+
+    attributes: _core.InodeAttributes
+    error_to_raise: __.typx.Callable[
+        ..., _exceptions.LocationOperateFailure ]
+
+    def __init__(
+        self,
+        attributes: _core.InodeAttributes,
+        error_to_raise: __.typx.Callable[
+            ..., _exceptions.LocationOperateFailure ],
+    ):
+        Iattrs = _core.InodeAttributes
+        self.attributes = attributes
+        self.error_to_raise = error_to_raise
+        self._bytes_count = 0
+        self._head = bytearray( )
+        self._hasher = None
+        if Iattrs.ContentId & attributes:
+            from hashlib import sha256
+            self._hasher = sha256( )
+        self._charset_detector = None
+        if Iattrs.Charset & attributes:
+            self._charset_detector = _CharsetDetector( )
+
+    def observe( self, chunk: bytes ) -> None:
+        self._bytes_count += len( chunk )
+        if None is not self._hasher: self._hasher.update( chunk )
+        if (    _core.InodeAttributes.Mimetype & self.attributes
+            and len( self._head ) < _mimetype_probe_size
+        ):
+            self._head.extend(
+                chunk[ : _mimetype_probe_size - len( self._head ) ] )
+        detector = self._charset_detector
+        if None is not detector:
+            # Stream cannot be sampled later, so feed both detections now.
+            detector.validate( chunk )
+            detector.sample( chunk )
+
+    def conclude( self, inode: _core.Inode ) -> _core.Inode:
+        Iattrs = _core.InodeAttributes
+        attributes = self.attributes
+        bytes_count = inode.bytes_count
+        if (    Iattrs.BytesCount & attributes
+            and not isinstance( bytes_count, int ) # 0 is falsey
+        ): bytes_count = self._bytes_count
+        content_id = inode.content_id
+        if None is not self._hasher and not content_id:
+            content_id = "sha256:{}".format( self._hasher.hexdigest( ) )
+        mimetype = inode.mimetype
+        if Iattrs.Mimetype & attributes and not mimetype:
+            mimetype = detect_mimetype( bytes( self._head ) )
+        charset = inode.charset
+        if (    None is not self._charset_detector and not charset
+            and mimetype and is_textual_mimetype( mimetype, possible = True )
+        ):
+            # Detection may legitimately find nothing, as with empty content.
+            charset = self._charset_detector.conclude( )
+            attributes &= ~Iattrs.Charset
+        inode_ = inode.with_attributes(
+            bytes_count = bytes_count,
+            content_id = content_id,
+            mimetype = mimetype, charset = charset )
+        return honor_inode_attributes(
+            inode = inode_,
+            attributes = attributes,
+            error_to_raise = self.error_to_raise )
 
 
 def honor_inode_attributes(  # noqa: C901, PLR0912, PLR0915
@@ -30,15 +111,19 @@ def honor_inode_attributes(  # noqa: C901, PLR0912, PLR0915
     attributes: _core.InodeAttributes,
     error_to_raise: __.typx.Callable[
         ..., _exceptions.LocationOperateFailure ],
-    content: __.Absential[ bytes ] = __.absent,
+    content: __.Absential[ bytes | memoryview ] = __.absent,
+    partial: bool = False,
 ) -> _core.Inode:
-    ''' Honor requests for specific inode attributes. '''
+    ''' Honor requests for specific inode attributes.
+
+        Content may be partial, if it is only the head of a file.
+    '''
     # Note: This function is too long. Not seeing a good way to break it up.
     # TODO: Consider extracting attribute computation helpers, though
     #       sequential dependencies (charset→mimetype) complicate extraction.
     Iattrs = _core.InodeAttributes
     aname = None
-    if isinstance( content, bytes ):
+    if isinstance( content, bytes | memoryview ):
         have_content = True
         content_ = content
     else:
@@ -60,15 +145,13 @@ def honor_inode_attributes(  # noqa: C901, PLR0912, PLR0915
         else: aname = 'content_id'
     mimetype = inode.mimetype
     if not aname and Iattrs.Mimetype & attributes and not mimetype:
-        if have_content:
-            from magic import from_buffer
-            mimetype = from_buffer( content_, mime = True )
+        if have_content: mimetype = detect_mimetype( content_ )
         else: aname = 'mimetype'
     charset = inode.charset
     if not aname and Iattrs.Charset & attributes and not charset:
         if not mimetype: charset = None
         elif have_content and is_textual_mimetype( mimetype, possible = True ):
-            charset = _detect_charset( content_ )
+            charset = detect_charset( content_, partial = partial )
         else: aname = 'charset'
     mtime = inode.mtime
     if not aname and Iattrs.Mtime & attributes and not mtime:
@@ -86,6 +169,91 @@ def honor_inode_attributes(  # noqa: C901, PLR0912, PLR0915
         mtime = mtime, etime = etime )
 
 
+async def honor_inode_attributes_async(
+    inode: _core.Inode,
+    attributes: _core.InodeAttributes,
+    error_to_raise: __.typx.Callable[
+        ..., _exceptions.LocationOperateFailure ],
+    content: __.Absential[ bytes | memoryview ] = __.absent,
+) -> _core.Inode:
+    ''' Honor requests for specific inode attributes.
+
+        Detection over large content occurs in a worker thread, so that the
+        event loop is not blocked.
+    '''
+    honor = __.funct.partial(
+        honor_inode_attributes,
+        inode = inode,
+        attributes = attributes,
+        error_to_raise = error_to_raise,
+        content = content )
+    if (    isinstance( content, bytes | memoryview )
+        and len( content ) >= _content_thread_threshold
+    ): return await __.asyncio.to_thread( honor )
+    return honor( )
+
+
+def honor_inode_attributes_from_head(
+    inode: _core.Inode,
+    attributes: _core.InodeAttributes,
+    error_to_raise: __.typx.Callable[
+        ..., _exceptions.LocationOperateFailure ],
+    head: __.Absential[ bytes | memoryview ] = __.absent,
+) -> _core.Inode:
+    ''' Honor requests for inode attributes from leading content.
+
+        For partial acquisitions of content. MIME type and charset are
+        detected from head of content. Attributes, which depend on whole
+        content, must already be substantiated on the inode.
+    '''
+    attributes_head = attributes & (
+        _core.InodeAttributes.Mimetype | _core.InodeAttributes.Charset )
+    inode = honor_inode_attributes(
+        inode = inode,
+        attributes = attributes_head,
+        error_to_raise = error_to_raise,
+        content = head,
+        partial = True )
+    return honor_inode_attributes(
+        inode = inode,
+        attributes = attributes & ~attributes_head,
+        error_to_raise = error_to_raise )
+
+
+def detect_charset(
+    content: bytes | memoryview, partial: bool = False
+) -> str | None:
+    ''' Detects character set of content.
+
+        If content is partial, such as head of file, then an incomplete
+        multibyte sequence at its end does not invalidate UTF-8.
+
+        Valid UTF-8 is recognized by incremental strict decoding over
+        bounded windows, which is fast. Otherwise, bounded windows from the
+        beginning, middle, and end of content are fed to an incremental
+        detector, until it is confident. Hence, memory is bounded,
+        regardless of content length.
+    '''
+    detector = _CharsetDetector( )
+    content_ = memoryview( content )
+    size = _charset_window_size
+    for offset in range( 0, len( content_ ), size ):
+        if not detector.validate( content_[ offset : offset + size ] ): break
+    if detector.is_utf8( final = not partial ):
+        return detector.conclude( final = not partial )
+    for window in _sample_charset_windows( content_ ):
+        if not detector.sample( window ): break
+    return detector.conclude( final = not partial )
+
+
+def detect_mimetype( content: bytes | memoryview ) -> str:
+    ''' Detects MIME type of content from its leading bytes. '''
+    from magic import from_buffer
+    # Note: libmagic bindings require bytes rather than arbitrary buffers.
+    return from_buffer(
+        bytes( content[ : _mimetype_probe_size ] ), mime = True )
+
+
 def is_textual_mimetype( mimetype: str, possible: bool = False ) -> bool:
     if possible and 'application/octet-stream' == mimetype: return True
     if mimetype.startswith( 'text/' ): return True
@@ -107,13 +275,127 @@ def is_textual_mimetype( mimetype: str, possible: bool = False ) -> bool:
     return False
 
 
-def _detect_charset( content: bytes ) -> str | None:
-    from chardet import detect
-    charset = detect( content )[ 'encoding' ]
-    if None is charset: return charset
-    if not isinstance( charset, str ): return None
-    if charset.startswith( 'utf' ): return charset
-    # Shake out false positives, like 'ascii' or 'MacRoman'.
-    try: content.decode( 'utf-8' )
-    except UnicodeDecodeError: return charset
-    return 'utf-8'
+async def update_contents_many(
+    updates: __.cabc.Iterable[ tuple[ _interfaces.FileAccessor, bytes ] ],
+    attributes: _core.InodeAttributes = _core.InodeAttributes.Nothing,
+    options: _core.FileUpdateOptions = _core.FileUpdateOptions.Defaults,
+) -> tuple[ _core.Inode, ... ]:
+    ''' Updates contents of several files together. Returns inodes.
+
+        Updates are staged concurrently and then committed together. If any
+        update fails to stage, then none are committed. If any update fails
+        to commit, or if committing is cancelled, then those, which were
+        committed, are reverted, where their accessors allow. The first
+        error is raised.
+    '''
+    stagings = await __.asyncio.gather(
+        *(  accessor.stage_content(
+                content, attributes = attributes, options = options )
+            for accessor, content in updates ),
+        return_exceptions = True )
+    staged = tuple(
+        staging for staging in stagings
+        if not isinstance( staging, BaseException ) )
+    try:
+        _raise_first_error( stagings )
+        commits = __.asyncio.ensure_future( __.asyncio.gather(
+            *( staging.commit( ) for staging in staged ),
+            return_exceptions = True ) )
+        try: inodes = await __.asyncio.shield( commits )
+        except BaseException:
+            # Let commits settle, so that none lands after reversion.
+            await __.asyncio.wait( ( commits, ) )
+            await _revert_staged_updates( staged )
+            raise
+        if any( isinstance( inode, BaseException ) for inode in inodes ):
+            await _revert_staged_updates( staged )
+        _raise_first_error( inodes )
+    finally:
+        await __.asyncio.gather(
+            *( staging.discard( ) for staging in staged ),
+            return_exceptions = True )
+    return __.typx.cast( tuple[ _core.Inode, ... ], tuple( inodes ) )
+
+
+def _raise_first_error( results: __.cabc.Sequence[ __.typx.Any ] ):
+    for result in results:
+        if isinstance( result, BaseException ): raise result
+
+
+async def _revert_staged_updates(
+    staged: __.cabc.Sequence[ _interfaces.StagedContentUpdate ]
+) -> None:
+    # Reversion of uncommitted update does nothing.
+    await __.asyncio.gather(
+        *( staging.revert( ) for staging in staged ),
+        return_exceptions = True )
+
+
+def _sample_charset_windows(
+    content: bytes | memoryview
+) -> __.cabc.Iterator[ bytes | memoryview ]:
+    size = _charset_window_size
+    if len( content ) <= 3 * size:
+        yield content
+        return
+    yield content[ : size ]
+    # Align to code units of multibyte encodings, such as UTF-32.
+    middle = ( len( content ) - size ) // 2 & ~3
+    yield content[ middle : middle + size ]
+    suffix = len( content ) - size & ~3
+    yield content[ suffix : ]
+
+
+class _CharsetDetector:
+    ''' Detects character set incrementally over chunks of content.
+
+        Strict UTF-8 validation is preferred over statistical detection.
+    '''
+    # TODO: Immutable instance attributes.
+
+    def __init__( self ):
+        from codecs import getincrementaldecoder
+        self.bytes_count = 0
+        self.head = b''
+        self.nulls = False
+        self.sampler: __.typx.Any = None
+        self.validator: __.typx.Any = getincrementaldecoder( 'utf-8' )( )
+
+    def conclude( self, final: bool = True ) -> str | None:
+        ''' Concludes detection over content fed thus far. '''
+        # Empty content has no detectable character set.
+        if not self.bytes_count: return None
+        if _utf8_bom == self.head: return 'utf-8-sig'
+        if self.is_utf8( final = final ): return 'utf-8'
+        if None is self.sampler: return None
+        self.sampler.close( )
+        charset = self.sampler.result[ 'encoding' ]
+        if not isinstance( charset, str ): return None
+        return charset
+
+    def is_utf8( self, final: bool = True ) -> bool:
+        ''' Is content valid UTF-8? Final, only after all is fed. '''
+        if final and None is not self.validator:
+            try: self.validator.decode( b'', final = True )
+            except UnicodeDecodeError: self.validator = None
+        # Nulls suggest UTF-16 or UTF-32 without byte order mark.
+        return None is not self.validator and not self.nulls
+
+    def sample( self, chunk: bytes | memoryview ) -> bool:
+        ''' Feeds statistical detector. Returns whether it needs more. '''
+        if None is self.sampler:
+            from chardet import UniversalDetector
+            self.sampler = UniversalDetector( )
+        if not self.sampler.done: self.sampler.feed( bytes( chunk ) )
+        return not self.sampler.done
+
+    def validate( self, chunk: bytes | memoryview ) -> bool:
+        ''' Validates chunk as UTF-8. Returns whether still valid. '''
+        remainder = len( _utf8_bom ) - len( self.head )
+        if remainder > 0: self.head += bytes( chunk[ : remainder ] )
+        self.bytes_count += len( chunk )
+        if None is self.validator: return False
+        if not self.nulls: self.nulls = 0 in chunk
+        try: self.validator.decode( chunk )
+        except UnicodeDecodeError: self.validator = None
+        return None is not self.validator
@@ -0,0 +1,666 @@
+# vim: set filetype=python fileencoding=utf-8:
+# -*- coding: utf-8 -*-
+
+#============================================================================#
+#                                                                            #
+#  Licensed under the Apache License, Version 2.0 (the "License");           #
+#  you may not use this file except in compliance with the License.          #
+#  You may obtain a copy of the License at                                   #
+#                                                                            #
+#      http://www.apache.org/licenses/LICENSE-2.0                            #
+#                                                                            #
+#  Unless required by applicable law or agreed to in writing, software       #
+#  distributed under the License is distributed on an "AS IS" BASIS,         #
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  #
+#  See the License for the specific language governing permissions and       #
+#  limitations under the License.                                            #
+#                                                                            #
+#============================================================================#
+
+
+''' Watchers of local directory trees, with in-memory survey indices.
+
+    While a directory tree is watched, surveys of its directories and
+    contents of its files are remembered and are invalidated, entry by
+    entry, as filesystem events arrive. Subscribers are notified of
+    altered paths. Events come from inotify, on Linux, else from periodic
+    polling of the tree.
+'''
+
+
+from collections import OrderedDict as _OrderedDict
+from os import stat_result as _StatResult
+
+from . import __
+from . import core as _core
+
+
+# TODO: Python 3.12: type statement for aliases
+WatchSubscriber: __.typx.TypeAlias = __.cabc.Callable[
+    [ frozenset[ __.Path ] ],
+    __.cabc.Coroutine[ __.typx.Any, __.typx.Any, None ] ]
+
+
+_content_bytes_maximum = 1024 ** 2 # per file
+_contents_bytes_maximum_default = 64 * 1024 ** 2
+_notification_delay = 0.05 # seconds; coalesces bursts of events
+_poll_interval_default = 2.0 # seconds
+_scribe = __.acquire_scribe( __package__ )
+
+
+class WatchBackends( __.enum.Enum ): # TODO: Python 3.11: StrEnum
+    ''' Source of filesystem events for directory watchers. '''
+
+    Automatic = 'automatic'
+    Inotify =   'inotify'
+    Polling =   'polling'
+
+
+class SurveyIndexStatistics( __.immut.DataclassObject ):
+    ''' Snapshot of usage statistics for survey index. '''
+
+    contents_bytes_count: int
+    contents_count: int
+    directories_count: int
+    hits: int
+    invalidations: int
+    misses: int
+
+
+class SurveyIndex:
+    ''' Remembers statuses of directory entries and contents of files.
+
+        Statuses are kept per directory, by entry name. Entries, which are
+        altered, keep their names with unknown statuses until they are
+        next restated; removed entries are restated as absent. Contents of
+        small files are kept, up to a total size, and are discarded, least
+        recently used first, beyond that size.
+    '''
+    # TODO: Immutable instance attributes.
+
+    contents: _OrderedDict[ str, tuple[ _StatResult, bytes ] ]
+    contents_bytes_count: int
+    contents_bytes_maximum: int
+    directories: dict[
+        str, dict[ str, __.typx.Optional[ _StatResult ] ] ]
+    hits: int
+    invalidations: int
+    misses: int
+
+    def __init__(
+        self, contents_bytes_maximum: int = _contents_bytes_maximum_default
+    ):
+        self.contents = _OrderedDict( )
+        self.contents_bytes_count = 0
+        self.contents_bytes_maximum = contents_bytes_maximum
+        self.directories = { }
+        self.hits = 0
+        self.invalidations = 0
+        self.misses = 0
+        self._generations: dict[ str, int ] = { }
+
+    def clear( self ):
+        ''' Forgets everything. '''
+        self.contents.clear( )
+        self.contents_bytes_count = 0
+        self.directories.clear( )
+        self._generations.clear( )
+        self.invalidations += 1
+
+    def invalidate_entry( self, directory: str, name: str ):
+        ''' Forgets status of directory entry and anything beneath it. '''
+        self._advance_generation( directory )
+        statuses = self.directories.get( directory )
+        if None is not statuses: statuses[ name ] = None
+        self._forget_tree( __.os.path.join( directory, name ) )
+
+    def invalidate_tree( self, directory: str ):
+        ''' Forgets directory and anything beneath it. '''
+        self._advance_generation( directory )
+        self._forget_tree( directory )
+
+    def memoize_content(
+        self,
+        location: str,
+        stat: _StatResult,
+        content: bytes,
+        generation: int,
+    ):
+        ''' Remembers content of file, if small enough.
+
+            Content is discarded, if directory of file was altered since the
+            generation, which was current before content was read.
+        '''
+        if len( content ) > _content_bytes_maximum: return
+        directory = __.os.path.dirname( location )
+        if generation != self.produce_generation( directory ): return
+        self._forget_content( location )
+        self.contents[ location ] = ( stat, content )
+        self.contents_bytes_count += len( content )
+        while self.contents_bytes_count > self.contents_bytes_maximum:
+            _, ( _, content_ ) = self.contents.popitem( last = False )
+            self.contents_bytes_count -= len( content_ )
+
+    def memoize_directory(
+        self,
+        directory: str,
+        statuses: __.cabc.Mapping[ str, __.typx.Optional[ _StatResult ] ],
+        generation: int,
+    ):
+        ''' Remembers statuses of directory entries.
+
+            Statuses are discarded, if directory was altered since the
+            generation, which was current before they were gathered.
+        '''
+        if generation != self.produce_generation( directory ): return
+        statuses_ = self.directories.setdefault( directory, { } )
+        statuses_.update( statuses )
+        for name, stat in statuses.items( ):
+            if None is stat: del statuses_[ name ]
+
+    def produce_generation( self, directory: str ) -> int:
+        ''' Returns count of alterations to directory, since watched. '''
+        return self._generations.get( directory, 0 )
+
+    def recall_content(
+        self, location: str
+    ) -> __.typx.Optional[ tuple[ _StatResult, bytes ] ]:
+        ''' Returns status and content of file, if remembered.
+
+            File is restated first, since notifications of its alteration
+            may not have arrived yet. Stale content is forgotten.
+        '''
+        record = self.contents.get( location )
+        if (    None is not record
+            and not _is_status_current( location, record[ 0 ] )
+        ):
+            self._forget_content( location )
+            record = None
+        if None is record:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.contents.move_to_end( location )
+        return record
+
+    def recall_directory(
+        self, directory: str
+    ) -> __.typx.Optional[
+        __.cabc.Mapping[ str, __.typx.Optional[ _StatResult ] ]
+    ]:
+        ''' Returns statuses of directory entries, if remembered.
+
+            Unknown statuses must be restated by the caller.
+        '''
+        statuses = self.directories.get( directory )
+        if None is statuses: self.misses += 1
+        else: self.hits += 1
+        return statuses
+
+    def report_statistics( self ) -> SurveyIndexStatistics:
+        ''' Reports counts of remembered directories and contents. '''
+        return SurveyIndexStatistics(
+            contents_bytes_count = self.contents_bytes_count,
+            contents_count = len( self.contents ),
+            directories_count = len( self.directories ),
+            hits = self.hits,
+            invalidations = self.invalidations,
+            misses = self.misses )
+
+    def _advance_generation( self, directory: str ):
+        self._generations[ directory ] = (
+            self._generations.get( directory, 0 ) + 1 )
+        self.invalidations += 1
+
+    def _forget_content( self, location: str ):
+        record = self.contents.pop( location, None )
+        if None is record: return
+        self.contents_bytes_count -= len( record[ 1 ] )
+
+    def _forget_tree( self, location: str ):
+        self._forget_content( location )
+        self.directories.pop( location, None )
+        prefix = __.os.path.join( location, '' )
+        for directory in tuple( self.directories ):
+            if directory.startswith( prefix ):
+                del self.directories[ directory ]
+        for location_ in tuple( self.contents ):
+            if location_.startswith( prefix ):
+                self._forget_content( location_ )
+
+
+class DirectoryWatcher:
+    ''' Watches local directory tree for alterations.
+
+        Maintains survey index for the tree and notifies subscribers of
+        altered paths, in batches.
+    '''
+    # TODO: Immutable instance attributes.
+
+    index: SurveyIndex
+    location: __.Path
+    subscribers: list[ WatchSubscriber ]
+
+    def __init__(
+        self,
+        location: __.Path,
+        contents_bytes_maximum: int = _contents_bytes_maximum_default,
+    ):
+        self.index = SurveyIndex(
+            contents_bytes_maximum = contents_bytes_maximum )
+        self.location = location
+        self.subscribers = [ ]
+        self._alterations: set[ __.Path ] = set( )
+        self._backend: __.typx.Optional[ _Backend ] = None
+        self._notifier: __.typx.Optional[ __.asyncio.Task[ None ] ] = None
+
+    async def close( self ):
+        ''' Stops watching and forgets index. '''
+        if None is not self._backend:
+            await self._backend.close( )
+            self._backend = None
+        if None is not self._notifier:
+            self._notifier.cancel( )
+            await __.asyncio.gather( self._notifier, return_exceptions = True )
+        self.index.clear( )
+
+    async def start(
+        self,
+        backend: WatchBackends = WatchBackends.Automatic,
+        poll_interval: float = _poll_interval_default,
+    ):
+        ''' Starts watching with backend, falling back to polling. '''
+        if (    WatchBackends.Polling is not backend
+            and _InotifyBackend.is_usable( )
+        ):
+            backend_ = _InotifyBackend( self )
+            try: await backend_.start( )
+            except OSError as exc:
+                await backend_.close( )
+                if WatchBackends.Inotify is backend: raise
+                _scribe.warning(
+                    f"Could not watch '{self.location}' with inotify. "
+                    f"Polling instead. Reason: {exc}" )
+            else:
+                self._backend = backend_
+                return
+        elif WatchBackends.Inotify is backend:
+            from .exceptions import LocationWatchFailure
+            reason = "Inotify is not available on this platform."
+            raise LocationWatchFailure( url = self.location, reason = reason )
+        backend__ = _PollingBackend( self, interval = poll_interval )
+        await backend__.start( )
+        self._backend = backend__
+
+    def _observe_entry( self, directory: str, name: str ):
+        self.index.invalidate_entry( directory, name )
+        self._notify( __.Path( directory, name ) )
+
+    def _observe_overflow( self ):
+        self.index.clear( )
+        self._notify( self.location )
+
+    def _observe_tree( self, directory: str ):
+        self.index.invalidate_tree( directory )
+        self._notify( __.Path( directory ) )
+
+    def _notify( self, location: __.Path ):
+        if not self.subscribers: return
+        self._alterations.add( location )
+        if None is not self._notifier and not self._notifier.done( ): return
+        self._notifier = __.asyncio.create_task( self._notify_subscribers( ) )
+
+    async def _notify_subscribers( self ):
+        await __.asyncio.sleep( _notification_delay )
+        alterations = frozenset( self._alterations )
+        self._alterations.clear( )
+        results = await __.asyncio.gather(
+            *( subscriber( alterations )
+               for subscriber in tuple( self.subscribers ) ),
+            return_exceptions = True )
+        for result in results:
+            if not isinstance( result, Exception ): continue
+            _scribe.warning(
+                f"Could not notify subscriber of alterations "
+                f"in '{self.location}'. Reason: {result}" )
+
+
+class DirectoryWatchersStatistics( __.immut.DataclassObject ):
+    ''' Snapshot of statistics for directory watchers. '''
+
+    indices: __.cabc.Mapping[ str, SurveyIndexStatistics ]
+    watchers_count: int
+
+
+class DirectoryWatchers:
+    ''' Registry of directory watchers, shared by watched locations.
+
+        Watchers are started on first watch of a location and are closed
+        after last watch of it ends. Locations beneath watched locations
+        share their watchers.
+    '''
+    # TODO: Immutable instance attributes.
+
+    backend: WatchBackends
+    contents_bytes_maximum: int
+    enabled: bool
+    poll_interval: float
+    watchers: dict[ __.Path, DirectoryWatcher ]
+
+    def __init__( self ):
+        self.backend = WatchBackends.Automatic
+        self.contents_bytes_maximum = _contents_bytes_maximum_default
+        self.enabled = True
+        self.poll_interval = _poll_interval_default
+        self.watchers = { }
+        self._mutex = __.MutexAsync( )
+        self._references: dict[ __.Path, int ] = { }
+
+    async def close( self ):
+        ''' Closes all watchers. '''
+        watchers = tuple( self.watchers.values( ) )
+        self.watchers.clear( )
+        self._references.clear( )
+        await __.asyncio.gather(
+            *( watcher.close( ) for watcher in watchers ),
+            return_exceptions = True )
+
+    def configure( self, configuration: __.cabc.Mapping[ str, __.typx.Any ] ):
+        ''' Applies configuration to watchers started hereafter. '''
+        self.backend = WatchBackends(
+            configuration.get( 'backend', WatchBackends.Automatic.value ) )
+        self.contents_bytes_maximum = int( configuration.get(
+            'contents-bytes-maximum', _contents_bytes_maximum_default ) )
+        self.enabled = bool( configuration.get( 'enable', True ) )
+        self.poll_interval = float( configuration.get(
+            'poll-interval', _poll_interval_default ) )
+
+    def find(
+        self, location: __.Path
+    ) -> __.typx.Optional[ DirectoryWatcher ]:
+        ''' Returns watcher for location, if location is watched. '''
+        if not self.watchers: return None
+        location = __.Path( __.os.path.abspath( location ) )
+        for location_ in ( location, *location.parents ):
+            watcher = self.watchers.get( location_ )
+            if None is not watcher: return watcher
+        return None
+
+    def report_statistics( self ) -> DirectoryWatchersStatistics:
+        ''' Reports statistics of index for each watched location. '''
+        return DirectoryWatchersStatistics(
+            indices = {
+                str( location ): watcher.index.report_statistics( )
+                for location, watcher in self.watchers.items( ) },
+            watchers_count = len( self.watchers ) )
+
+    @__.ctxl.asynccontextmanager
+    async def watch(
+        self,
+        url: _core.PossibleUrl,
+        subscriber: __.Absential[ WatchSubscriber ] = __.absent,
+    ) -> __.cabc.AsyncIterator[ __.typx.Optional[ DirectoryWatcher ] ]:
+        ''' Watches local directory tree for duration of context.
+
+            Provides nothing, if watchers are disabled or location is not
+            local. Subscriber, if supplied, is notified of altered paths
+            for duration of context.
+        '''
+        url_ = _core.Url.from_url( url )
+        if not self.enabled or url_.scheme not in ( '', 'file' ):
+            yield None
+            return
+        location = __.Path( __.os.path.abspath( url_.path ) )
+        watcher = await self._acquire( location )
+        if not __.is_absent( subscriber ):
+            watcher.subscribers.append( subscriber )
+        try: yield watcher
+        finally:
+            if not __.is_absent( subscriber ):
+                watcher.subscribers.remove( subscriber )
+            await self._release( location )
+
+    async def _acquire( self, location: __.Path ) -> DirectoryWatcher:
+        async with self._mutex:
+            watcher = self.watchers.get( location )
+            if None is watcher:
+                watcher = DirectoryWatcher(
+                    location,
+                    contents_bytes_maximum = self.contents_bytes_maximum )
+                await watcher.start(
+                    backend = self.backend,
+                    poll_interval = self.poll_interval )
+                self.watchers[ location ] = watcher
+            self._references[ location ] = (
+                self._references.get( location, 0 ) + 1 )
+            return watcher
+
+    async def _release( self, location: __.Path ):
+        async with self._mutex:
+            self._references[ location ] -= 1
+            if self._references[ location ]: return
+            del self._references[ location ]
+            watcher = self.watchers.pop( location )
+        await watcher.close( )
+
+
+directory_watchers = DirectoryWatchers( )
+
+
+class _Backend( __.typx.Protocol ):
+
+    async def close( self ): raise NotImplementedError
+
+    async def start( self ): raise NotImplementedError
+
+
+class _InotifyBackend:
+    ''' Receives events for directory tree from inotify, on Linux. '''
+    # TODO: Immutable instance attributes.
+
+    def __init__( self, watcher: DirectoryWatcher ):
+        self.watcher = watcher
+        self._descriptor = -1
+        self._directories: dict[ int, str ] = { }
+        self._loop: __.typx.Optional[ __.asyncio.AbstractEventLoop ] = None
+
+    @classmethod
+    def is_usable( selfclass ) -> bool:
+        ''' Is inotify available on this platform? '''
+        if not __.sys.platform.startswith( 'linux' ): return False
+        return hasattr( _acquire_libc( ), 'inotify_init1' )
+
+    async def close( self ):
+        if 0 > self._descriptor: return
+        if None is not self._loop:
+            self._loop.remove_reader( self._descriptor )
+        __.os.close( self._descriptor )
+        self._descriptor = -1
+        self._directories.clear( )
+
+    async def start( self ):
+        libc = _acquire_libc( )
+        descriptor = libc.inotify_init1( __.os.O_NONBLOCK | __.os.O_CLOEXEC )
+        if 0 > descriptor: raise _error_from_errno( )
+        self._descriptor = descriptor
+        await __.asyncio.to_thread( self._watch_tree, self.watcher.location )
+        self._loop = __.asyncio.get_running_loop( )
+        self._loop.add_reader( descriptor, self._receive )
+
+    def _receive( self ):
+        try: data = __.os.read( self._descriptor, _inotify_buffer_size )
+        except BlockingIOError: return
+        offset = 0
+        while offset < len( data ):
+            descriptor, mask, _, size = _inotify_event_header.unpack_from(
+                data, offset )
+            offset += _inotify_event_header.size
+            name = __.os.fsdecode(
+                data[ offset : offset + size ].rstrip( b'\0' ) )
+            offset += size
+            self._dispatch( descriptor, mask, name )
+
+    def _dispatch( self, descriptor: int, mask: int, name: str ):
+        if _IN_Q_OVERFLOW & mask:
+            self.watcher._observe_overflow( )  # noqa: SLF001
+            return
+        directory = self._directories.get( descriptor )
+        if None is directory: return
+        if _IN_IGNORED & mask:
+            del self._directories[ descriptor ]
+            return
+        if ( _IN_DELETE_SELF | _IN_MOVE_SELF ) & mask:
+            self.watcher._observe_tree( directory )  # noqa: SLF001
+            return
+        self.watcher._observe_entry( directory, name )  # noqa: SLF001
+        if _IN_ISDIR & mask and ( _IN_CREATE | _IN_MOVED_TO ) & mask:
+            self._watch_arrival( __.Path( directory, name ) )
+
+    def _watch_arrival( self, location: __.Path ):
+        # Entries may arrive in new directory before it is watched.
+        try: locations = self._watch_tree( location )
+        except OSError as exc:
+            _scribe.warning(
+                f"Could not watch '{location}'. Reason: {exc}" )
+            return
+        for location_ in locations:
+            self.watcher._observe_entry(  # noqa: SLF001
+                str( location_.parent ), location_.name )
+
+    def _watch_tree( self, location: __.Path ) -> list[ __.Path ]:
+        libc = _acquire_libc( )
+        locations: list[ __.Path ] = [ ]
+        for base, directories, names in __.os.walk( location ):
+            descriptor = libc.inotify_add_watch(
+                self._descriptor, __.os.fsencode( base ), _inotify_mask )
+            if 0 > descriptor:
+                error = _error_from_errno( )
+                # Directories may vanish while walking.
+                if isinstance( error, FileNotFoundError ): continue
+                raise error
+            self._directories[ descriptor ] = base
+            locations.extend(
+                __.Path( base, name ) for name in ( *directories, *names ) )
+        return locations
+
+
+class _PollingBackend:
+    ''' Compares statuses of entries in directory tree periodically. '''
+    # TODO: Immutable instance attributes.
+
+    def __init__( self, watcher: DirectoryWatcher, interval: float ):
+        self.interval = interval
+        self.watcher = watcher
+        self._snapshot: dict[ str, dict[ str, tuple[ int, ... ] ] ] = { }
+        self._task: __.typx.Optional[ __.asyncio.Task[ None ] ] = None
+
+    async def close( self ):
+        if None is self._task: return
+        self._task.cancel( )
+        await __.asyncio.gather( self._task, return_exceptions = True )
+        self._task = None
+
+    async def start( self ):
+        self._snapshot = await __.asyncio.to_thread(
+            _snapshot_tree, self.watcher.location )
+        self._task = __.asyncio.create_task( self._poll( ) )
+
+    async def _poll( self ):
+        while True:
+            await __.asyncio.sleep( self.interval )
+            try:
+                snapshot = await __.asyncio.to_thread(
+                    _snapshot_tree, self.watcher.location )
+            except OSError as exc:
+                _scribe.warning(
+                    f"Could not poll '{self.watcher.location}'. "
+                    f"Reason: {exc}" )
+                continue
+            self._compare( snapshot )
+            self._snapshot = snapshot
+
+    def _compare(
+        self, snapshot: dict[ str, dict[ str, tuple[ int, ... ] ] ]
+    ):
+        watcher = self.watcher
+        for directory, statuses in self._snapshot.items( ):
+            statuses_ = snapshot.get( directory )
+            if None is statuses_:
+                watcher._observe_tree( directory )  # noqa: SLF001
+                continue
+            for name in statuses.keys( ) | statuses_.keys( ):
+                if statuses.get( name ) == statuses_.get( name ): continue
+                watcher._observe_entry( directory, name )  # noqa: SLF001
+        for directory in snapshot.keys( ) - self._snapshot.keys( ):
+            for name in snapshot[ directory ]:
+                watcher._observe_entry( directory, name )  # noqa: SLF001
+
+
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_DONT_FOLLOW = 0x02000000
+_IN_EXCL_UNLINK = 0x04000000
+_IN_ISDIR = 0x40000000
+_inotify_buffer_size = 64 * 1024
+_inotify_mask = (
+        _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE
+    |   _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+    |   _IN_DELETE_SELF | _IN_MOVE_SELF
+    |   _IN_ONLYDIR | _IN_DONT_FOLLOW | _IN_EXCL_UNLINK )
+
+
+def _acquire_libc( ) -> __.typx.Any:
+    from ctypes import CDLL
+    from ctypes.util import find_library
+    return CDLL( find_library( 'c' ), use_errno = True )
+
+
+def _error_from_errno( ) -> OSError:
+    from ctypes import get_errno
+    errno = get_errno( )
+    return OSError( errno, __.os.strerror( errno ) )
+
+
+def _is_status_current( location: str, stat: _StatResult ) -> bool:
+    # Status follows indirections, as does status of opened file.
+    try: stat_ = __.os.stat( location )
+    except OSError: return False
+    return (
+            stat.st_ino == stat_.st_ino
+        and stat.st_size == stat_.st_size
+        and stat.st_mtime_ns == stat_.st_mtime_ns
+        and stat.st_ctime_ns == stat_.st_ctime_ns )
+
+
+def _produce_inotify_event_header( ) -> __.typx.Any:
+    from struct import Struct
+    return Struct( 'iIII' )
+
+
+_inotify_event_header = _produce_inotify_event_header( )
+
+
+def _snapshot_tree(
+    location: __.Path
+) -> dict[ str, dict[ str, tuple[ int, ... ] ] ]:
+    snapshot: dict[ str, dict[ str, tuple[ int, ... ] ] ] = { }
+    for base, directories, names in __.os.walk( location ):
+        statuses: dict[ str, tuple[ int, ... ] ] = { }
+        for name in ( *directories, *names ):
+            try: stat = __.os.lstat( __.os.path.join( base, name ) )
+            except FileNotFoundError: continue
+            statuses[ name ] = (
+                stat.st_mode, stat.st_ino, stat.st_size,
+                stat.st_mtime_ns, stat.st_ctime_ns )
+        snapshot[ base ] = statuses
+    return snapshot
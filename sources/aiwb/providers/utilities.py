@@ -179,14 +179,17 @@ async def memcache_acquire_models(
 _models_integrators_caches: __.cabc.MutableMapping[
     str, _core.ModelsIntegratorsByGenusMutable
 ] = { }
+_models_integrators_watches: set[ str ] = set( )
 async def memcache_acquire_models_integrators(
     auxdata: __.CoreGlobals,
     provider: _interfaces.Provider,
     force: bool = False,
 ) -> _core.ModelsIntegratorsByGenus:
-    ''' Caches models integrators in memory, as necessary. '''
-    # TODO: Register watcher on package data directory to flag updates.
-    #       Maybe 'watchfiles.awatch' as asyncio callback with this function.
+    ''' Caches models integrators in memory, as necessary.
+
+        Cache for provider is cleared whenever its package data directory
+        is altered, so that next access reloads the integrators.
+    '''
     name = provider.name
     if name not in _models_integrators_caches:
         _models_integrators_caches[ name ] = { }
@@ -199,6 +202,7 @@ async def memcache_acquire_models_integrators(
             for genus, integrators
             in ( await acquire_models_integrators( auxdata, name ) ).items( )
         } )
+        await _watch_provider_data( auxdata, name )
     return __.types.MappingProxyType( cache )
 
 
@@ -274,3 +278,22 @@ async def _memcache_acquire_models(
             models_by_genus[ genus ].append( model )
     return tuple( __.chain.from_iterable(
         models_by_genus[ genus ] for genus in genera ) )
+
+
+async def _watch_provider_data( auxdata: __.CoreGlobals, name: str ):
+    if name in _models_integrators_watches: return
+    _models_integrators_watches.add( name )
+    directory = auxdata.distribution.provide_data_location( 'providers', name )
+
+    async def flag_updates( locations: __.cabc.Set[ __.Path ] ):
+        _models_integrators_caches[ name ].clear( )
+
+    try:
+        await auxdata.exits.enter_async_context(
+            __.location_directory_watchers.watch(
+                directory, subscriber = flag_updates ) )
+    except ( __.LocationWatchFailure, OSError ) as exc:
+        auxdata.notifications.enqueue_apprisal(
+            summary = f"Cannot watch data for provider {name!r}.",
+            exception = exc,
+            scribe = __.acquire_scribe( __package__ ) )
@@ -0,0 +1,102 @@
+# vim: set filetype=python fileencoding=utf-8:
+# -*- coding: utf-8 -*-
+
+#============================================================================#
+#                                                                            #
+#  Licensed under the Apache License, Version 2.0 (the "License");           #
+#  you may not use this file except in compliance with the License.          #
+#  You may obtain a copy of the License at                                   #
+#                                                                            #
+#      http://www.apache.org/licenses/LICENSE-2.0                            #
+#                                                                            #
+#  Unless required by applicable law or agreed to in writing, software       #
+#  distributed under the License is distributed on an "AS IS" BASIS,         #
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  #
+#  See the License for the specific language governing permissions and       #
+#  limitations under the License.                                            #
+#                                                                            #
+#============================================================================#
+
+
+''' Assert correct function of locations. '''
+
+
+from asyncio import run
+
+
+def test_100_text_presenter_reads_local_file( tmp_path ):
+    ''' Text presenter reads content of local file. '''
+    from aiwb import locations
+    location = tmp_path / 'content.txt'
+    location.write_text( 'Hello, world!\n', encoding = 'utf-8' )
+
+    async def acquire_content( ):
+        await locations.register_defaults( )
+        presenter = locations.text_file_presenter_from_url( location )
+        return await presenter.acquire_content( )
+
+    assert 'Hello, world!\n' == run( acquire_content( ) )
+
+
+def test_110_update_content_replaces_atomically( tmp_path ):
+    ''' Updated file is replaced whole; prior readers keep prior content. '''
+    from aiwb import locations
+    location = tmp_path / 'content.txt'
+    location.write_bytes( b'prior\n' )
+
+    async def update_content( ):
+        await locations.register_defaults( )
+        adapter = locations.file_adapter_from_url( location )
+        with location.open( 'rb' ) as stream:
+            await adapter.update_content( b'posterior\n' )
+            return stream.read( )
+
+    assert b'prior\n' == run( update_content( ) )
+    assert b'posterior\n' == location.read_bytes( )
+    assert [ location ] == list( tmp_path.iterdir( ) )
+
+
+def test_111_failed_update_leaves_no_temporary_file( tmp_path ):
+    ''' Failed update leaves file intact and no temporary sibling. '''
+    from pytest import raises
+    from aiwb import locations
+    location = tmp_path / 'content.txt'
+    location.write_bytes( b'prior\n' )
+
+    async def produce_chunks( ):
+        yield b'partial'
+        raise RuntimeError( 'interrupted' )
+
+    async def update_content( ):
+        await locations.register_defaults( )
+        adapter = locations.file_adapter_from_url( location )
+        await adapter.update_content_stream( produce_chunks( ) )
+
+    with raises( locations.LocationOperateFailure ):
+        run( update_content( ) )
+    assert b'prior\n' == location.read_bytes( )
+    assert [ location ] == list( tmp_path.iterdir( ) )
+
+
+def test_112_update_contents_many_reverts_on_failure( tmp_path ):
+    ''' Committed updates are reverted, if any update fails to commit. '''
+    from pytest import raises
+    from aiwb import locations
+    location1 = tmp_path / 'first.txt'
+    location2 = tmp_path / 'second.txt'
+    location2.write_bytes( b'second\n' )
+
+    async def update_contents( ):
+        await locations.register_defaults( )
+        await locations.update_contents_many(
+            (   ( locations.file_adapter_from_url( location1 ), b'first\n' ),
+                # Fails to commit, since file already exists.
+                (   locations.file_adapter_from_url( location2 ),
+                    b'second, altered\n' ) ),
+            options = locations.FileUpdateOptions.Absence )
+
+    with raises( locations.LocationOperateFailure ):
+        run( update_contents( ) )
+    assert not location1.exists( )
+    assert b'second\n' == location2.read_bytes( )
+    assert [ location2 ] == list( tmp_path.iterdir( ) )